@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+# python checkYuzuOptions.py qt-config.ini [runs] : the settings of a launch, the code of the generators before the
+# option table (yuzuOptionsReference, RawConfigParser and set()) against yuzuOptions, for each emulator.
+# not installed, run it from the repository
+from __future__ import annotations
+
+import configparser
+import os
+import random
+import sys
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "configgen"))
+
+import yuzuOptionsReference
+from iniConfig import IniConfig, toString
+from yuzuOptions import CITRON, EDEN, SUDACHI, TAIL, YUZU, Schema, apply
+
+class System:
+    def __init__(self, config: Mapping[str, Any]) -> None:
+        self.config = config
+
+    def isOptSet(self, key: str) -> bool:
+        return key in self.config
+
+path = sys.argv[1]
+runs = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+emulators = [(yuzuOptionsReference.citron, CITRON), (yuzuOptionsReference.eden, EDEN),
+             (yuzuOptionsReference.sudachi, SUDACHI), (yuzuOptionsReference.yuzu, YUZU)]
+keys = sorted({ key for _, schema in emulators for key in schema.byKey })
+rnd = random.Random(0)
+configs = [{ key: rnd.choice(["0", "1", "2", "true"]) for key in keys if rnd.random() < 0.5 } for _ in range(runs)]
+
+def viaReference(reference: Callable[[Any, Any], None], config: Mapping[str, Any]) -> str:
+    ini = configparser.RawConfigParser()
+    ini.optionxform = str  # type: ignore[assignment]
+    ini.read(path)
+    reference(ini, System(config))
+    return toString(ini)
+
+def viaTable(schema: Schema, config: Mapping[str, Any]) -> str:
+    ini = IniConfig()
+    ini.read(path)
+    for rows in (schema, TAIL):
+        apply(ini, config, rows)
+    return ini.dumps()
+
+for reference, schema in emulators:
+    for config in configs:
+        assert viaReference(reference, config) == viaTable(schema, config), f"{reference.__name__}: the outputs differ"
+reference, schema = emulators[0]
+for name, fn in [("RawConfigParser", lambda config: viaReference(reference, config)),
+                 ("IniConfig", lambda config: viaTable(schema, config))]:
+    start = time.perf_counter()
+    for config in configs:
+        fn(config)
+    print(f"{name:16}: {(time.perf_counter() - start) * 1000 / runs:8.3f} ms per launch")
@@ -0,0 +1,1279 @@
+# the settings code of the yuzu family generators before yuzuOptions (the set() calls, one per key), kept verbatim:
+# bench/checkYuzuOptions.py checks the option table of yuzuOptions against it.
+# citron(yuzuConfig, system) and the others: the settings written before the controls, then the ones after
+
+
+def citron(yuzuConfig, system):
+    # UI section
+    if not yuzuConfig.has_section("UI"):
+        yuzuConfig.add_section("UI")
+
+    yuzuConfig.set("UI", "fullscreen", "true")
+    yuzuConfig.set("UI", "fullscreen\\default", "false")
+    yuzuConfig.set("UI", "confirmClose", "false")
+    yuzuConfig.set("UI", "confirmClose\\default", "false")
+    yuzuConfig.set("UI", "confirmStop", "2")
+    yuzuConfig.set("UI", "confirmStop\\default", "false")
+    yuzuConfig.set("UI", "firstStart", "false")
+    yuzuConfig.set("UI", "firstStart\\default", "false")
+    yuzuConfig.set("UI", "displayTitleBars", "false")
+    yuzuConfig.set("UI", "displayTitleBars\\default", "false")
+
+    if system.isOptSet('yuzu_enable_discord_presence'):
+        yuzuConfig.set("UI", "enable_discord_presence", system.config["yuzu_enable_discord_presence"])
+    else:
+        yuzuConfig.set("UI", "enable_discord_presence", "false")
+
+    yuzuConfig.set("UI", "enable_discord_presence\\default", "false")
+
+
+
+    yuzuConfig.set("UI", "calloutFlags", "1")
+    yuzuConfig.set("UI", "calloutFlags\\default", "false")
+
+    # Single Window Mode
+    if system.isOptSet('single_window'):
+        yuzuConfig.set("UI", "singleWindowMode", system.config["single_window"])
+        yuzuConfig.set("UI", "singleWindowMode\\default", "false")
+    else:
+        yuzuConfig.set("UI", "singleWindowMode", "true")
+        yuzuConfig.set("UI", "singleWindowMode\\default", "true")
+
+    # User Profile select on boot
+    if system.isOptSet('user_profile'):
+        yuzuConfig.set("UI", "select_user_on_boot", system.config["user_profile"])
+        yuzuConfig.set("UI", "select_user_on_boot\\default", "false")
+    else:
+        yuzuConfig.set("UI", "select_user_on_boot", "true")
+        yuzuConfig.set("UI", "select_user_on_boot\\default", "true")
+
+    yuzuConfig.set("UI", "hideInactiveMouse", "true")
+    yuzuConfig.set("UI", "hideInactiveMouse\\default", "true")
+
+    # Roms path (need for load update/dlc)
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\deep_scan", "true")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\deep_scan\\default", "false")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\expanded", "true")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\expanded\\default", "true")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\path", "/userdata/roms/switch")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\size", "1")
+
+    # game list cache, kept between launches (see gameListCache)
+    yuzuConfig.set("UI", "cache_game_list", "true")
+    yuzuConfig.set("UI", "cache_game_list\\default", "true")
+
+    yuzuConfig.set("UI", "Screenshots\\enable_screenshot_save_as", "true")
+    yuzuConfig.set("UI", "Screenshots\\enable_screenshot_save_as\\default", "true")
+    yuzuConfig.set("UI", "Screenshots\\screenshot_path", "/userdata/screenshots")
+    yuzuConfig.set("UI", "Screenshots\\screenshot_path\\default", "false")
+
+    #citron shortcuts
+    yuzuConfig.set("UI", "Shortcuts\\shortcuts\\size", "2")#adjust to number of shortcut sets
+    #exit citron
+    yuzuConfig.set("UI", "Shortcuts\\shortcuts\\1\\name", "Exit citron")
+    yuzuConfig.set("UI", "Shortcuts\\shortcuts\\1\\group", "Main Window")
+    yuzuConfig.set("UI", "Shortcuts\\shortcuts\\1\\keyseq", "Ctrl+Q")
+    yuzuConfig.set("UI", "Shortcuts\\shortcuts\\1\\controller_keyseq", "Plus+Minus")
+    yuzuConfig.set("UI", "Shortcuts\\shortcuts\\1\\context", "1")
+    yuzuConfig.set("UI", "Shortcuts\\shortcuts\\1\\repeat", "false")
+    #exit citron fullscreen
+    yuzuConfig.set("UI", "Shortcuts\\shortcuts\\2\\name", "Fullscreen")
+    yuzuConfig.set("UI", "Shortcuts\\shortcuts\\2\\group", "Main Window")
+    yuzuConfig.set("UI", "Shortcuts\\shortcuts\\2\\keyseq", "F11")
+    yuzuConfig.set("UI", "Shortcuts\\shortcuts\\2\\controller_keyseq", "B+Minus")
+    yuzuConfig.set("UI", "Shortcuts\\shortcuts\\2\\context", "1")
+    yuzuConfig.set("UI", "Shortcuts\\shortcuts\\2\\repeat", "false")
+
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\KeySeq", "F4")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\KeySeq\\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\Controller_KeySeq", "Minus+B")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\Controller_KeySeq\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\Controller_KeySeq", "Home+ZL")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\Controller_KeySeq\\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\KeySeq", "Esc")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\KeySeq\\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Continue\Pause%20Emulation\KeySeq", "P")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Continue\Pause%20Emulation\KeySeq\default", "false")
+
+    # Data Storage section
+    if not yuzuConfig.has_section("Data%20Storage"):
+        yuzuConfig.add_section("Data%20Storage")
+    yuzuConfig.set("Data%20Storage", "dump_directory", "/userdata/system/configs/yuzu/dump")
+    yuzuConfig.set("Data%20Storage", "dump_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "load_directory", "/userdata/system/configs/yuzu/load")
+    yuzuConfig.set("Data%20Storage", "load_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "nand_directory", "/userdata/system/configs/yuzu/nand")
+    yuzuConfig.set("Data%20Storage", "nand_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "sdmc_directory", "/userdata/system/configs/yuzu/sdmc")
+    yuzuConfig.set("Data%20Storage", "sdmc_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "tas_directory", "/userdata/system/configs/yuzu/tas")
+    yuzuConfig.set("Data%20Storage", "tas_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "use_virtual_sd", "true")
+    yuzuConfig.set("Data%20Storage", "use_virtual_sd\\default", "true")
+
+    # Core section
+    if not yuzuConfig.has_section("Core"):
+        yuzuConfig.add_section("Core")
+
+    # Multicore
+    if system.isOptSet('multicore'):
+        yuzuConfig.set("Core", "use_multi_core", system.config["multicore"])
+        yuzuConfig.set("Core", "use_multi_core\\default", "false")
+    else:
+        yuzuConfig.set("Core", "use_multi_core", "true")
+        yuzuConfig.set("Core", "use_multi_core\\default", "true")
+
+    # Renderer section
+    if not yuzuConfig.has_section("Renderer"):
+        yuzuConfig.add_section("Renderer")
+
+    # Aspect ratio
+    if system.isOptSet('suyu_ratio'):
+        yuzuConfig.set("Renderer", "aspect_ratio", system.config["suyu_ratio"])
+        yuzuConfig.set("Renderer", "aspect_ratio\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "aspect_ratio", "5")
+        yuzuConfig.set("Renderer", "aspect_ratio\\default", "false")
+
+    # Graphical backend
+    if system.isOptSet('yuzu_backend'):
+        yuzuConfig.set("Renderer", "backend", system.config["yuzu_backend"])
+    else:
+        yuzuConfig.set("Renderer", "backend", "0")
+    yuzuConfig.set("Renderer", "backend\\default", "false")
+
+    # Async Shader compilation
+    if system.isOptSet('async_shaders'):
+        yuzuConfig.set("Renderer", "use_asynchronous_shaders", system.config["async_shaders"])
+    else:
+        yuzuConfig.set("Renderer", "use_asynchronous_shaders", "true")
+    yuzuConfig.set("Renderer", "use_asynchronous_shaders\\default", "false")
+
+    # Assembly shaders
+    if system.isOptSet('shaderbackend'):
+        yuzuConfig.set("Renderer", "shader_backend", system.config["shaderbackend"])
+        yuzuConfig.set("Renderer", "shader_backend\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "shader_backend", "0")
+        yuzuConfig.set("Renderer", "shader_backend\\default", "true")
+
+    # Async Gpu Emulation
+    if system.isOptSet('async_gpu'):
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation", system.config["async_gpu"])
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation", "true")
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation\\default", "true")
+
+    # NVDEC Emulation
+    if system.isOptSet('nvdec_emu'):
+        yuzuConfig.set("Renderer", "nvdec_emulation", system.config["nvdec_emu"])
+        yuzuConfig.set("Renderer", "nvdec_emulation\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "nvdec_emulation", "2")
+        yuzuConfig.set("Renderer", "nvdec_emulation\\default", "true")
+
+    # Gpu Accuracy
+    if system.isOptSet('gpuaccuracy'):
+        yuzuConfig.set("Renderer", "gpu_accuracy", system.config["gpuaccuracy"])
+    else:
+        yuzuConfig.set("Renderer", "gpu_accuracy", "0")
+    yuzuConfig.set("Renderer", "gpu_accuracy\\default", "false")
+
+    # Vsync
+    if system.isOptSet('vsync'):
+        yuzuConfig.set("Renderer", "use_vsync", system.config["vsync"])
+        yuzuConfig.set("Renderer", "use_vsync\\default", "false")
+        if system.config["vsync"] == "2":
+            yuzuConfig.set("Renderer", "use_vsync\\default", "true")
+    else:
+        yuzuConfig.set("Renderer", "use_vsync", "1")
+        yuzuConfig.set("Renderer", "use_vsync\\default", "false")
+
+    # Gpu cache garbage collection
+    if system.isOptSet('gpu_cache_gc'):
+        yuzuConfig.set("Renderer", "use_caches_gc", system.config["gpu_cache_gc"])
+    else:
+        yuzuConfig.set("Renderer", "use_caches_gc", "false")
+    yuzuConfig.set("Renderer", "use_caches_gc\\default", "false")
+
+    # Max anisotropy
+    if system.isOptSet('anisotropy'):
+        yuzuConfig.set("Renderer", "max_anisotropy", system.config["anisotropy"])
+        yuzuConfig.set("Renderer", "max_anisotropy\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "max_anisotropy", "0")
+        yuzuConfig.set("Renderer", "max_anisotropy\\default", "true")
+
+    # Resolution scaler
+    if system.isOptSet('resolution_scale'):
+        yuzuConfig.set("Renderer", "resolution_setup", system.config["resolution_scale"])
+        yuzuConfig.set("Renderer", "resolution_setup\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "resolution_setup", "2")
+        yuzuConfig.set("Renderer", "resolution_setup\\default", "true")
+
+    # Scaling filter
+    if system.isOptSet('scale_filter'):
+        yuzuConfig.set("Renderer", "scaling_filter", system.config["scale_filter"])
+        yuzuConfig.set("Renderer", "scaling_filter\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "scaling_filter", "1")
+        yuzuConfig.set("Renderer", "scaling_filter\\default", "true")
+
+    # Anti aliasing method
+    if system.isOptSet('aliasing_method'):
+        yuzuConfig.set("Renderer", "anti_aliasing", system.config["aliasing_method"])
+        yuzuConfig.set("Renderer", "anti_aliasing\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "anti_aliasing", "0")
+        yuzuConfig.set("Renderer", "anti_aliasing\\default", "true")
+
+    #ASTC Decoding Method
+    if system.isOptSet('accelerate_astc'):
+        yuzuConfig.set("Renderer", "accelerate_astc", system.config["accelerate_astc"])
+        yuzuConfig.set("Renderer", "accelerate_astc\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "accelerate_astc", "1")
+        yuzuConfig.set("Renderer", "accelerate_astc\\default", "true")
+
+    # ASTC Texture Recompression
+    if system.isOptSet('astc_recompression'):
+
+
+        yuzuConfig.set("Renderer", "astc_recompression", system.config["astc_recompression"])
+        yuzuConfig.set("Renderer", "astc_recompression\\default", "false")
+        if system.config["astc_recompression"] == "0":
+            yuzuConfig.set("Renderer", "use_vsync\\default", "true")
+        yuzuConfig.set("Renderer", "async_astc", "false")
+        yuzuConfig.set("Renderer", "async_astc\\default", "true")
+    else:
+        yuzuConfig.set("Renderer", "astc_recompression", "0")
+        yuzuConfig.set("Renderer", "astc_recompression\\default", "true")
+        yuzuConfig.set("Renderer", "async_astc", "false")
+        yuzuConfig.set("Renderer", "async_astc\\default", "true")
+
+    # Cpu Section
+    if not yuzuConfig.has_section("Cpu"):
+        yuzuConfig.add_section("Cpu")
+
+    # Cpu Accuracy
+    if system.isOptSet('cpuaccuracy'):
+        yuzuConfig.set("Cpu", "cpu_accuracy", system.config["cpuaccuracy"])
+        yuzuConfig.set("Cpu", "cpu_accuracy\\default", "false")
+    else:
+        yuzuConfig.set("Cpu", "cpu_accuracy", "0")
+        yuzuConfig.set("Cpu", "cpu_accuracy\\default", "true")
+
+    # System section
+    if not yuzuConfig.has_section("System"):
+        yuzuConfig.add_section("System")
+
+    # Language
+    if system.isOptSet('language'):
+        yuzuConfig.set("System", "language_index", system.config["language"])
+        yuzuConfig.set("System", "language_index\\default", "false")
+    else:
+        yuzuConfig.set("System", "language_index", "1")
+        yuzuConfig.set("System", "language_index\\default", "true")
+
+    # Audio Mode
+    if system.isOptSet('audio_mode'):
+        yuzuConfig.set("System", "sound_index", system.config["audio_mode"])
+        yuzuConfig.set("System", "sound_index\\default", "false")
+    else:
+        yuzuConfig.set("System", "sound_index", "1")
+        yuzuConfig.set("System", "sound_index\\default", "true")
+
+    # Region
+    if system.isOptSet('region'):
+        yuzuConfig.set("System", "region_index", system.config["region"])
+        yuzuConfig.set("System", "region_index\\default", "false")
+    else:
+        yuzuConfig.set("System", "region_index", "1")
+        yuzuConfig.set("System", "region_index\\default", "true")
+
+    # Dock Mode
+    if system.isOptSet('dock_mode'):
+        if system.config["dock_mode"] == "1":
+            yuzuConfig.set("System", "use_docked_mode", "1")
+            yuzuConfig.set("System", "use_docked_mode\\default", "true")
+        elif system.config["dock_mode"] == "0":
+            yuzuConfig.set("System", "use_docked_mode", "0")
+            yuzuConfig.set("System", "use_docked_mode\\default", "false")
+    else:
+        yuzuConfig.set("System", "use_docked_mode", "1")
+        yuzuConfig.set("System", "use_docked_mode\\default", "true")
+
+    # Applet section
+    if not yuzuConfig.has_section("LibraryApplet"):
+        yuzuConfig.add_section("LibraryApplet")
+    yuzuConfig.set("LibraryApplet", "swkbd_applet_mode", "0")
+    yuzuConfig.set("LibraryApplet", "swkbd_applet_mode\\default", "false")
+
+    # web section
+    if not yuzuConfig.has_section("WebService"):
+        yuzuConfig.add_section("WebService")
+
+    yuzuConfig.set("WebService", "enable_auto_update_check", "false")
+    yuzuConfig.set("WebService", "enable_auto_update_check\\default", "false")
+
+    # telemetry section
+    if not yuzuConfig.has_section("WebService"):
+        yuzuConfig.add_section("WebService")
+    yuzuConfig.set("WebService", "enable_telemetry", "false")
+    yuzuConfig.set("WebService", "enable_telemetry\\default", "false")
+
+
+    # Services section
+    if not yuzuConfig.has_section("Services"):
+        yuzuConfig.add_section("Services")
+    yuzuConfig.set("Services", "bcat_backend", "none")
+    yuzuConfig.set("Services", "bcat_backend\\default", "none")
+
+
+def eden(yuzuConfig, system):
+    # UI section
+    if not yuzuConfig.has_section("UI"):
+        yuzuConfig.add_section("UI")
+
+    yuzuConfig.set("UI", "fullscreen", "true")
+    yuzuConfig.set("UI", "fullscreen\\default", "false")
+    yuzuConfig.set("UI", "confirmClose", "false")
+    yuzuConfig.set("UI", "confirmClose\\default", "false")
+    yuzuConfig.set("UI", "confirmStop", "2")
+    yuzuConfig.set("UI", "confirmStop\\default", "false")
+    yuzuConfig.set("UI", "firstStart", "false")
+    yuzuConfig.set("UI", "firstStart\\default", "false")
+    yuzuConfig.set("UI", "displayTitleBars", "false")
+    yuzuConfig.set("UI", "displayTitleBars\\default", "false")
+    yuzuConfig.set("UI", "check_for_updates", "false")
+    yuzuConfig.set("UI", "check_for_updates\\default", "false")
+
+    if system.isOptSet('yuzu_enable_discord_presence'):
+        yuzuConfig.set("UI", "enable_discord_presence", system.config["yuzu_enable_discord_presence"])
+    else:
+        yuzuConfig.set("UI", "enable_discord_presence", "false")
+
+    yuzuConfig.set("UI", "enable_discord_presence\\default", "false")
+
+
+
+    yuzuConfig.set("UI", "calloutFlags", "1")
+    yuzuConfig.set("UI", "calloutFlags\\default", "false")
+
+    # Single Window Mode
+    if system.isOptSet('single_window'):
+        yuzuConfig.set("UI", "singleWindowMode", system.config["single_window"])
+        yuzuConfig.set("UI", "singleWindowMode\\default", "false")
+    else:
+        yuzuConfig.set("UI", "singleWindowMode", "true")
+        yuzuConfig.set("UI", "singleWindowMode\\default", "true")
+
+    # User Profile select on boot
+    if system.isOptSet('user_profile'):
+        yuzuConfig.set("UI", "select_user_on_boot", system.config["user_profile"])
+        yuzuConfig.set("UI", "select_user_on_boot\\default", "false")
+    else:
+        yuzuConfig.set("UI", "select_user_on_boot", "true")
+        yuzuConfig.set("UI", "select_user_on_boot\\default", "true")
+
+    yuzuConfig.set("UI", "hideInactiveMouse", "true")
+    yuzuConfig.set("UI", "hideInactiveMouse\\default", "true")
+
+    # Roms path (need for load update/dlc)
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\deep_scan", "true")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\deep_scan\\default", "false")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\expanded", "true")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\expanded\\default", "true")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\path", "/userdata/roms/switch")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\size", "1")
+
+    # game list cache, kept between launches (see gameListCache)
+    yuzuConfig.set("UI", "cache_game_list", "true")
+    yuzuConfig.set("UI", "cache_game_list\\default", "true")
+
+    yuzuConfig.set("UI", "Screenshots\\enable_screenshot_save_as", "true")
+    yuzuConfig.set("UI", "Screenshots\\enable_screenshot_save_as\\default", "true")
+    yuzuConfig.set("UI", "Screenshots\\screenshot_path", "/userdata/screenshots")
+    yuzuConfig.set("UI", "Screenshots\\screenshot_path\\default", "false")
+
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20eden\Controller_KeySeq", "Minus+Plus")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20eden\Controller_KeySeq\\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\KeySeq", "F4")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\KeySeq\\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\Controller_KeySeq", "Minus+B")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\Controller_KeySeq\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\Controller_KeySeq", "Home+ZL")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\Controller_KeySeq\\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\KeySeq", "Esc")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\KeySeq\\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Continue\Pause%20Emulation\KeySeq", "P")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Continue\Pause%20Emulation\KeySeq\default", "false")
+
+    # Data Storage section
+    if not yuzuConfig.has_section("Data%20Storage"):
+        yuzuConfig.add_section("Data%20Storage")
+    yuzuConfig.set("Data%20Storage", "dump_directory", "/userdata/system/configs/yuzu/dump")
+    yuzuConfig.set("Data%20Storage", "dump_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "load_directory", "/userdata/system/configs/yuzu/load")
+    yuzuConfig.set("Data%20Storage", "load_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "nand_directory", "/userdata/system/configs/yuzu/nand")
+    yuzuConfig.set("Data%20Storage", "nand_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "sdmc_directory", "/userdata/system/configs/yuzu/sdmc")
+    yuzuConfig.set("Data%20Storage", "sdmc_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "tas_directory", "/userdata/system/configs/yuzu/tas")
+    yuzuConfig.set("Data%20Storage", "tas_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "use_virtual_sd", "true")
+    yuzuConfig.set("Data%20Storage", "use_virtual_sd\\default", "true")
+
+    # Core section
+    if not yuzuConfig.has_section("Core"):
+        yuzuConfig.add_section("Core")
+
+    # Multicore
+    if system.isOptSet('multicore'):
+        yuzuConfig.set("Core", "use_multi_core", system.config["multicore"])
+        yuzuConfig.set("Core", "use_multi_core\\default", "false")
+    else:
+        yuzuConfig.set("Core", "use_multi_core", "true")
+        yuzuConfig.set("Core", "use_multi_core\\default", "true")
+
+    # Renderer section
+    if not yuzuConfig.has_section("Renderer"):
+        yuzuConfig.add_section("Renderer")
+
+    # Aspect ratio
+    if system.isOptSet('suyu_ratio'):
+        yuzuConfig.set("Renderer", "aspect_ratio", system.config["suyu_ratio"])
+        yuzuConfig.set("Renderer", "aspect_ratio\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "aspect_ratio", "5")
+        yuzuConfig.set("Renderer", "aspect_ratio\\default", "false")
+
+    # Graphical backend
+    if system.isOptSet('yuzu_backend'):
+        yuzuConfig.set("Renderer", "backend", system.config["yuzu_backend"])
+    else:
+        yuzuConfig.set("Renderer", "backend", "0")
+    yuzuConfig.set("Renderer", "backend\\default", "false")
+
+    # Async Shader compilation
+    if system.isOptSet('async_shaders'):
+        yuzuConfig.set("Renderer", "use_asynchronous_shaders", system.config["async_shaders"])
+    else:
+        yuzuConfig.set("Renderer", "use_asynchronous_shaders", "true")
+    yuzuConfig.set("Renderer", "use_asynchronous_shaders\\default", "false")
+
+    # Assembly shaders
+    if system.isOptSet('shaderbackend'):
+        yuzuConfig.set("Renderer", "shader_backend", system.config["shaderbackend"])
+        yuzuConfig.set("Renderer", "shader_backend\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "shader_backend", "0")
+        yuzuConfig.set("Renderer", "shader_backend\\default", "true")
+
+    # Async Gpu Emulation
+    if system.isOptSet('async_gpu'):
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation", system.config["async_gpu"])
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation", "true")
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation\\default", "true")
+
+    # NVDEC Emulation
+    if system.isOptSet('nvdec_emu'):
+        yuzuConfig.set("Renderer", "nvdec_emulation", system.config["nvdec_emu"])
+        yuzuConfig.set("Renderer", "nvdec_emulation\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "nvdec_emulation", "2")
+        yuzuConfig.set("Renderer", "nvdec_emulation\\default", "true")
+
+    # Gpu Accuracy
+    if system.isOptSet('gpuaccuracy'):
+        yuzuConfig.set("Renderer", "gpu_accuracy", system.config["gpuaccuracy"])
+    else:
+        yuzuConfig.set("Renderer", "gpu_accuracy", "0")
+    yuzuConfig.set("Renderer", "gpu_accuracy\\default", "false")
+
+    # Vsync
+    if system.isOptSet('vsync'):
+        yuzuConfig.set("Renderer", "use_vsync", system.config["vsync"])
+        yuzuConfig.set("Renderer", "use_vsync\\default", "false")
+        if system.config["vsync"] == "2":
+            yuzuConfig.set("Renderer", "use_vsync\\default", "true")
+    else:
+        yuzuConfig.set("Renderer", "use_vsync", "1")
+        yuzuConfig.set("Renderer", "use_vsync\\default", "false")
+
+    # Gpu cache garbage collection
+    if system.isOptSet('gpu_cache_gc'):
+        yuzuConfig.set("Renderer", "use_caches_gc", system.config["gpu_cache_gc"])
+    else:
+        yuzuConfig.set("Renderer", "use_caches_gc", "false")
+    yuzuConfig.set("Renderer", "use_caches_gc\\default", "false")
+
+    # Max anisotropy
+    if system.isOptSet('anisotropy'):
+        yuzuConfig.set("Renderer", "max_anisotropy", system.config["anisotropy"])
+        yuzuConfig.set("Renderer", "max_anisotropy\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "max_anisotropy", "0")
+        yuzuConfig.set("Renderer", "max_anisotropy\\default", "true")
+
+    # Resolution scaler
+    if system.isOptSet('resolution_scale'):
+        yuzuConfig.set("Renderer", "resolution_setup", system.config["resolution_scale"])
+        yuzuConfig.set("Renderer", "resolution_setup\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "resolution_setup", "2")
+        yuzuConfig.set("Renderer", "resolution_setup\\default", "true")
+
+    # Scaling filter
+    if system.isOptSet('scale_filter'):
+        yuzuConfig.set("Renderer", "scaling_filter", system.config["scale_filter"])
+        yuzuConfig.set("Renderer", "scaling_filter\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "scaling_filter", "1")
+        yuzuConfig.set("Renderer", "scaling_filter\\default", "true")
+
+    # Anti aliasing method
+    if system.isOptSet('aliasing_method'):
+        yuzuConfig.set("Renderer", "anti_aliasing", system.config["aliasing_method"])
+        yuzuConfig.set("Renderer", "anti_aliasing\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "anti_aliasing", "0")
+        yuzuConfig.set("Renderer", "anti_aliasing\\default", "true")
+
+    #ASTC Decoding Method
+    if system.isOptSet('accelerate_astc'):
+        yuzuConfig.set("Renderer", "accelerate_astc", system.config["accelerate_astc"])
+        yuzuConfig.set("Renderer", "accelerate_astc\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "accelerate_astc", "1")
+        yuzuConfig.set("Renderer", "accelerate_astc\\default", "true")
+
+    # ASTC Texture Recompression
+    if system.isOptSet('astc_recompression'):
+
+
+        yuzuConfig.set("Renderer", "astc_recompression", system.config["astc_recompression"])
+        yuzuConfig.set("Renderer", "astc_recompression\\default", "false")
+        if system.config["astc_recompression"] == "0":
+            yuzuConfig.set("Renderer", "use_vsync\\default", "true")
+        yuzuConfig.set("Renderer", "async_astc", "false")
+        yuzuConfig.set("Renderer", "async_astc\\default", "true")
+    else:
+        yuzuConfig.set("Renderer", "astc_recompression", "0")
+        yuzuConfig.set("Renderer", "astc_recompression\\default", "true")
+        yuzuConfig.set("Renderer", "async_astc", "false")
+        yuzuConfig.set("Renderer", "async_astc\\default", "true")
+
+    # Cpu Section
+    if not yuzuConfig.has_section("Cpu"):
+        yuzuConfig.add_section("Cpu")
+
+    # Cpu Accuracy
+    if system.isOptSet('cpuaccuracy'):
+        yuzuConfig.set("Cpu", "cpu_accuracy", system.config["cpuaccuracy"])
+        yuzuConfig.set("Cpu", "cpu_accuracy\\default", "false")
+    else:
+        yuzuConfig.set("Cpu", "cpu_accuracy", "0")
+        yuzuConfig.set("Cpu", "cpu_accuracy\\default", "true")
+
+    # System section
+    if not yuzuConfig.has_section("System"):
+        yuzuConfig.add_section("System")
+
+    yuzuConfig.set("System", "disable_nca_verification", "true")
+    yuzuConfig.set("System", "disable_nca_verification\\default", "true")
+    yuzuConfig.set("System", "hide_nca_verification_popup", "true")
+    yuzuConfig.set("System", "hide_nca_verification_popup\\default", "false")
+
+    # Language
+    if system.isOptSet('language'):
+        yuzuConfig.set("System", "language_index", system.config["language"])
+        yuzuConfig.set("System", "language_index\\default", "false")
+    else:
+        yuzuConfig.set("System", "language_index", "1")
+        yuzuConfig.set("System", "language_index\\default", "true")
+
+    # Audio Mode
+    if system.isOptSet('audio_mode'):
+        yuzuConfig.set("System", "sound_index", system.config["audio_mode"])
+        yuzuConfig.set("System", "sound_index\\default", "false")
+    else:
+        yuzuConfig.set("System", "sound_index", "1")
+        yuzuConfig.set("System", "sound_index\\default", "true")
+
+    # Region
+    if system.isOptSet('region'):
+        yuzuConfig.set("System", "region_index", system.config["region"])
+        yuzuConfig.set("System", "region_index\\default", "false")
+    else:
+        yuzuConfig.set("System", "region_index", "1")
+        yuzuConfig.set("System", "region_index\\default", "true")
+
+    # Dock Mode
+    if system.isOptSet('dock_mode'):
+        if system.config["dock_mode"] == "1":
+            yuzuConfig.set("System", "use_docked_mode", "1")
+            yuzuConfig.set("System", "use_docked_mode\\default", "true")
+        elif system.config["dock_mode"] == "0":
+            yuzuConfig.set("System", "use_docked_mode", "0")
+            yuzuConfig.set("System", "use_docked_mode\\default", "false")
+    else:
+        yuzuConfig.set("System", "use_docked_mode", "1")
+        yuzuConfig.set("System", "use_docked_mode\\default", "true")
+
+    # Applet section
+    if not yuzuConfig.has_section("LibraryApplet"):
+        yuzuConfig.add_section("LibraryApplet")
+    yuzuConfig.set("LibraryApplet", "swkbd_applet_mode", "0")
+    yuzuConfig.set("LibraryApplet", "swkbd_applet_mode\\default", "false")
+
+
+    # telemetry section
+    if not yuzuConfig.has_section("WebService"):
+        yuzuConfig.add_section("WebService")
+    yuzuConfig.set("WebService", "enable_telemetry", "false")
+    yuzuConfig.set("WebService", "enable_telemetry\\default", "false")
+
+
+    # Services section
+    if not yuzuConfig.has_section("Services"):
+        yuzuConfig.add_section("Services")
+    yuzuConfig.set("Services", "bcat_backend", "none")
+    yuzuConfig.set("Services", "bcat_backend\\default", "none")
+
+
+def sudachi(yuzuConfig, system):
+    # UI section
+    if not yuzuConfig.has_section("UI"):
+        yuzuConfig.add_section("UI")
+
+    yuzuConfig.set("UI", "fullscreen", "true")
+    yuzuConfig.set("UI", "fullscreen\\default", "false")
+    yuzuConfig.set("UI", "confirmClose", "false")
+    yuzuConfig.set("UI", "confirmClose\\default", "false")
+    yuzuConfig.set("UI", "firstStart", "false")
+    yuzuConfig.set("UI", "firstStart\\default", "false")
+    yuzuConfig.set("UI", "displayTitleBars", "false")
+    yuzuConfig.set("UI", "displayTitleBars\\default", "false")
+    yuzuConfig.set("UI", "confirmStop", "2")
+    yuzuConfig.set("UI", "confirmStop\\default", "false")
+
+    if system.isOptSet('yuzu_enable_discord_presence'):
+        yuzuConfig.set("UI", "enable_discord_presence", system.config["yuzu_enable_discord_presence"])
+    else:
+        yuzuConfig.set("UI", "enable_discord_presence", "false")
+
+    yuzuConfig.set("UI", "enable_discord_presence\\default", "false")
+
+
+
+    yuzuConfig.set("UI", "calloutFlags", "1")
+    yuzuConfig.set("UI", "calloutFlags\\default", "false")
+
+    # Single Window Mode
+    if system.isOptSet('single_window'):
+        yuzuConfig.set("UI", "singleWindowMode", system.config["single_window"])
+        yuzuConfig.set("UI", "singleWindowMode\\default", "false")
+    else:
+        yuzuConfig.set("UI", "singleWindowMode", "true")
+        yuzuConfig.set("UI", "singleWindowMode\\default", "true")
+
+    # User Profile select on boot
+    if system.isOptSet('user_profile'):
+        yuzuConfig.set("UI", "select_user_on_boot", system.config["user_profile"])
+        yuzuConfig.set("UI", "select_user_on_boot\\default", "false")
+    else:
+        yuzuConfig.set("UI", "select_user_on_boot", "true")
+        yuzuConfig.set("UI", "select_user_on_boot\\default", "true")
+
+    yuzuConfig.set("UI", "hideInactiveMouse", "true")
+    yuzuConfig.set("UI", "hideInactiveMouse\\default", "true")
+
+    # Roms path (need for load update/dlc)
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\deep_scan", "true")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\deep_scan\\default", "false")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\expanded", "true")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\expanded\\default", "true")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\path", "/userdata/roms/switch")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\size", "1")
+
+    # game list cache, kept between launches (see gameListCache)
+    yuzuConfig.set("UI", "cache_game_list", "true")
+    yuzuConfig.set("UI", "cache_game_list\\default", "true")
+
+    yuzuConfig.set("UI", "Screenshots\\enable_screenshot_save_as", "true")
+    yuzuConfig.set("UI", "Screenshots\\enable_screenshot_save_as\\default", "true")
+    yuzuConfig.set("UI", "Screenshots\\screenshot_path", "/userdata/screenshots")
+    yuzuConfig.set("UI", "Screenshots\\screenshot_path\\default", "false")
+
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20sudachi\Controller_KeySeq", "Minus+Plus")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20sudachi\Controller_KeySeq\\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\KeySeq", "F4")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\KeySeq\\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\Controller_KeySeq", "Minus+B")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\Controller_KeySeq\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\Controller_KeySeq", "Home+ZL")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\Controller_KeySeq\\default", "false")
+
+    # Data Storage section
+    if not yuzuConfig.has_section("Data%20Storage"):
+        yuzuConfig.add_section("Data%20Storage")
+    yuzuConfig.set("Data%20Storage", "dump_directory", "/userdata/system/configs/yuzu/dump")
+    yuzuConfig.set("Data%20Storage", "dump_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "load_directory", "/userdata/system/configs/yuzu/load")
+    yuzuConfig.set("Data%20Storage", "load_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "nand_directory", "/userdata/system/configs/yuzu/nand")
+    yuzuConfig.set("Data%20Storage", "nand_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "sdmc_directory", "/userdata/system/configs/yuzu/sdmc")
+    yuzuConfig.set("Data%20Storage", "sdmc_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "tas_directory", "/userdata/system/configs/yuzu/tas")
+    yuzuConfig.set("Data%20Storage", "tas_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "use_virtual_sd", "true")
+    yuzuConfig.set("Data%20Storage", "use_virtual_sd\\default", "true")
+
+    # Core section
+    if not yuzuConfig.has_section("Core"):
+        yuzuConfig.add_section("Core")
+
+    # Multicore
+    if system.isOptSet('multicore'):
+        yuzuConfig.set("Core", "use_multi_core", system.config["multicore"])
+        yuzuConfig.set("Core", "use_multi_core\\default", "false")
+    else:
+        yuzuConfig.set("Core", "use_multi_core", "true")
+        yuzuConfig.set("Core", "use_multi_core\\default", "true")
+
+    # Renderer section
+    if not yuzuConfig.has_section("Renderer"):
+        yuzuConfig.add_section("Renderer")
+
+    # Aspect ratio
+    if system.isOptSet('suyu_ratio'):
+        yuzuConfig.set("Renderer", "aspect_ratio", system.config["suyu_ratio"])
+        yuzuConfig.set("Renderer", "aspect_ratio\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "aspect_ratio", "5")
+        yuzuConfig.set("Renderer", "aspect_ratio\\default", "false")
+
+    # Graphical backend
+    if system.isOptSet('yuzu_backend'):
+        yuzuConfig.set("Renderer", "backend", system.config["yuzu_backend"])
+    else:
+        yuzuConfig.set("Renderer", "backend", "0")
+    yuzuConfig.set("Renderer", "backend\\default", "false")
+
+    # Async Shader compilation
+    if system.isOptSet('async_shaders'):
+        yuzuConfig.set("Renderer", "use_asynchronous_shaders", system.config["async_shaders"])
+    else:
+        yuzuConfig.set("Renderer", "use_asynchronous_shaders", "true")
+    yuzuConfig.set("Renderer", "use_asynchronous_shaders\\default", "false")
+
+    # Assembly shaders
+    if system.isOptSet('shaderbackend'):
+        yuzuConfig.set("Renderer", "shader_backend", system.config["shaderbackend"])
+        yuzuConfig.set("Renderer", "shader_backend\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "shader_backend", "0")
+        yuzuConfig.set("Renderer", "shader_backend\\default", "true")
+
+    # Async Gpu Emulation
+    if system.isOptSet('async_gpu'):
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation", system.config["async_gpu"])
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation", "true")
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation\\default", "true")
+
+    # NVDEC Emulation
+    if system.isOptSet('nvdec_emu'):
+        yuzuConfig.set("Renderer", "nvdec_emulation", system.config["nvdec_emu"])
+        yuzuConfig.set("Renderer", "nvdec_emulation\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "nvdec_emulation", "2")
+        yuzuConfig.set("Renderer", "nvdec_emulation\\default", "true")
+
+    # Gpu Accuracy
+    if system.isOptSet('gpuaccuracy'):
+        yuzuConfig.set("Renderer", "gpu_accuracy", system.config["gpuaccuracy"])
+    else:
+        yuzuConfig.set("Renderer", "gpu_accuracy", "0")
+    yuzuConfig.set("Renderer", "gpu_accuracy\\default", "false")
+
+    # Vsync
+    if system.isOptSet('vsync'):
+        yuzuConfig.set("Renderer", "use_vsync", system.config["vsync"])
+        yuzuConfig.set("Renderer", "use_vsync\\default", "false")
+        if system.config["vsync"] == "2":
+            yuzuConfig.set("Renderer", "use_vsync\\default", "true")
+    else:
+        yuzuConfig.set("Renderer", "use_vsync", "1")
+        yuzuConfig.set("Renderer", "use_vsync\\default", "false")
+
+    # Gpu cache garbage collection
+    if system.isOptSet('gpu_cache_gc'):
+        yuzuConfig.set("Renderer", "use_caches_gc", system.config["gpu_cache_gc"])
+    else:
+        yuzuConfig.set("Renderer", "use_caches_gc", "false")
+    yuzuConfig.set("Renderer", "use_caches_gc\\default", "false")
+
+    # Max anisotropy
+    if system.isOptSet('anisotropy'):
+        yuzuConfig.set("Renderer", "max_anisotropy", system.config["anisotropy"])
+        yuzuConfig.set("Renderer", "max_anisotropy\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "max_anisotropy", "0")
+        yuzuConfig.set("Renderer", "max_anisotropy\\default", "true")
+
+    # Resolution scaler
+    if system.isOptSet('resolution_scale'):
+        yuzuConfig.set("Renderer", "resolution_setup", system.config["resolution_scale"])
+        yuzuConfig.set("Renderer", "resolution_setup\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "resolution_setup", "2")
+        yuzuConfig.set("Renderer", "resolution_setup\\default", "true")
+
+    # Scaling filter
+    if system.isOptSet('scale_filter'):
+        yuzuConfig.set("Renderer", "scaling_filter", system.config["scale_filter"])
+        yuzuConfig.set("Renderer", "scaling_filter\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "scaling_filter", "1")
+        yuzuConfig.set("Renderer", "scaling_filter\\default", "true")
+
+    # Anti aliasing method
+    if system.isOptSet('aliasing_method'):
+        yuzuConfig.set("Renderer", "anti_aliasing", system.config["aliasing_method"])
+        yuzuConfig.set("Renderer", "anti_aliasing\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "anti_aliasing", "0")
+        yuzuConfig.set("Renderer", "anti_aliasing\\default", "true")
+
+    #ASTC Decoding Method
+    if system.isOptSet('accelerate_astc'):
+        yuzuConfig.set("Renderer", "accelerate_astc", system.config["accelerate_astc"])
+        yuzuConfig.set("Renderer", "accelerate_astc\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "accelerate_astc", "1")
+        yuzuConfig.set("Renderer", "accelerate_astc\\default", "true")
+
+    # ASTC Texture Recompression
+    if system.isOptSet('astc_recompression'):
+
+
+        yuzuConfig.set("Renderer", "astc_recompression", system.config["astc_recompression"])
+        yuzuConfig.set("Renderer", "astc_recompression\\default", "false")
+        if system.config["astc_recompression"] == "0":
+            yuzuConfig.set("Renderer", "use_vsync\\default", "true")
+        yuzuConfig.set("Renderer", "async_astc", "false")
+        yuzuConfig.set("Renderer", "async_astc\\default", "true")
+    else:
+        yuzuConfig.set("Renderer", "astc_recompression", "0")
+        yuzuConfig.set("Renderer", "astc_recompression\\default", "true")
+        yuzuConfig.set("Renderer", "async_astc", "false")
+        yuzuConfig.set("Renderer", "async_astc\\default", "true")
+
+    # Cpu Section
+    if not yuzuConfig.has_section("Cpu"):
+        yuzuConfig.add_section("Cpu")
+
+    # Cpu Accuracy
+    if system.isOptSet('cpuaccuracy'):
+        yuzuConfig.set("Cpu", "cpu_accuracy", system.config["cpuaccuracy"])
+        yuzuConfig.set("Cpu", "cpu_accuracy\\default", "false")
+    else:
+        yuzuConfig.set("Cpu", "cpu_accuracy", "0")
+        yuzuConfig.set("Cpu", "cpu_accuracy\\default", "true")
+
+    # System section
+    if not yuzuConfig.has_section("System"):
+        yuzuConfig.add_section("System")
+
+    # Language
+    if system.isOptSet('language'):
+        yuzuConfig.set("System", "language_index", system.config["language"])
+        yuzuConfig.set("System", "language_index\\default", "false")
+    else:
+        yuzuConfig.set("System", "language_index", "1")
+        yuzuConfig.set("System", "language_index\\default", "true")
+
+    # Audio Mode
+    if system.isOptSet('audio_mode'):
+        yuzuConfig.set("System", "sound_index", system.config["audio_mode"])
+        yuzuConfig.set("System", "sound_index\\default", "false")
+    else:
+        yuzuConfig.set("System", "sound_index", "1")
+        yuzuConfig.set("System", "sound_index\\default", "true")
+
+    # Region
+    if system.isOptSet('region'):
+        yuzuConfig.set("System", "region_index", system.config["region"])
+        yuzuConfig.set("System", "region_index\\default", "false")
+    else:
+        yuzuConfig.set("System", "region_index", "1")
+        yuzuConfig.set("System", "region_index\\default", "true")
+
+    # Dock Mode
+    if system.isOptSet('dock_mode'):
+        if system.config["dock_mode"] == "1":
+            yuzuConfig.set("System", "use_docked_mode", "1")
+            yuzuConfig.set("System", "use_docked_mode\\default", "true")
+        elif system.config["dock_mode"] == "0":
+            yuzuConfig.set("System", "use_docked_mode", "0")
+            yuzuConfig.set("System", "use_docked_mode\\default", "false")
+    else:
+        yuzuConfig.set("System", "use_docked_mode", "1")
+        yuzuConfig.set("System", "use_docked_mode\\default", "true")
+
+    # Applet section
+    if not yuzuConfig.has_section("LibraryApplet"):
+        yuzuConfig.add_section("LibraryApplet")
+    yuzuConfig.set("LibraryApplet", "swkbd_applet_mode", "0")
+    yuzuConfig.set("LibraryApplet", "swkbd_applet_mode\\default", "false")
+
+    # telemetry section
+    if not yuzuConfig.has_section("WebService"):
+        yuzuConfig.add_section("WebService")
+    yuzuConfig.set("WebService", "enable_telemetry", "false")
+    yuzuConfig.set("WebService", "enable_telemetry\\default", "false")
+
+
+    # Services section
+    if not yuzuConfig.has_section("Services"):
+        yuzuConfig.add_section("Services")
+    yuzuConfig.set("Services", "bcat_backend", "none")
+    yuzuConfig.set("Services", "bcat_backend\\default", "none")
+
+
+def yuzu(yuzuConfig, system):
+    # UI section
+    if not yuzuConfig.has_section("UI"):
+        yuzuConfig.add_section("UI")
+
+    yuzuConfig.set("UI", "fullscreen", "true")
+    yuzuConfig.set("UI", "fullscreen\\default", "false")
+    yuzuConfig.set("UI", "confirmClose", "false")
+    yuzuConfig.set("UI", "confirmClose\\default", "false")
+    yuzuConfig.set("UI", "confirmStop", "2")
+    yuzuConfig.set("UI", "confirmStop\\default", "false")
+    yuzuConfig.set("UI", "firstStart", "false")
+    yuzuConfig.set("UI", "firstStart\\default", "false")
+    yuzuConfig.set("UI", "displayTitleBars", "false")
+    yuzuConfig.set("UI", "displayTitleBars\\default", "false")
+
+    if system.isOptSet('yuzu_enable_discord_presence'):
+        yuzuConfig.set("UI", "enable_discord_presence", system.config["yuzu_enable_discord_presence"])
+    else:
+        yuzuConfig.set("UI", "enable_discord_presence", "false")
+
+    yuzuConfig.set("UI", "enable_discord_presence\\default", "false")
+
+
+
+    yuzuConfig.set("UI", "calloutFlags", "1")
+    yuzuConfig.set("UI", "calloutFlags\\default", "false")
+
+    # Single Window Mode
+    if system.isOptSet('single_window'):
+        yuzuConfig.set("UI", "singleWindowMode", system.config["single_window"])
+        yuzuConfig.set("UI", "singleWindowMode\\default", "false")
+    else:
+        yuzuConfig.set("UI", "singleWindowMode", "true")
+        yuzuConfig.set("UI", "singleWindowMode\\default", "true")
+
+    # User Profile select on boot
+    if system.isOptSet('user_profile'):
+        yuzuConfig.set("UI", "select_user_on_boot", system.config["user_profile"])
+        yuzuConfig.set("UI", "select_user_on_boot\\default", "false")
+    else:
+        yuzuConfig.set("UI", "select_user_on_boot", "true")
+        yuzuConfig.set("UI", "select_user_on_boot\\default", "true")
+
+    yuzuConfig.set("UI", "hideInactiveMouse", "true")
+    yuzuConfig.set("UI", "hideInactiveMouse\\default", "true")
+
+    # Roms path (need for load update/dlc)
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\deep_scan", "true")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\deep_scan\\default", "false")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\expanded", "true")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\expanded\\default", "true")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\1\\path", "/userdata/roms/switch")
+    yuzuConfig.set("UI", "Paths\\gamedirs\\size", "1")
+
+    # game list cache, kept between launches (see gameListCache)
+    yuzuConfig.set("UI", "cache_game_list", "true")
+    yuzuConfig.set("UI", "cache_game_list\\default", "true")
+
+    yuzuConfig.set("UI", "Screenshots\\enable_screenshot_save_as", "true")
+    yuzuConfig.set("UI", "Screenshots\\enable_screenshot_save_as\\default", "true")
+    yuzuConfig.set("UI", "Screenshots\\screenshot_path", "/userdata/screenshots")
+    yuzuConfig.set("UI", "Screenshots\\screenshot_path\\default", "false")
+
+
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20yuzu\Controller_KeySeq", "Minus+Plus")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20yuzu\Controller_KeySeq\\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\KeySeq", "F4")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\KeySeq\\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\Controller_KeySeq", "Minus+B")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\Controller_KeySeq\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\Controller_KeySeq", "Home+ZL")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\Controller_KeySeq\\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\KeySeq", "Esc")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\KeySeq\\default", "false")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Continue\Pause%20Emulation\KeySeq", "P")
+    yuzuConfig.set("UI", "Shortcuts\Main%20Window\Continue\Pause%20Emulation\KeySeq\default", "false")
+
+
+    # Data Storage section
+    if not yuzuConfig.has_section("Data%20Storage"):
+        yuzuConfig.add_section("Data%20Storage")
+    yuzuConfig.set("Data%20Storage", "dump_directory", "/userdata/system/configs/yuzu/dump")
+    yuzuConfig.set("Data%20Storage", "dump_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "load_directory", "/userdata/system/configs/yuzu/load")
+    yuzuConfig.set("Data%20Storage", "load_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "nand_directory", "/userdata/system/configs/yuzu/nand")
+    yuzuConfig.set("Data%20Storage", "nand_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "sdmc_directory", "/userdata/system/configs/yuzu/sdmc")
+    yuzuConfig.set("Data%20Storage", "sdmc_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "tas_directory", "/userdata/system/configs/yuzu/tas")
+    yuzuConfig.set("Data%20Storage", "tas_directory\\default", "true")
+
+    yuzuConfig.set("Data%20Storage", "use_virtual_sd", "true")
+    yuzuConfig.set("Data%20Storage", "use_virtual_sd\\default", "true")
+
+    # Core section
+    if not yuzuConfig.has_section("Core"):
+        yuzuConfig.add_section("Core")
+
+    # Multicore
+    if system.isOptSet('multicore'):
+        yuzuConfig.set("Core", "use_multi_core", system.config["multicore"])
+        yuzuConfig.set("Core", "use_multi_core\\default", "false")
+    else:
+        yuzuConfig.set("Core", "use_multi_core", "true")
+        yuzuConfig.set("Core", "use_multi_core\\default", "true")
+
+    # Renderer section
+    if not yuzuConfig.has_section("Renderer"):
+        yuzuConfig.add_section("Renderer")
+
+    # Aspect ratio
+    if system.isOptSet('yuzu_ratio'):
+        yuzuConfig.set("Renderer", "aspect_ratio", system.config["yuzu_ratio"])
+        yuzuConfig.set("Renderer", "aspect_ratio\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "aspect_ratio", "0")
+        yuzuConfig.set("Renderer", "aspect_ratio\\default", "true")
+
+    # Graphical backend
+    if system.isOptSet('yuzu_backend'):
+        yuzuConfig.set("Renderer", "backend", system.config["yuzu_backend"])
+    else:
+        yuzuConfig.set("Renderer", "backend", "0")
+    yuzuConfig.set("Renderer", "backend\\default", "false")
+
+    # Async Shader compilation
+    if system.isOptSet('async_shaders'):
+        yuzuConfig.set("Renderer", "use_asynchronous_shaders", system.config["async_shaders"])
+    else:
+        yuzuConfig.set("Renderer", "use_asynchronous_shaders", "true")
+    yuzuConfig.set("Renderer", "use_asynchronous_shaders\\default", "false")
+
+    # Assembly shaders
+    if system.isOptSet('shaderbackend'):
+        yuzuConfig.set("Renderer", "shader_backend", system.config["shaderbackend"])
+        yuzuConfig.set("Renderer", "shader_backend\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "shader_backend", "0")
+        yuzuConfig.set("Renderer", "shader_backend\\default", "true")
+
+    # Async Gpu Emulation
+    if system.isOptSet('async_gpu'):
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation", system.config["async_gpu"])
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation", "true")
+        yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation\\default", "true")
+
+    # NVDEC Emulation
+    if system.isOptSet('nvdec_emu'):
+        yuzuConfig.set("Renderer", "nvdec_emulation", system.config["nvdec_emu"])
+        yuzuConfig.set("Renderer", "nvdec_emulation\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "nvdec_emulation", "2")
+        yuzuConfig.set("Renderer", "nvdec_emulation\\default", "true")
+
+    # Gpu Accuracy
+    if system.isOptSet('gpuaccuracy'):
+        yuzuConfig.set("Renderer", "gpu_accuracy", system.config["gpuaccuracy"])
+    else:
+        yuzuConfig.set("Renderer", "gpu_accuracy", "0")
+    yuzuConfig.set("Renderer", "gpu_accuracy\\default", "false")
+
+    # Vsync
+    if system.isOptSet('vsync'):
+        yuzuConfig.set("Renderer", "use_vsync", system.config["vsync"])
+        yuzuConfig.set("Renderer", "use_vsync\\default", "false")
+        if system.config["vsync"] == "2":
+            yuzuConfig.set("Renderer", "use_vsync\\default", "true")
+    else:
+        yuzuConfig.set("Renderer", "use_vsync", "1")
+        yuzuConfig.set("Renderer", "use_vsync\\default", "false")
+
+    # Gpu cache garbage collection
+    if system.isOptSet('gpu_cache_gc'):
+        yuzuConfig.set("Renderer", "use_caches_gc", system.config["gpu_cache_gc"])
+    else:
+        yuzuConfig.set("Renderer", "use_caches_gc", "false")
+    yuzuConfig.set("Renderer", "use_caches_gc\\default", "false")
+
+    # Max anisotropy
+    if system.isOptSet('anisotropy'):
+        yuzuConfig.set("Renderer", "max_anisotropy", system.config["anisotropy"])
+        yuzuConfig.set("Renderer", "max_anisotropy\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "max_anisotropy", "0")
+        yuzuConfig.set("Renderer", "max_anisotropy\\default", "true")
+
+    # Resolution scaler
+    if system.isOptSet('resolution_scale'):
+        yuzuConfig.set("Renderer", "resolution_setup", system.config["resolution_scale"])
+        yuzuConfig.set("Renderer", "resolution_setup\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "resolution_setup", "2")
+        yuzuConfig.set("Renderer", "resolution_setup\\default", "true")
+
+    # Scaling filter
+    if system.isOptSet('scale_filter'):
+        yuzuConfig.set("Renderer", "scaling_filter", system.config["scale_filter"])
+        yuzuConfig.set("Renderer", "scaling_filter\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "scaling_filter", "1")
+        yuzuConfig.set("Renderer", "scaling_filter\\default", "true")
+
+    # Anti aliasing method
+    if system.isOptSet('aliasing_method'):
+        yuzuConfig.set("Renderer", "anti_aliasing", system.config["aliasing_method"])
+        yuzuConfig.set("Renderer", "anti_aliasing\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "anti_aliasing", "0")
+        yuzuConfig.set("Renderer", "anti_aliasing\\default", "true")
+
+    #ASTC Decoding Method
+    if system.isOptSet('accelerate_astc'):
+        yuzuConfig.set("Renderer", "accelerate_astc", system.config["accelerate_astc"])
+        yuzuConfig.set("Renderer", "accelerate_astc\\default", "false")
+    else:
+        yuzuConfig.set("Renderer", "accelerate_astc", "1")
+        yuzuConfig.set("Renderer", "accelerate_astc\\default", "true")
+
+    # ASTC Texture Recompression
+    if system.isOptSet('astc_recompression'):
+
+
+        yuzuConfig.set("Renderer", "astc_recompression", system.config["astc_recompression"])
+        yuzuConfig.set("Renderer", "astc_recompression\\default", "false")
+        if system.config["astc_recompression"] == "0":
+            yuzuConfig.set("Renderer", "use_vsync\\default", "true")
+        yuzuConfig.set("Renderer", "async_astc", "false")
+        yuzuConfig.set("Renderer", "async_astc\\default", "true")
+    else:
+        yuzuConfig.set("Renderer", "astc_recompression", "0")
+        yuzuConfig.set("Renderer", "astc_recompression\\default", "true")
+        yuzuConfig.set("Renderer", "async_astc", "false")
+        yuzuConfig.set("Renderer", "async_astc\\default", "true")
+
+    # Cpu Section
+    if not yuzuConfig.has_section("Cpu"):
+        yuzuConfig.add_section("Cpu")
+
+    # Cpu Accuracy
+    if system.isOptSet('cpuaccuracy'):
+        yuzuConfig.set("Cpu", "cpu_accuracy", system.config["cpuaccuracy"])
+        yuzuConfig.set("Cpu", "cpu_accuracy\\default", "false")
+    else:
+        yuzuConfig.set("Cpu", "cpu_accuracy", "0")
+        yuzuConfig.set("Cpu", "cpu_accuracy\\default", "true")
+
+    # System section
+    if not yuzuConfig.has_section("System"):
+        yuzuConfig.add_section("System")
+
+    # Language
+    if system.isOptSet('language'):
+        yuzuConfig.set("System", "language_index", system.config["language"])
+        yuzuConfig.set("System", "language_index\\default", "false")
+    else:
+        yuzuConfig.set("System", "language_index", "1")
+        yuzuConfig.set("System", "language_index\\default", "true")
+
+    # Audio Mode
+    if system.isOptSet('audio_mode'):
+        yuzuConfig.set("System", "sound_index", system.config["audio_mode"])
+        yuzuConfig.set("System", "sound_index\\default", "false")
+    else:
+        yuzuConfig.set("System", "sound_index", "1")
+        yuzuConfig.set("System", "sound_index\\default", "true")
+
+    # Region
+    if system.isOptSet('region'):
+        yuzuConfig.set("System", "region_index", system.config["region"])
+        yuzuConfig.set("System", "region_index\\default", "false")
+    else:
+        yuzuConfig.set("System", "region_index", "1")
+        yuzuConfig.set("System", "region_index\\default", "true")
+
+    # Dock Mode
+    if system.isOptSet('dock_mode'):
+        if system.config["dock_mode"] == "1":
+            yuzuConfig.set("System", "use_docked_mode", "1")
+            yuzuConfig.set("System", "use_docked_mode\\default", "true")
+        elif system.config["dock_mode"] == "0":
+            yuzuConfig.set("System", "use_docked_mode", "0")
+            yuzuConfig.set("System", "use_docked_mode\\default", "false")
+    else:
+        yuzuConfig.set("System", "use_docked_mode", "1")
+        yuzuConfig.set("System", "use_docked_mode\\default", "true")
+
+    # Applet section
+    if not yuzuConfig.has_section("LibraryApplet"):
+        yuzuConfig.add_section("LibraryApplet")
+    yuzuConfig.set("LibraryApplet", "swkbd_applet_mode", "0")
+    yuzuConfig.set("LibraryApplet", "swkbd_applet_mode\\default", "false")
+
+    # telemetry section
+    if not yuzuConfig.has_section("WebService"):
+        yuzuConfig.add_section("WebService")
+    yuzuConfig.set("WebService", "enable_telemetry", "false")
+    yuzuConfig.set("WebService", "enable_telemetry\\default", "false")
+
+
+    # Services section
+    if not yuzuConfig.has_section("Services"):
+        yuzuConfig.add_section("Services")
+    yuzuConfig.set("Services", "bcat_backend", "none")
+    yuzuConfig.set("Services", "bcat_backend\\default", "none")
@@ -1,12 +1,15 @@
 import os
 from pathlib import Path
 import xml.etree.ElementTree as ET
-import yaml
 import collections
 import logging
 
 from configgen.batoceraPaths import BATOCERA_CONF, BATOCERA_SHADERS, DEFAULTS_DIR, ES_SETTINGS, USER_SHADERS
-from configgen.settings.unixSettings import UnixSettings
+
+import defaultsCache
+import hardwareProbe
+import settingsIndex
+import titleProfiles
 
 eslog = logging.getLogger(__name__)
 
@@ -29,24 +32,34 @@ class Emulator():
 
         gsname = self.game_settings_name(rom)
 
-        # load configuration from batocera.conf
-        recalSettings = UnixSettings(BATOCERA_CONF)
+        # load configuration from batocera.conf (indexed once, cached until the file changes)
+        recalSettings = settingsIndex.load(BATOCERA_CONF)
         globalSettings = recalSettings.load_all('global')
         controllersSettings = recalSettings.load_all('controllers', True)
         systemSettings = recalSettings.load_all(self.name)
         folderSettings = recalSettings.load_all(self.name + ".folder[\"" + os.path.dirname(rom) + "\"]")
         gameSettings = recalSettings.load_all(self.name + "[\"" + gsname + "\"]")
+        # per title id profile, for the emulator the game will run with
+        profileEmulator = self.config["emulator"]
+        for settings in [globalSettings, systemSettings, folderSettings, gameSettings]:
+            profileEmulator = settings.get("emulator", profileEmulator)
+        profileSettings = titleProfiles.forRom(rom, profileEmulator)
 
         # add some other options
         displaySettings = recalSettings.load_all('display')
         for opt in displaySettings:
             self.config["display." + opt] = displaySettings[opt]
 
+        # defaults for this machine, below anything set in batocera.conf
+        if systemSettings.get("hardware_presets", globalSettings.get("hardware_presets", "1")) != "0":
+            Emulator.updateConfiguration(self.config, hardwareProbe.presets(hardwareProbe.get()))
+
         # update config
         Emulator.updateConfiguration(self.config, controllersSettings)
         Emulator.updateConfiguration(self.config, globalSettings)
         Emulator.updateConfiguration(self.config, systemSettings)
         Emulator.updateConfiguration(self.config, folderSettings)
+        Emulator.updateConfiguration(self.config, profileSettings)
         Emulator.updateConfiguration(self.config, gameSettings)
         self.updateFromESSettings()
         eslog.debug("uimode: {}".format(self.config['uimode']))
@@ -125,30 +138,8 @@ class Emulator():
 
     @staticmethod
     def get_generic_config(system: str, defaultyml: Path, defaultarchyml: Path):
-        with defaultyml.open('r') as f:
-            systems_default = yaml.load(f, Loader=yaml.CLoader)
-
-        systems_default_arch = {}
-        if defaultarchyml.exists():
-            with defaultarchyml.open('r') as f:
-                systems_default_arch = yaml.load(f, Loader=yaml.CLoader)
-                if systems_default_arch is None:
-                    systems_default_arch = {}
-        dict_all = {}
-
-        if "default" in systems_default:
-            dict_all = systems_default["default"]
-
-        if "default" in systems_default_arch:
-            Emulator.dict_merge(dict_all, systems_default_arch["default"])
-
-        if system in systems_default:
-            Emulator.dict_merge(dict_all, systems_default[system])
-
-        if system in systems_default_arch:
-            Emulator.dict_merge(dict_all, systems_default_arch[system])
-
-        return dict_all
+        # merged defaults are compiled once and cached until one of the yml files changes
+        return defaultsCache.get_generic_config(system, defaultyml, defaultarchyml)
 
     @staticmethod
     def get_system_config(system: str, defaultyml: Path, defaultarchyml: Path):
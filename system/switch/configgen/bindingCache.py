@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import logging
+import sys
+import time
+from collections.abc import Mapping
+from typing import Any, Final
+
+import cacheFiles
+
+eslog = logging.getLogger(__name__)
+
+# the bindings of the controllers as the generators render them (the player_N_* values of the yuzu family,
+# the input_config entries of ryujinx), kept between launches: the same pads are used launch after launch.
+# an entry is keyed by the emulator, the controller (guid, name), its sdl mapping, the pad type option and
+# the port; the player index is not part of it, the generators patch it. the es_input.cfg files the batocera
+# mappings come from are the key of the whole cache.
+CACHE_FILE: Final = cacheFiles.CACHE_DIR + '/bindings.pickle'
+# bump when the rendering of the bindings changes
+CACHE_VERSION: Final = 1
+# entries kept, the oldest ones are dropped
+MAX_ENTRIES: Final = 256
+
+# the keys of an sdl mapping which depend on the enumeration, not on the controller
+_ENUMERATION_KEYS: Final = ("index", "path")
+
+class BindingCache:
+    __slots__ = ("key", "entries", "changed", "hits", "misses")
+
+    def __init__(self, key: Any, entries: dict[Any, Any] | None = None) -> None:
+        self.key = key
+        self.entries: dict[Any, Any] = entries if entries is not None else {}
+        self.changed = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Any | None:
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        self.entries[key] = value
+        while len(self.entries) > MAX_ENTRIES:
+            del self.entries[next(iter(self.entries))]
+        self.changed = True
+
+    def save(self) -> None:
+        eslog.debug(f"bindings: {self.hits} cached, {self.misses} rendered")
+        if self.changed:
+            cacheFiles.store(CACHE_FILE, self.key, self.entries)
+            self.changed = False
+
+def mappingKey(sdlMapping: Mapping[str, Any] | None) -> tuple[Any, ...] | None:
+    # the sdl mapping of a controller without its place in the enumeration
+    if sdlMapping is None:
+        return None
+    return tuple((k, v) for k, v in sdlMapping.items() if k not in _ENUMERATION_KEYS)
+
+_cache: BindingCache | None = None
+
+def load() -> BindingCache:
+    # memoized for the process while the es_input.cfg files don't change. a launch of the daemon runs in a forked
+    # worker which exits after it, so between launches the cache is the pickle
+    # imported here: controllersConfig needs the configgen package, the benchmark below runs without it
+    import controllersConfig
+
+    global _cache
+    key = (CACHE_VERSION, *(cacheFiles.fileStamp(conffile) for conffile in controllersConfig.ES_INPUT_FILES))
+    if _cache is None or _cache.key != key:
+        _cache = BindingCache(key, cacheFiles.load(CACHE_FILE, key))
+    _cache.hits = _cache.misses = 0
+    return _cache
+
+def stamp(options: dict[str, Any], player: str, bindings: list[tuple[str, str]]) -> None:
+    # the cached player_N_* values (tails after "player_N") of a player
+    prefix = "player_" + player
+    for tail, value in bindings:
+        options[prefix + tail] = value
+
+if __name__ == '__main__':
+    # python bindingCache.py [runs] : the Controls bindings of an 8 player launch, rendered (cold) against cached (warm)
+    from iniConfig import IniConfig
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    buttons = {"button_a": 1, "button_b": 0, "button_x": 3, "button_y": 2, "button_dup": "hat0", "button_ddown": "hat0",
+               "button_dleft": "hat0", "button_dright": "hat0", "button_l": 9, "button_r": 10, "button_plus": 6,
+               "button_minus": 4, "button_sl": 9, "button_sr": 10, "button_zl": "axis", "button_zr": "axis",
+               "button_lstick": 7, "button_rstick": 8, "button_home": 5}
+    hats = {"button_dup": "up", "button_ddown": "down", "button_dleft": "left", "button_dright": "right"}
+    axis = {"lstick": 0, "rstick": 2}
+    players = [(str(player), "0300000%025x" % player, str(player), ("sdl", player)) for player in range(8)]
+
+    def render(guid: str, port: str) -> list[tuple[str, str]]:
+        # the sdl branch of the generators
+        bindings = []
+        for x in buttons:
+            if "hat" in str(buttons[x]):
+                bindings.append(("_" + x, '"{},direction:{},guid:{},port:{},engine:sdl"'.format(buttons[x], hats[x], guid, port)))
+            elif "axis" in str(buttons[x]):
+                bindings.append(("_" + x, '"engine:sdl,invert:+,port:{},guid:{},axis:{},threshold:0.500000"'.format(port, guid, 4)))
+            else:
+                bindings.append(("_" + x, '"button:{},guid:{},port:{},engine:sdl"'.format(buttons[x], guid, port)))
+            bindings.append(("_" + x + "\\default", "false"))
+        for x in axis:
+            bindings.append(("_" + x, '"engine:sdl,port:{},guid:{},axis_x:{},offset_x:-0.011750,axis_y:{},offset_y:-0.027467,invert_x:-,invert_y:+,deadzone:0.150000,range:0.950000"'.format(port, guid, axis[x] + 1, axis[x])))
+        return bindings
+
+    def launch(cache: BindingCache | None) -> IniConfig:
+        config = IniConfig()
+        config.add_section("Controls")
+        controls = config.section("Controls")
+        for player, guid, port, key in players:
+            bindings = cache.get(key) if cache is not None else None
+            if bindings is None:
+                bindings = render(guid, port)
+                if cache is not None:
+                    cache.put(key, bindings)
+            stamp(controls, player, bindings)
+        return config
+
+    warm = BindingCache(None)
+    assert launch(None).dumps() == launch(warm).dumps() == launch(warm).dumps(), "the outputs differ"
+    for name, cache in [("cold", None), ("warm", warm)]:
+        start = time.perf_counter()
+        for _ in range(runs):
+            launch(cache)
+        print(f"{name:5}: {(time.perf_counter() - start) * 1000 / runs:8.3f} ms per launch")
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+from typing import TYPE_CHECKING, Any
+
+import batoceraFiles
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+eslog = logging.getLogger(__name__)
+
+# persistent caches (survive reboots)
+CACHE_DIR = batoceraFiles.CACHE + '/switch'
+# per boot caches (tmpfs)
+RUN_DIR = '/var/run/switchlauncher'
+
+def fileStamp(path: str | Path) -> tuple[int, int, int] | None:
+    # identity of a file content without reading it
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def load(path: str | Path, key: Any) -> Any | None:
+    # data stored with the same key, None if missing, stale or unreadable
+    try:
+        with open(path, "rb") as f:
+            storedKey, data = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        eslog.debug(f"ignoring the cache {path}: {e}")
+        return None
+    if storedKey != key:
+        return None
+    return data
+
+def store(path: str | Path, key: Any, data: Any) -> bool:
+    # atomic: a reader sees either the old or the new cache, never a partial one
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump((key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception as e:
+        eslog.debug(f"unable to write the cache {path}: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+    return True
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import logging
+import os
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any, Final
+
+import cacheFiles
+
+eslog = logging.getLogger(__name__)
+
+# the configuration files of the emulators (qt-config.ini, Config.json) are generated from the settings, the
+# controllers, the emulator and the file itself. when none of them changed since the last generation, and the
+# file is still the one written then, the generation is skipped.
+# when the emulator rewrites its file (on exit), the next launch generates it again.
+# bump when the generation changes without a change of its inputs
+CACHE_VERSION: Final = 1
+
+# the environment read by the generation (the language of ryujinx, the mappings given to sdl)
+ENVIRONMENT: Final = ("LANG", "SDL_GAMECONTROLLERCONFIG")
+
+# ioctl FICLONE: a copy on write clone (btrfs, xfs), the "before" copy shares the blocks of the file
+FICLONE: Final = 0x40049409
+
+def _statePath(output: str | Path) -> str:
+    name = hashlib.sha1(str(output).encode()).hexdigest()[:16]
+    return f"{cacheFiles.CACHE_DIR}/config-{name}.pickle"
+
+def _fileDigest(path: str | Path) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def inputsKey(config: Mapping[str, Any], playersControllers: Mapping[str, Any], files: Iterable[str | Path]) -> str:
+    # settings, controllers (as es gives them), and the files the generation depends on (emulator, generator)
+    h = hashlib.sha1()
+    h.update(repr(sorted((str(k), repr(v)) for k, v in config.items())).encode())
+    for player in sorted(playersControllers):
+        c = playersControllers[player]
+        h.update(repr((player, c.type, c.configName, c.realName, c.guid, c.index, c.dev, c.nbbuttons, c.nbhats, c.nbaxes,
+                       [(k, i.type, i.id, i.value, i.code) for k, i in c.inputs.items()])).encode())
+    h.update(repr([(str(f), cacheFiles.fileStamp(f)) for f in files]).encode())
+    for variable in ENVIRONMENT:
+        h.update(f"{variable}={os.environ.get(variable, '')}\n".encode())
+    return h.hexdigest()
+
+def unchanged(output: str | Path, before: str | Path, key: str) -> bool:
+    # True when the file (and its before copy) are the ones generated from the same inputs
+    digest = cacheFiles.load(_statePath(output), (CACHE_VERSION, key))
+    if digest is None or not os.path.exists(before):
+        return False
+    return _fileDigest(output) == digest
+
+def _writeAtomic(path: str | Path, data: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def _cloneAtomic(source: str | Path, path: str | Path) -> bool:
+    # not a hardlink: the emulator may rewrite its file in place, the copy must keep the generated content
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(source, "rb") as src, open(tmp, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+    return True
+
+def write(output: str | Path, before: str | Path, content: str, key: str | None = None) -> None:
+    # one serialization: the file, then its before copy (a clone, else the same buffer)
+    data = content.encode()
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    _writeAtomic(output, data)
+    if not _cloneAtomic(output, before):
+        _writeAtomic(before, data)
+    if key is not None:
+        cacheFiles.store(_statePath(output), (CACHE_VERSION, key), hashlib.sha1(data).hexdigest())
+
+def keep(output: str | Path, before: str | Path, key: str | None = None) -> None:
+    # the file is already the one the generation gives (nothing to patch): only its before copy and its state
+    with open(output, "rb") as f:
+        data = f.read()
+    if not _cloneAtomic(output, before):
+        _writeAtomic(before, data)
+    if key is not None:
+        cacheFiles.store(_statePath(output), (CACHE_VERSION, key), hashlib.sha1(data).hexdigest())
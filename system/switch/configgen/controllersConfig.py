@@ -3,21 +3,28 @@ from __future__ import annotations
 import logging
 import re
 import xml.etree.ElementTree as ET
-from collections.abc import Iterable, Mapping
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, NotRequired, TypeAlias, TypedDict
-
-import evdev
-import pyudev
+from typing import TYPE_CHECKING, Any, Final, TypeAlias
 
 from configgen.batoceraPaths import BATOCERA_ES_DIR, ES_GAMES_METADATA, USER_ES_DIR
 
+import cacheFiles
+import lazyImports
+
 if TYPE_CHECKING:
 
     from configgen.types import DeviceInfoDict, DeviceInfoMapping, GunDict, GunMapping
 
 eslog = logging.getLogger(__name__)
 
+# imported on first use, not with the module: pyudev when the snapshot of the input devices is taken, evdev when
+# it reads the capabilities of a device (the axis ranges of evmapy, guns and wheels), which most launches do.
+# the launcher daemon preloads both
+evdev = lazyImports.lazy("evdev")
+pyudev = lazyImports.lazy("pyudev")
+
 
 """Default mapping of Batocera keys to SDL_GAMECONTROLLERCONFIG keys."""
 _DEFAULT_SDL_MAPPING = {
@@ -34,6 +41,8 @@ _DEFAULT_SDL_MAPPING = {
 
 
 class Input:
+    __slots__ = ("name", "type", "id", "value", "code")
+
     def __init__(self, name: str, type: str, id: str, value: str, code: str) -> None:
         self.name = name
         self.type = type
@@ -46,6 +55,8 @@ InputDict: TypeAlias = dict[str, Input]
 
 
 class Controller:
+    __slots__ = ("type", "configName", "index", "realName", "guid", "player", "dev", "nbbuttons", "nbhats", "nbaxes", "inputs")
+
     def __init__(
         self,
         configName: str,
@@ -77,46 +88,83 @@ ControllerMapping: TypeAlias = Mapping[str, Controller]
 ControllerDict: TypeAlias = dict[str, Controller]
 
 
-# Load all controllers from the es_input.cfg
-def loadAllControllersConfig() -> ControllerDict:
-    controllers: ControllerDict = {}
-    for conffile in [BATOCERA_ES_DIR / "es_input.cfg", USER_ES_DIR / 'es_input.cfg']:
+ES_INPUT_FILES: Final = (BATOCERA_ES_DIR / "es_input.cfg", USER_ES_DIR / 'es_input.cfg')
+# the es_input.cfg files, compiled: warm launches don't parse the xml
+CONTROLLERS_CACHE: Final = cacheFiles.CACHE_DIR + '/controllers.pickle'
+# bump when ControllerDB, Controller or Input change
+CONTROLLERS_CACHE_VERSION: Final = 1
+
+
+class ControllerDB:
+    """The known controllers, with the indexes findBestControllerConfig searches them with."""
+    __slots__ = ("controllers", "byGuidName", "byGuid", "byName", "lastByName")
+
+    def __init__(self, controllers: Iterable[Controller] = ()) -> None:
+        # guid + name -> controller, as loadAllControllersConfig always returned them
+        self.controllers: ControllerDict = {}
+        # the latest controller of each name, for loadAllControllersByNameConfig
+        self.lastByName: ControllerDict = {}
+        for controller in controllers:
+            self.controllers[controller.guid + controller.configName] = controller
+            self.lastByName[controller.configName] = controller
+        # in the order of self.controllers, the first match wins, as the linear searches did
+        self.byGuidName: dict[tuple[str, str], Controller] = {}
+        self.byGuid: ControllerDict = {}
+        self.byName: ControllerDict = {}
+        for controller in self.controllers.values():
+            self.byGuidName.setdefault((controller.guid, controller.configName), controller)
+            self.byGuid.setdefault(controller.guid, controller)
+            self.byName.setdefault(controller.configName, controller)
+
+    def find(self, guid: str, name: str) -> Controller | None:
+        # same guid and name, else same guid, else same name
+        return self.byGuidName.get((guid, name)) or self.byGuid.get(guid) or self.byName.get(name)
+
+
+def _parseControllers(conffiles: Iterable[Path]) -> list[Controller]:
+    controllers: list[Controller] = []
+    for conffile in conffiles:
         if conffile.exists():
             tree = ET.parse(conffile)
             root = tree.getroot()
             for controller in root.findall(".//inputConfig"):
                 controllerInstance = Controller(controller.get("deviceName"), controller.get("type"),
                                                 controller.get("deviceGUID"), None, None)
-                uidname = controller.get("deviceGUID") + controller.get("deviceName")
-                controllers[uidname] = controllerInstance
+                controllers.append(controllerInstance)
                 for input in controller.findall("input"):
                     inputInstance = Input(input.get("name"), input.get("type"), input.get("id"), input.get("value"), input.get("code"))
                     controllerInstance.inputs[input.get("name")] = inputInstance
     return controllers
 
+_controllerDB: ControllerDB | None = None
+
+def loadControllerDB() -> ControllerDB:
+    # rebuilt only when one of the es_input.cfg files changed
+    global _controllerDB
+    if _controllerDB is None:
+        key = (CONTROLLERS_CACHE_VERSION, *(cacheFiles.fileStamp(conffile) for conffile in ES_INPUT_FILES))
+        _controllerDB = cacheFiles.load(CONTROLLERS_CACHE, key)
+        if _controllerDB is None:
+            eslog.debug("compiling the controllers of es_input.cfg")
+            _controllerDB = ControllerDB(_parseControllers(ES_INPUT_FILES))
+            cacheFiles.store(CONTROLLERS_CACHE, key, _controllerDB)
+    return _controllerDB
+
+
+# Load all controllers from the es_input.cfg
+def loadAllControllersConfig() -> ControllerDict:
+    return dict(loadControllerDB().controllers)
+
 
 # Load all controllers from the es_input.cfg
 def loadAllControllersByNameConfig():
-    controllers: ControllerDict = {}
-    for conffile in [BATOCERA_ES_DIR / "es_input.cfg", USER_ES_DIR / 'es_input.cfg']:
-        if conffile.exists():
-            tree = ET.parse(conffile)
-            root = tree.getroot()
-            for controller in root.findall(".//inputConfig"):
-                controllerInstance = Controller(controller.get("deviceName"), controller.get("type"),
-                                                controller.get("deviceGUID"), None, None)
-                deviceName = controller.get("deviceName")
-                controllers[deviceName] = controllerInstance
-                for input in controller.findall("input"):
-                    inputInstance = Input(input.get("name"), input.get("type"), input.get("id"), input.get("value"), input.get("code"))
-                    controllerInstance.inputs[input.get("name")] = inputInstance
-    return controllers
+    return dict(loadControllerDB().lastByName)
 
 
 # Create a controller array with the player id as a key
 def loadControllerConfig(controllersInput: Iterable[Mapping[str, Any]]) -> ControllerDict:
     playerControllers: ControllerDict = {}
-    controllers = loadAllControllersConfig()
+    controllers = loadControllerDB()
 
     for i, ci in enumerate(controllersInput):
         newController = findBestControllerConfig(controllers, str(i+1), ci["guid"], ci["index"], ci["name"], ci["devicepath"], ci["nbbuttons"], ci["nbhats"], ci["nbaxes"])
@@ -124,24 +172,14 @@ def loadControllerConfig(controllersInput: Iterable[Mapping[str, Any]]) -> Contr
             playerControllers[str(i+1)] = newController
     return playerControllers
 
-def findBestControllerConfig(controllers: ControllerMapping, x: str, pxguid: str, pxindex: int, pxname: str, pxdev: str, pxnbbuttons: str, pxnbhats: str, pxnbaxes: str) -> Controller | None:
-    # when there will have more joysticks, use hash tables
-    for controllerGUID in controllers:
-        controller = controllers[controllerGUID]
-        if controller.guid == pxguid and controller.configName == pxname:
-            return Controller(controller.configName, controller.type, pxguid, x, pxindex, pxname,
-                              controller.inputs, pxdev, pxnbbuttons, pxnbhats, pxnbaxes)
-    for controllerGUID in controllers:
-        controller = controllers[controllerGUID]
-        if controller.guid == pxguid:
-            return Controller(controller.configName, controller.type, pxguid, x, pxindex, pxname,
-                              controller.inputs, pxdev, pxnbbuttons, pxnbhats, pxnbaxes)
-    for controllerGUID in controllers:
-        controller = controllers[controllerGUID]
-        if controller.configName == pxname:
-            return Controller(controller.configName, controller.type, pxguid, x, pxindex, pxname,
-                              controller.inputs, pxdev, pxnbbuttons, pxnbhats, pxnbaxes)
-    return None
+def findBestControllerConfig(controllers: ControllerDB | ControllerMapping, x: str, pxguid: str, pxindex: int, pxname: str, pxdev: str, pxnbbuttons: str, pxnbhats: str, pxnbaxes: str) -> Controller | None:
+    if not isinstance(controllers, ControllerDB):
+        controllers = ControllerDB(controllers.values())
+    controller = controllers.find(pxguid, pxname)
+    if controller is None:
+        return None
+    return Controller(controller.configName, controller.type, pxguid, x, pxindex, pxname,
+                      controller.inputs, pxdev, pxnbbuttons, pxnbhats, pxnbaxes)
 
 
 def _generateSdlGameControllerConfig(controller: Controller, sdlMapping: Mapping[str, str] = _DEFAULT_SDL_MAPPING) -> str:
@@ -288,8 +326,10 @@ def gunsBorderRatioType(guns: GunMapping, config: dict[str, str]) -> str | None:
     return None
 
 def getMouseButtons(device: evdev.InputDevice) -> list[str]:
-    caps = device.capabilities()
-    caps_keys = caps[evdev.ecodes.EV_KEY]
+    return _mouseButtons(device.capabilities())
+
+def _mouseButtons(caps: Mapping[int, Any]) -> list[str]:
+    caps_keys = caps.get(evdev.ecodes.EV_KEY, [])
     caps_filter = [evdev.ecodes.BTN_LEFT, evdev.ecodes.BTN_RIGHT, evdev.ecodes.BTN_MIDDLE, evdev.ecodes.BTN_1, evdev.ecodes.BTN_2, evdev.ecodes.BTN_3, evdev.ecodes.BTN_4, evdev.ecodes.BTN_5, evdev.ecodes.BTN_6, evdev.ecodes.BTN_7, evdev.ecodes.BTN_8]
     caps_intersection = list(set(caps_keys) & set(caps_filter))
     buttons: list[str] = []
@@ -343,42 +383,23 @@ def mouseButtonToCode(button: str) -> int | None:
     return None
 
 def getGuns() -> GunDict:
-    import re
-
-    import pyudev
-
     guns: GunDict = {}
-    context = pyudev.Context()
+    snapshot = getDeviceSnapshot()
 
     # guns are mouses, just filter on them
-    mouses = context.list_devices(subsystem='input')
-
-    # keep only mouses with /dev/iput/eventxx
-    mouses_clean = {}
-    for mouse in mouses:
-        matches = re.match(r"^/dev/input/event([0-9]*)$", str(mouse.device_node))
-        if matches != None:
-            if ("ID_INPUT_MOUSE" in mouse.properties and mouse.properties["ID_INPUT_MOUSE"]) == '1':
-                mouses_clean[int(matches.group(1))] = mouse
-    mouses = mouses_clean
-
-    nmouse = 0
-    ngun   = 0
-    for eventid in sorted(mouses):
-        eslog.info("found mouse {} at {} with id_mouse={}".format(nmouse, mouses[eventid].device_node, nmouse))
-        if "ID_INPUT_GUN" not in mouses[eventid].properties or mouses[eventid].properties["ID_INPUT_GUN"] != "1":
-            nmouse = nmouse + 1
+    ngun = 0
+    for mouse in snapshot.mouses:
+        nmouse = snapshot.mouseIndex[mouse.eventId]
+        eslog.info("found mouse {} at {} with id_mouse={}".format(nmouse, mouse.node, nmouse))
+        if not mouse.isGun:
             continue
 
-        device = evdev.InputDevice(mouses[eventid].device_node)
-        buttons = getMouseButtons(device)
+        name, caps = snapshot.capabilities(mouse.node)
+        buttons = _mouseButtons(caps)
 
         # retroarch uses mouse indexes into configuration files using ID_INPUT_MOUSE (TOUCHPAD are listed after mouses)
-        need_cross   = "ID_INPUT_GUN_NEED_CROSS"   in mouses[eventid].properties and mouses[eventid].properties["ID_INPUT_GUN_NEED_CROSS"]   == '1'
-        need_borders = "ID_INPUT_GUN_NEED_BORDERS" in mouses[eventid].properties and mouses[eventid].properties["ID_INPUT_GUN_NEED_BORDERS"] == '1'
-        guns[ngun] = {"node": mouses[eventid].device_node, "id_mouse": nmouse, "need_cross": need_cross, "need_borders": need_borders, "name": device.name, "buttons": buttons}
-        eslog.info("found gun {} at {} with id_mouse={} ({})".format(ngun, mouses[eventid].device_node, nmouse, guns[ngun]["name"]))
-        nmouse = nmouse + 1
+        guns[ngun] = {"node": mouse.node, "id_mouse": nmouse, "need_cross": mouse.needCross, "need_borders": mouse.needBorders, "name": name, "buttons": buttons}
+        eslog.info("found gun {} at {} with id_mouse={} ({})".format(ngun, mouse.node, nmouse, guns[ngun]["name"]))
         ngun = ngun + 1
 
     if len(guns) == 0:
@@ -405,11 +426,10 @@ def shortNameFromPath(path: str | Path) -> str:
     return ret
 
 def getGamesMetaData(system: str, rom: str | Path) -> dict[str, str]:
-    # load the database
-    tree = ET.parse(ES_GAMES_METADATA)
-    root = tree.getroot()
+    # looked up in the compiled database (gamesMetadata), rebuilt when gamesdb.xml changes
+    import gamesMetadata
+
     game = shortNameFromPath(rom)
-    res: dict[str, str] = {}
     eslog.info("looking for game metadata ({}, {})".format(system, game))
 
     targetSystem = system
@@ -419,27 +439,7 @@ def getGamesMetaData(system: str, rom: str | Path) -> dict[str, str]:
     if system in ['naomi', 'naomi2', 'atomiswave', 'fbneo', 'mame', 'neogeo', 'triforce', 'hypseus-singe', 'model2', 'model3', 'hikaru', 'gaelco', 'cave3rd', 'namco2x6']:
         targetSystem = 'arcade'
 
-    for nodesystem in root.findall(".//system"):
-        for sysname in nodesystem.get("name").split(','):
-            if sysname == targetSystem:
-                # search the game named default
-                for nodegame in nodesystem.findall(".//game"):
-                    if nodegame.get("name") == "default":
-                        for child in nodegame:
-                            for attribute in child.attrib:
-                                key = "{}_{}".format(child.tag, attribute)
-                                res[key] = child.get(attribute)
-                                eslog.info("found game metadata {}={} (system level)".format(key, res[key]))
-                        break
-                for nodegame in nodesystem.findall(".//game"):
-                    if nodegame.get("name") != "default" and nodegame.get("name") in game:
-                        for child in nodegame:
-                            for attribute in child.attrib:
-                                key = "{}_{}".format(child.tag, attribute)
-                                res[key] = child.get(attribute)
-                                eslog.info("found game metadata {}={}".format(key, res[key]))
-                        return res
-    return res
+    return gamesMetadata.lookup(targetSystem, game, ES_GAMES_METADATA)
 
 def dev2int(dev: str) -> int | None:
     matches = re.match(r"^/dev/input/event([0-9]*)$", dev)
@@ -448,61 +448,109 @@ def dev2int(dev: str) -> int | None:
     return int(matches.group(1))
 
 
-class _Device(TypedDict):
+@dataclass(slots=True)
+class SnapshotDevice:
     node: str
-    group: str | None
+    eventId: int
+    group: str | None       # ID_PATH, the devices of a same pad (a wiimote and its ir mouse...)
     isJoystick: bool
     isWheel: bool
-    isMouse: bool
-    wheel_rotation: NotRequired[int]
+    isMouse: bool           # ID_INPUT_MOUSE only, the touchpads are not counted by the guns
+    isTouchpad: bool
+    isGun: bool
+    needCross: bool
+    needBorders: bool
+    wheelRotation: int | None
+
+
+class DeviceSnapshot:
+    """The /dev/input/eventN devices, from one udev enumeration, for the launch.
+
+    The capabilities (name, buttons, axis ranges) are read once per device, when first needed."""
+    __slots__ = ("devices", "joystickIndex", "mouseIndex", "pointerIndex", "groups", "_capabilities")
+
+    def __init__(self, devices: Iterable[SnapshotDevice]) -> None:
+        self.devices = list(devices)
+        ordered = sorted(self.devices, key=lambda device: device.eventId)
+        # index of the device among the joysticks, the mouses and the mouses or touchpads, by event id
+        self.joystickIndex = { device.eventId: n for n, device in enumerate(d for d in ordered if d.isJoystick) }
+        self.mouseIndex = { device.eventId: n for n, device in enumerate(d for d in ordered if d.isMouse) }
+        self.pointerIndex = { device.eventId: n for n, device in enumerate(d for d in ordered if d.isMouse or d.isTouchpad) }
+        self.groups: dict[str, list[str]] = {}
+        for device in self.devices:
+            if device.group is not None and (device.isJoystick or device.isMouse or device.isTouchpad):
+                self.groups.setdefault(device.group, []).append(device.node)
+        self._capabilities: dict[str, tuple[str, dict[int, Any]]] = {}
+
+    @property
+    def mouses(self) -> list[SnapshotDevice]:
+        # by event id
+        return sorted((device for device in self.devices if device.isMouse), key=lambda device: device.eventId)
+
+    def capabilities(self, node: str) -> tuple[str, dict[int, Any]]:
+        # name and capabilities (with the axis ranges) of the device
+        if node not in self._capabilities:
+            device = evdev.InputDevice(node)
+            try:
+                self._capabilities[node] = (device.name, device.capabilities())
+            finally:
+                device.close()
+        return self._capabilities[node]
+
+    def absRange(self, node: str, axisCode: int) -> tuple[int, int]:
+        _, caps = self.capabilities(node)
+        for abs_code, val in caps.get(evdev.ecodes.EV_ABS, []):
+            if abs_code == axisCode:
+                return val.min, val.max
+        return 0,0 # not found
+
+def _snapshotDevices() -> Iterator[SnapshotDevice]:
+    context = pyudev.Context()
+    for ev in context.list_devices(subsystem='input'):
+        node = ev.device_node
+        eventId = dev2int(str(node)) if node is not None else None
+        if eventId is None:
+            continue
+        props = ev.properties
+        group = props.get("ID_PATH")
+        isWheel = props.get("ID_INPUT_WHEEL") == "1"
+        wheelRotation = None
+        if group is not None and isWheel and "WHEEL_ROTATION_ANGLE" in props:
+            wheelRotation = int(props["WHEEL_ROTATION_ANGLE"])
+        yield SnapshotDevice(node, eventId, group,
+                             isJoystick=props.get("ID_INPUT_JOYSTICK") == "1",
+                             isWheel=isWheel,
+                             isMouse=props.get("ID_INPUT_MOUSE") == "1",
+                             isTouchpad=props.get("ID_INPUT_TOUCHPAD") == "1",
+                             isGun=props.get("ID_INPUT_GUN") == "1",
+                             needCross=props.get("ID_INPUT_GUN_NEED_CROSS") == "1",
+                             needBorders=props.get("ID_INPUT_GUN_NEED_BORDERS") == "1",
+                             wheelRotation=wheelRotation)
+
+_deviceSnapshot: DeviceSnapshot | None = None
+
+def getDeviceSnapshot() -> DeviceSnapshot:
+    global _deviceSnapshot
+    if _deviceSnapshot is None:
+        _deviceSnapshot = DeviceSnapshot(_snapshotDevices())
+    return _deviceSnapshot
 
 def getDevicesInformation() -> DeviceInfoDict:
-    groups: dict[str | None, list[str]] = {}
-    devices: dict[int, _Device] = {}
-    context   = pyudev.Context()
-    events    = context.list_devices(subsystem='input')
-    mouses    = []
-    joysticks = []
-    for ev in events:
-        eventId = dev2int(str(ev.device_node))
-        if eventId is not None:
-            isJoystick = ("ID_INPUT_JOYSTICK" in ev.properties and ev.properties["ID_INPUT_JOYSTICK"] == "1")
-            isWheel    = ("ID_INPUT_WHEEL"    in ev.properties and ev.properties["ID_INPUT_WHEEL"] == "1")
-            isMouse    = ("ID_INPUT_MOUSE"    in ev.properties and ev.properties["ID_INPUT_MOUSE"] == "1") or ("ID_INPUT_TOUCHPAD" in ev.properties and ev.properties["ID_INPUT_TOUCHPAD"] == "1")
-            group = None
-            if "ID_PATH" in ev.properties:
-                group = ev.properties["ID_PATH"]
-            if isJoystick or isMouse:
-                if isJoystick:
-                    joysticks.append(eventId)
-                if isMouse:
-                    mouses.append(eventId)
-                devices[eventId] = { "node": ev.device_node, "group": group, "isJoystick": isJoystick, "isWheel": isWheel, "isMouse": isMouse }
-                if "ID_PATH" in ev.properties:
-                    if isWheel and "WHEEL_ROTATION_ANGLE" in ev.properties:
-                        devices[eventId]["wheel_rotation"] = int(ev.properties["WHEEL_ROTATION_ANGLE"])
-                    if group not in groups:
-                        groups[group] = []
-                    groups[group].append(ev.device_node)
-    mouses.sort()
-    joysticks.sort()
+    snapshot = getDeviceSnapshot()
     res: DeviceInfoDict = {}
-    for device in devices:
-        d = devices[device]
+    for d in snapshot.devices:
+        isMouse = d.isMouse or d.isTouchpad
+        if not d.isJoystick and not isMouse:
+            continue
         dgroup = None
-        if d["group"] is not None:
-            dgroup = groups[d["group"]].copy()
-            dgroup.remove(d["node"])
-        nmouse    = None
-        njoystick = None
-        if d["isJoystick"]:
-            njoystick = joysticks.index(device)
-        nmouse = None
-        if d["isMouse"]:
-            nmouse = mouses.index(device)
-        res[d["node"]] = { "eventId": device, "isJoystick": d["isJoystick"], "isWheel": d["isWheel"], "isMouse": d["isMouse"], "associatedDevices": dgroup, "joystick_index": njoystick, "mouse_index": nmouse }
-        if "wheel_rotation" in d:
-            res[d["node"]]["wheel_rotation"] = d["wheel_rotation"]
+        if d.group is not None:
+            dgroup = snapshot.groups[d.group].copy()
+            dgroup.remove(d.node)
+        njoystick = snapshot.joystickIndex.get(d.eventId)
+        nmouse = snapshot.pointerIndex.get(d.eventId)
+        res[d.node] = { "eventId": d.eventId, "isJoystick": d.isJoystick, "isWheel": d.isWheel, "isMouse": isMouse, "associatedDevices": dgroup, "joystick_index": njoystick, "mouse_index": nmouse }
+        if d.wheelRotation is not None:
+            res[d.node]["wheel_rotation"] = d.wheelRotation
     return res
 
 def getAssociatedMouse(devicesInformation: DeviceInfoMapping, dev: str | None) -> str | None:
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import logging
+import sys
+from pathlib import Path
+from typing import Any
+
+import cacheFiles
+
+eslog = logging.getLogger(__name__)
+
+# bump when the layout of the cached data changes
+CACHE_VERSION = 1
+
+# merged configuration of a system which is in none of the files
+_OTHER_SYSTEMS = None
+
+def _cachePath(defaultyml: Path, defaultarchyml: Path) -> str:
+    name = hashlib.sha1(f"{defaultyml}\n{defaultarchyml}".encode()).hexdigest()[:16]
+    return f"{cacheFiles.CACHE_DIR}/defaults-{name}.pickle"
+
+def _cacheKey(defaultyml: Path, defaultarchyml: Path) -> tuple[Any, ...]:
+    return (CACHE_VERSION, str(defaultyml), cacheFiles.fileStamp(defaultyml), str(defaultarchyml), cacheFiles.fileStamp(defaultarchyml))
+
+def _merge(dct: dict[Any, Any], merge_dct: dict[Any, Any]) -> None:
+    from Emulator import Emulator
+    Emulator.dict_merge(dct, merge_dct)
+
+def compileDefaults(defaultyml: Path, defaultarchyml: Path) -> dict[str | None, dict[str, Any]]:
+    # the merged configuration of each system of the files, as Emulator.get_generic_config computed it
+    import yaml
+
+    with defaultyml.open('r') as f:
+        systems_default = yaml.load(f, Loader=yaml.CLoader)
+
+    systems_default_arch = {}
+    if defaultarchyml.exists():
+        with defaultarchyml.open('r') as f:
+            systems_default_arch = yaml.load(f, Loader=yaml.CLoader)
+            if systems_default_arch is None:
+                systems_default_arch = {}
+
+    systems: list[str | None] = [_OTHER_SYSTEMS]
+    for name in list(systems_default) + list(systems_default_arch):
+        if name != "default" and name not in systems:
+            systems.append(name)
+
+    compiled: dict[str | None, dict[str, Any]] = {}
+    for system in systems:
+        dict_all = {}
+
+        if "default" in systems_default:
+            dict_all = copy.deepcopy(systems_default["default"])
+
+        if "default" in systems_default_arch:
+            _merge(dict_all, copy.deepcopy(systems_default_arch["default"]))
+
+        if system in systems_default:
+            _merge(dict_all, copy.deepcopy(systems_default[system]))
+
+        if system in systems_default_arch:
+            _merge(dict_all, copy.deepcopy(systems_default_arch[system]))
+
+        compiled[system] = dict_all
+    return compiled
+
+def build(defaultyml: Path, defaultarchyml: Path) -> dict[str | None, dict[str, Any]]:
+    compiled = compileDefaults(defaultyml, defaultarchyml)
+    cacheFiles.store(_cachePath(defaultyml, defaultarchyml), _cacheKey(defaultyml, defaultarchyml), compiled)
+    return compiled
+
+def get_generic_config(system: str, defaultyml: Path, defaultarchyml: Path) -> dict[str, Any]:
+    # yaml is only parsed (and imported) when one of the files changed since the cache was built
+    compiled = cacheFiles.load(_cachePath(defaultyml, defaultarchyml), _cacheKey(defaultyml, defaultarchyml))
+    if compiled is None:
+        eslog.debug(f"compiling the defaults of {defaultyml}")
+        compiled = build(defaultyml, defaultarchyml)
+    # a copy: the callers change the configuration, and the cold path has the dict which was just stored
+    if system in compiled:
+        return copy.deepcopy(compiled[system])
+    return copy.deepcopy(compiled[_OTHER_SYSTEMS])
+
+def defaultFiles() -> list[tuple[Path, Path]]:
+    # configgen defaults and the rendering defaults of each shader set
+    from configgen.batoceraPaths import BATOCERA_SHADERS, USER_SHADERS
+
+    files = [(Path("/userdata/system/switch/configgen/configgen-defaults.yml"), Path("/userdata/system/switch/configgen/configgen-defaults-arch.yml"))]
+    for shaders in [BATOCERA_SHADERS, USER_SHADERS]:
+        configs = shaders / "configs"
+        candidates = [configs / "rendering-defaults.yml"]
+        if configs.is_dir():
+            candidates += sorted(configs.glob("*/rendering-defaults.yml"))
+        for rendering_defaults in candidates:
+            if rendering_defaults.exists():
+                files.append((rendering_defaults, rendering_defaults.with_name("rendering-defaults-arch.yml")))
+    return files
+
+def prebuild() -> int:
+    # python defaultsCache.py : compile all the defaults at boot, so that the first launch doesn't parse yaml
+    status = 0
+    for defaultyml, defaultarchyml in defaultFiles():
+        try:
+            compiled = build(defaultyml, defaultarchyml)
+            print(f"{defaultyml}: {len(compiled) - 1} systems")
+        except Exception as e:
+            print(f"{defaultyml}: {e}", file=sys.stderr)
+            status = 1
+    return status
+
+if __name__ == '__main__':
+    sys.exit(prebuild())
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import stat
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import launchTrace
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+eslog = logging.getLogger(__name__)
+
+# housekeeping registered by the generators, run around the emulator spawn instead of before it:
+# - barrier tasks run just before the spawn, the emulator depends on them
+# - the other ones run on a background thread once the emulator is started
+
+@dataclass(slots=True)
+class Task:
+    name: str
+    function: Callable[..., Any]
+    args: tuple[Any, ...] = field(default_factory=tuple)
+    barrier: bool = False
+
+    def run(self) -> None:
+        start = time.perf_counter()
+        try:
+            self.function(*self.args)
+        finally:
+            launchTrace.record(f"deferred {self.name}", start, time.perf_counter() - start, barrier=self.barrier)
+
+_tasks: list[Task] = []
+_thread: threading.Thread | None = None
+
+def defer(name: str, function: Callable[..., Any], *args: Any, barrier: bool = False) -> None:
+    _tasks.append(Task(name, function, args, barrier))
+
+def runBarriers() -> None:
+    # errors are raised, as they were when the work was done inline
+    barriers = [task for task in _tasks if task.barrier]
+    _tasks[:] = [task for task in _tasks if not task.barrier]
+    for task in barriers:
+        task.run()
+
+def _runBackground(tasks: list[Task]) -> None:
+    for task in tasks:
+        try:
+            task.run()
+        except Exception as e:
+            eslog.warning(f"deferred task {task.name} failed: {e}")
+
+def start() -> None:
+    global _thread
+    runBarriers()
+    if not _tasks:
+        return
+    tasks = list(_tasks)
+    _tasks.clear()
+    _thread = threading.Thread(target=_runBackground, args=(tasks,), name="deferred work", daemon=True)
+    _thread.start()
+
+def join(timeout: float | None = None) -> None:
+    # the launcher must not exit with half done housekeeping
+    global _thread
+    if _thread is not None:
+        _thread.join(timeout)
+        if _thread.is_alive():
+            eslog.warning("deferred work still running")
+        _thread = None
+    # nothing was spawned (or start() was never reached): run what's left now
+    if _tasks:
+        tasks = list(_tasks)
+        _tasks.clear()
+        _runBackground(tasks)
+
+### common housekeeping ###
+
+def makeExecutable(path: str) -> None:
+    st = os.stat(path)
+    os.chmod(path, st.st_mode | stat.S_IEXEC)
+
+def removePath(path: str) -> None:
+    # a link is unlinked, a directory removed with its content
+    if os.path.islink(path):
+        os.unlink(path)
+    if os.path.exists(path):
+        shutil.rmtree(path)
+
+def installLibthai() -> None:
+    if not os.path.exists("/lib/libthai.so.0.3.1"):
+        shutil.copyfile("/userdata/system/switch/extra/libthai.so.0.3.1", "/lib/libthai.so.0.3.1")
+    if not os.path.exists("/lib/libthai.so.0"):
+        os.symlink("/lib/libthai.so.0.3.1","/lib/libthai.so.0")
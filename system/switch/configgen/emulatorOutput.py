@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import deque
+from typing import IO, TYPE_CHECKING
+
+import batoceraFiles
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+eslog = logging.getLogger(__name__)
+
+# size of each log file before it is rotated, and number of rotated files kept
+LOG_MAX_BYTES = 4 * 1024 * 1024
+LOG_BACKUPS = 2
+# lines kept in memory for the error report at exit
+TAIL_LINES = 200
+# a line longer than this is split, so that a runaway line can't grow the buffer
+LINE_MAX_BYTES = 64 * 1024
+
+class RotatingLog:
+    def __init__(self, path: str, maxBytes: int = LOG_MAX_BYTES, backups: int = LOG_BACKUPS):
+        self.path = path
+        self.maxBytes = maxBytes
+        self.backups = backups
+        self.file: IO[bytes] | None = None
+        self.size = 0
+
+    def open(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.rotate()
+            self.file = open(self.path, "wb")
+        except OSError as e:
+            eslog.warning(f"unable to open {self.path}: {e}")
+            self.file = None
+        self.size = 0
+
+    def rotate(self) -> None:
+        if self.backups <= 0:
+            return
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i+1}")
+        if os.path.exists(self.path):
+            os.replace(self.path, f"{self.path}.1")
+
+    def write(self, data: bytes) -> None:
+        if self.file is None:
+            return
+        try:
+            if self.size + len(data) > self.maxBytes:
+                self.file.close()
+                self.open()
+                if self.file is None:
+                    return
+            self.file.write(data)
+            self.file.flush()
+            self.size += len(data)
+        except OSError as e:
+            eslog.warning(f"unable to write {self.path}: {e}")
+            self.close()
+
+    def close(self) -> None:
+        if self.file is not None:
+            try:
+                self.file.close()
+            except OSError:
+                pass
+            self.file = None
+
+class OutputTail:
+    # copy a pipe line by line into a rotating log file, keeping only the last lines in memory
+    def __init__(self, pipe: IO[bytes], path: str, tailLines: int = TAIL_LINES):
+        self.pipe = pipe
+        self.log = RotatingLog(path)
+        self.lines: deque[bytes] = deque(maxlen=tailLines)
+        self.thread = threading.Thread(target=self.run, name=f"tail {os.path.basename(path)}", daemon=True)
+
+    def start(self) -> None:
+        self.log.open()
+        self.thread.start()
+
+    def run(self) -> None:
+        try:
+            for line in iter(lambda: self.pipe.readline(LINE_MAX_BYTES), b''):
+                self.log.write(line)
+                self.lines.append(line)
+        except (OSError, ValueError):
+            # pipe closed under our feet (process killed)
+            pass
+        finally:
+            self.log.close()
+
+    def join(self, timeout: float | None = None) -> None:
+        self.thread.join(timeout)
+
+    def tail(self) -> str:
+        return b''.join(self.lines).decode(errors="replace")
+
+def startTails(stdout: IO[bytes], stderr: IO[bytes], name: str = "emulator") -> tuple[OutputTail, OutputTail]:
+    out = OutputTail(stdout, os.path.join(batoceraFiles.logdir, f"{name}-stdout.log"))
+    err = OutputTail(stderr, os.path.join(batoceraFiles.logdir, f"{name}-stderr.log"))
+    out.start()
+    err.start()
+    return out, err
+
+def joinTails(tails: Iterable[OutputTail], timeout: float = 5) -> None:
+    for tail in tails:
+        tail.join(timeout)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import ctypes.util
+import logging
+import os
+import stat
+import sys
+import time
+from collections.abc import Callable, Iterable
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Final
+
+import cacheFiles
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+eslog = logging.getLogger(__name__)
+
+# facts about the installation the launches used to derive again and again (the version of ryujinx, the
+# system libraries): each one is kept with the stamps (mtime, size, inode) of the
+# files it comes from. while they are unchanged, a fact costs a stat per file, no read, no subprocess.
+# per boot: a fact depending on something else than its files (a system update) is derived again after a reboot
+CACHE_FILE: Final = cacheFiles.RUN_DIR + '/fingerprints.pickle'
+# bump when a fact is derived differently
+CACHE_VERSION: Final = 1
+
+# the cache of the dynamic linker, ldconfig -p (what ctypes.util.find_library runs) lists it
+LD_SO_CACHE: Final = "/etc/ld.so.cache"
+
+# the version of ryujinx without version.txt
+RYUJINX_DEFAULT_VERSION: Final = 382
+
+_facts: dict[str, tuple[Any, Any]] | None = None
+
+def _load() -> dict[str, tuple[Any, Any]]:
+    # memoized for the process, the stamps tell whether a fact is still right. a launch of the daemon runs in a
+    # forked worker which exits after it, so between launches the facts are the pickle
+    global _facts
+    if _facts is None:
+        _facts = cacheFiles.load(CACHE_FILE, CACHE_VERSION) or {}
+    return _facts
+
+def fact(name: str, files: Iterable[str], derive: Callable[[], Any]) -> Any:
+    # the value of derive() the last time the files were the same
+    stamp = tuple(cacheFiles.fileStamp(path) for path in files)
+    facts = _load()
+    entry = facts.get(name)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+    value = derive()
+    eslog.debug(f"fingerprint {name}: {value}")
+    facts[name] = (stamp, value)
+    cacheFiles.store(CACHE_FILE, CACHE_VERSION, facts)
+    return value
+
+def _readRyujinxVersion(versionFile: str) -> int:
+    try:
+        with open(versionFile, 'r') as file:
+            versiontxt = file.read()
+    except FileNotFoundError:
+        return RYUJINX_DEFAULT_VERSION
+    return int(versiontxt.replace('.', ''))
+
+def ryujinxVersion(versionFile: str) -> int:
+    # the version.txt of the ryujinx build, as a number (1.1.382 -> 11382)
+    return fact("ryujinx:" + versionFile, [versionFile], lambda: _readRyujinxVersion(versionFile))
+
+_findLibrary: Final = ctypes.util.find_library
+
+def findLibrary(name: str) -> str | None:
+    # ctypes.util.find_library, which spawns ldconfig (then gcc or ld) at each call
+    key = "library:" + name + ":" + os.environ.get("LD_LIBRARY_PATH", "")
+    return fact(key, [LD_SO_CACHE], lambda: _findLibrary(name))
+
+@contextmanager
+def systemLibraries() -> Iterator[None]:
+    # the system libraries a module looks up with find_library while it is imported come from the facts.
+    # the swap is process-wide, for the time of the import: pysdl2 looks up its libraries when sdl2.dll is
+    # imported, with the find_library it binds then (from ctypes.util import find_library), so only the first
+    # import of sdl2 in the process is helped, later ones find the module in sys.modules
+    ctypes.util.find_library = findLibrary
+    try:
+        yield
+    finally:
+        ctypes.util.find_library = _findLibrary
+
+def appImage(path: str) -> bool:
+    # True when the emulator is there, it is made executable if it isn't yet (a downloaded AppImage).
+    # nothing to keep: the stat giving the stamp gives the mode too
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if not st.st_mode & stat.S_IEXEC:
+        os.chmod(path, st.st_mode | stat.S_IEXEC)
+    return True
+
+if __name__ == '__main__':
+    # python envFingerprint.py [runs] : the facts, derived against kept
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    names = ["SDL2", "SDL2-2.0", "SDL2-2.0.0", "SDL2d", "SDL2-2.0d", "SDL2-2.0.0d"]
+    print(f"ryujinx: {ryujinxVersion('/userdata/system/switch/extra/ryujinx/version.txt')}")
+    for name in names:
+        print(f"{name}: {findLibrary(name)}")
+    for label, lookup in [("derived", _findLibrary), ("kept", findLibrary)]:
+        start = time.perf_counter()
+        for _ in range(runs):
+            for name in names:
+                lookup(name)
+        print(f"{label:8}: {(time.perf_counter() - start) * 1000 / runs:8.3f} ms for the lookups of pysdl2")
@@ -8,9 +8,7 @@ from contextlib import AbstractContextManager
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
-import evdev
-
-from controllersConfig import ControllerMapping, mouseButtonToCode
+from controllersConfig import ControllerMapping, getDeviceSnapshot, mouseButtonToCode
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
@@ -402,15 +400,8 @@ class evmapy(AbstractContextManager[None, None]):
             return trigger
 
     def __get_pad_min_max_axis(self, devicePath: str, axisCode: int) -> tuple[int, int]:
-        device = evdev.InputDevice(devicePath)
-        capabilities = device.capabilities(False)
-
-        for event_type in capabilities:
-            if event_type == 3: # "EV_ABS"
-                for abs_code, val in capabilities[event_type]:
-                    if abs_code == axisCode:
-                        return val.min, val.max
-        return 0,0 # not found
+        # the capabilities of each pad are read once for the launch
+        return getDeviceSnapshot().absRange(devicePath, axisCode)
 
     def __get_pad_min_max_axis_for_keys(self, min: float, max: float) -> tuple[float, float]:
         valrange = (max - min)/2 # for each side
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import stat
+from typing import TYPE_CHECKING
+
+import cacheFiles
+import deferredWork
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+eslog = logging.getLogger(__name__)
+
+# version of the layout engine, part of the stamp: bump it when the meaning of an operation changes
+LAYOUT_VERSION = 1
+
+# the directories and links an emulator expects, as a list of operations applied in order:
+#   ("mkdir", path)                   create the directory if missing
+#   ("mkdir_clean", path)             a real directory is removed first, a link is kept
+#   ("symlink", target, path)         create the link if path doesn't exist
+#   ("symlink_replace", target, path) a real file or directory at path is removed first
+#   ("remove", path)                  remove the link or the directory (after the emulator spawn)
+#   ("remove_unless_link", path)      remove the directory unless it is a link (after the emulator spawn)
+# once applied, a stamp keyed by the manifest hash and the configgen version is written with the identity
+# (inode, type) of the paths the layout created: next launches stat these paths, a path deleted or replaced
+# (configs/<emu> removed to reset it, the qt-config.ini link replaced by a file) applies the layout again.
+Operation = tuple[str, ...]
+
+# the installed configgen, an update of the files (the installer replaces them) gives new stamps
+CONFIGGEN_FILES = (__file__, os.path.join(os.path.dirname(os.path.abspath(__file__)), "switchlauncher.py"))
+
+# the operations whose path must stay as the layout left it
+_CHECKED = {"mkdir": 1, "mkdir_clean": 1, "symlink": 2, "symlink_replace": 2}
+
+def configgenVersion() -> tuple[tuple[int, int, int] | None, ...]:
+    return tuple(cacheFiles.fileStamp(path) for path in CONFIGGEN_FILES)
+
+def manifestHash(manifest: Sequence[Operation]) -> str:
+    return hashlib.sha1(repr((LAYOUT_VERSION, configgenVersion(), tuple(manifest))).encode()).hexdigest()
+
+def _identity(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return None
+    return (st.st_ino, stat.S_IFMT(st.st_mode))
+
+def treeIdentity(manifest: Sequence[Operation]) -> tuple[tuple[int, int] | None, ...]:
+    # one lstat per created path
+    return tuple(_identity(operation[_CHECKED[operation[0]]]) for operation in manifest if operation[0] in _CHECKED)
+
+def _removeReal(path: str) -> None:
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+def _symlink(target: str, path: str) -> None:
+    if os.path.islink(path):
+        os.unlink(path) # dangling link
+    os.symlink(target, path)
+
+def _removeUnlessLink(path: str) -> None:
+    if os.path.exists(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+
+def apply(manifest: Sequence[Operation]) -> None:
+    for operation in manifest:
+        kind = operation[0]
+        if kind == "mkdir":
+            if not os.path.exists(operation[1]):
+                os.mkdir(operation[1])
+        elif kind == "mkdir_clean":
+            if os.path.exists(operation[1]) and not os.path.islink(operation[1]):
+                shutil.rmtree(operation[1])
+            if not os.path.exists(operation[1]):
+                os.mkdir(operation[1])
+        elif kind == "symlink":
+            if not os.path.exists(operation[2]):
+                _symlink(operation[1], operation[2])
+        elif kind == "symlink_replace":
+            if os.path.exists(operation[2]) and not os.path.islink(operation[2]):
+                _removeReal(operation[2])
+            if not os.path.exists(operation[2]):
+                _symlink(operation[1], operation[2])
+        elif kind == "remove":
+            deferredWork.defer(f"remove {operation[1]}", deferredWork.removePath, operation[1])
+        elif kind == "remove_unless_link":
+            deferredWork.defer(f"remove {operation[1]}", _removeUnlessLink, operation[1])
+        else:
+            raise Exception(f"unknown layout operation {kind}")
+
+def ensure(name: str, manifest: Sequence[Operation]) -> bool:
+    # apply the layout unless it was already applied with this very manifest and the tree is still the one it
+    # left. returns True if it was applied
+    stampFile = f"{cacheFiles.CACHE_DIR}/layout-{name}.pickle"
+    stamp = manifestHash(manifest)
+    identity = cacheFiles.load(stampFile, stamp)
+    if identity is not None and identity == treeIdentity(manifest):
+        return False
+
+    eslog.debug(f"applying the {name} filesystem layout")
+    apply(manifest)
+    cacheFiles.store(stampFile, stamp, treeIdentity(manifest))
+    return True
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sys
+from typing import Final
+
+import batoceraFiles
+import cacheFiles
+import romIndex
+
+eslog = logging.getLogger(__name__)
+
+# the yuzu-family emulators cache the game list (add-ons, icons and names per title id) in <cache>/game_list.
+# it used to be removed at each launch, forcing a full rescan of the library. it is now kept, the state of
+# the roms it was built from (see romIndex) is recorded next to it: the entries of the titles whose roms were
+# added, modified or removed are removed, the emulator rebuilds them on its next scan.
+# updates and dlcs installed in the nand change the add-ons of a title too, a change there removes all the entries
+WATCHED_DIRS: Final = (
+    batoceraFiles.CONF + '/yuzu/nand/user/Contents/registered',
+    batoceraFiles.CONF + '/yuzu/nand/system/Contents/registered',
+)
+# files written by the emulators in game_list: <title id>.pv.txt, .jpeg and .appname.txt
+CACHED_SUFFIXES: Final = (".pv.txt", ".jpeg", ".appname.txt")
+# only the names of these files: for yuzu and sudachi, game_list is the saves directory of the user
+_CACHED_NAME: Final = re.compile(r'^[0-9A-Fa-f]{16}\.')
+
+# game_list of each emulator. citron and eden run with XDG_CACHE_HOME=configs, yuzu and sudachi link it to saves/yuzu
+GAME_LISTS: Final = {
+    "citron": batoceraFiles.CONF + '/citron/game_list',
+    "eden": batoceraFiles.CONF + '/eden/game_list',
+    "sudachi": batoceraFiles.SAVES + '/yuzu',
+    "yuzu": batoceraFiles.SAVES + '/yuzu',
+}
+
+def watchedStamps() -> dict[str, tuple[int, int]]:
+    stamps: dict[str, tuple[int, int]] = {}
+    for path in WATCHED_DIRS:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamps[path] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+def changedTitles(old: dict[str, romIndex.RomInfo], new: dict[str, romIndex.RomInfo]) -> set[str] | None:
+    # base title ids of the roms added, removed or modified, None if one of them has no known title id
+    titles: set[str] = set()
+    changed = [(old.get(path), info) for path, info in new.items() if old.get(path) != info]
+    changed.extend((info, None) for path, info in old.items() if path not in new)
+    for before, after in changed:
+        for info in (before, after):
+            if info is None:
+                continue
+            if not info.titleIds:
+                return None
+            titles.update(info.baseTitleIds)
+    return titles
+
+def manifestFile(name: str) -> str:
+    return f"{cacheFiles.CACHE_DIR}/gamelist-{name}.manifest"
+
+def invalidate(gameListDir: str, titles: set[str] | None = None) -> int:
+    # remove the cached entries of the titles (all of them if None) only, for yuzu and sudachi game_list is the saves directory
+    removed = 0
+    try:
+        entries = list(os.scandir(gameListDir))
+    except OSError:
+        return 0
+    for entry in entries:
+        if not entry.name.endswith(CACHED_SUFFIXES) or not _CACHED_NAME.match(entry.name) or not entry.is_file(follow_symlinks=False):
+            continue
+        if titles is not None and entry.name.split(".", 1)[0].upper() not in titles:
+            continue
+        try:
+            os.remove(entry.path)
+            removed += 1
+        except OSError as e:
+            eslog.debug(f"game_list: unable to remove {entry.path}: {e}")
+    return removed
+
+def ensure(name: str, gameListDir: str | None = None, romsDir: str = romIndex.ROMS_DIR, force: bool = False) -> bool:
+    # keep the game_list of the emulator, less the entries of the roms changed since. returns True if nothing was removed.
+    # an unchanged library costs a stat per directory (see romIndex.refresh)
+    if gameListDir is None:
+        gameListDir = GAME_LISTS[name]
+    roms = romIndex.refresh(romsDir, force=force)
+    watched = watchedStamps()
+    previous = cacheFiles.load(manifestFile(name), (romIndex.INDEX_VERSION, romsDir, gameListDir))
+
+    titles: set[str] | None
+    if previous is None or previous[1] != watched:
+        # the existing entries were built from an unknown state of the library or of the nand
+        titles = None
+    else:
+        titles = changedTitles(previous[0], roms)
+
+    kept = titles is not None and not titles
+    if not kept:
+        removed = invalidate(gameListDir, titles)
+        eslog.debug(f"game_list: {name}: {'all titles' if titles is None else ', '.join(sorted(titles))} changed, {removed} cached entries removed")
+    else:
+        eslog.debug(f"game_list: {name}: kept ({len(roms)} roms unchanged)")
+    if previous != (roms, watched):
+        cacheFiles.store(manifestFile(name), (romIndex.INDEX_VERSION, romsDir, gameListDir), (roms, watched))
+    return kept
+
+def prebuild(names: list[str] | None = None, romsDir: str = romIndex.ROMS_DIR) -> None:
+    # index the library and record it for the emulators (after a copy of roms for example), so that the
+    # next launch doesn't have to. building the entries themselves requires the emulator (and the keys)
+    for name in names or list(GAME_LISTS):
+        kept = ensure(name, romsDir=romsDir, force=True)
+        print(f"{name}: {'kept' if kept else 'invalidated'} ({GAME_LISTS[name]})")
+
+if __name__ == '__main__':
+    prebuild(sys.argv[1:] or None)
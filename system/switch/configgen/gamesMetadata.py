@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Final
+
+import cacheFiles
+
+eslog = logging.getLogger(__name__)
+
+# gamesdb.xml, compiled: the metadata of a launch is read with a few lookups instead of a parse of the whole file.
+# one file: the key, the table of the systems (offset and size of their block), then the blocks. only the block
+# of the launched system is read. rebuilt when the stamp of gamesdb.xml changes.
+INDEX_FILE: Final = cacheFiles.CACHE_DIR + '/gamesdb.index'
+# bump when the layout of the index changes
+INDEX_VERSION: Final = 1
+
+# a system node of gamesdb.xml: the attributes of its default game, and its games by name
+# name -> (position in the node, attributes), with the length of the longest name
+Attributes = list[tuple[str, str]]
+SystemEntry = tuple[Attributes | None, dict[str, tuple[int, Attributes]], int]
+
+def _attributes(nodegame: ET.Element) -> Attributes:
+    attributes: Attributes = []
+    for child in nodegame:
+        for attribute in child.attrib:
+            attributes.append(("{}_{}".format(child.tag, attribute), child.get(attribute)))
+    return attributes
+
+def compileIndex(xmlPath: str | Path) -> dict[str, list[SystemEntry]]:
+    # system name -> its system nodes, in the order of the file
+    root = ET.parse(xmlPath).getroot()
+    systems: dict[str, list[SystemEntry]] = {}
+    for nodesystem in root.findall(".//system"):
+        defaults: Attributes | None = None
+        games: dict[str, tuple[int, Attributes]] = {}
+        maxLength = 0
+        for position, nodegame in enumerate(nodesystem.findall(".//game")):
+            name = nodegame.get("name")
+            if name == "default":
+                if defaults is None:
+                    defaults = _attributes(nodegame)
+            elif name is not None and name not in games:
+                # the first game of a name is the one a scan finds
+                games[name] = (position, _attributes(nodegame))
+                maxLength = max(maxLength, len(name))
+        entry = (defaults, games, maxLength)
+        for sysname in nodesystem.get("name").split(','):
+            systems.setdefault(sysname, []).append(entry)
+    return systems
+
+def build(xmlPath: str | Path, indexPath: str | Path = INDEX_FILE) -> dict[str, list[SystemEntry]]:
+    stamp = cacheFiles.fileStamp(xmlPath)
+    systems = compileIndex(xmlPath)
+    blocks = { system: pickle.dumps(entries, protocol=pickle.HIGHEST_PROTOCOL) for system, entries in systems.items() }
+    table: dict[str, tuple[int, int]] = {}
+    offset = 0
+    for system, block in blocks.items():
+        table[system] = (offset, len(block))
+        offset += len(block)
+
+    tmp = f"{indexPath}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(indexPath), exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump((INDEX_VERSION, stamp), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(table, f, protocol=pickle.HIGHEST_PROTOCOL)
+            for block in blocks.values():
+                f.write(block)
+        os.replace(tmp, indexPath)
+    except Exception as e:
+        eslog.debug(f"unable to write the index {indexPath}: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+    return systems
+
+def _readSystem(xmlPath: str | Path, indexPath: str | Path, system: str) -> list[SystemEntry] | None:
+    # None when the index is missing or stale
+    try:
+        with open(indexPath, "rb") as f:
+            if pickle.load(f) != (INDEX_VERSION, cacheFiles.fileStamp(xmlPath)):
+                return None
+            table = pickle.load(f)
+            if system not in table:
+                return []
+            offset, size = table[system]
+            f.seek(offset, os.SEEK_CUR)
+            return pickle.loads(f.read(size))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        eslog.debug(f"ignoring the index {indexPath}: {e}")
+        return None
+
+def _findGame(games: dict[str, tuple[int, Attributes]], maxLength: int, game: str) -> Attributes | None:
+    # the first game of the node whose name is in the short name of the rom: the names which are
+    # substrings of the short name are looked up, the one with the lowest position wins
+    best: tuple[int, Attributes] | None = games.get("")
+    for start in range(len(game)):
+        for end in range(start + 1, min(len(game), start + maxLength) + 1):
+            found = games.get(game[start:end])
+            if found is not None and (best is None or found[0] < best[0]):
+                best = found
+    return best[1] if best is not None else None
+
+def lookup(system: str, game: str, xmlPath: str | Path, indexPath: str | Path = INDEX_FILE) -> dict[str, str]:
+    # the result of the scan of gamesdb.xml (see scan) for a system and the short name of a rom
+    entries = _readSystem(xmlPath, indexPath, system)
+    if entries is None:
+        eslog.debug(f"compiling the games metadata of {xmlPath}")
+        entries = build(xmlPath, indexPath).get(system, [])
+
+    res: dict[str, str] = {}
+    for defaults, games, maxLength in entries:
+        if defaults is not None:
+            for key, value in defaults:
+                res[key] = value
+                eslog.info("found game metadata {}={} (system level)".format(key, value))
+        attributes = _findGame(games, maxLength, game)
+        if attributes is not None:
+            for key, value in attributes:
+                res[key] = value
+                eslog.info("found game metadata {}={}".format(key, value))
+            return res
+    return res
+
+def scan(system: str, game: str, xmlPath: str | Path) -> dict[str, str]:
+    # the reference: a parse and scan of the whole file, as getGamesMetaData did it
+    root = ET.parse(xmlPath).getroot()
+    res: dict[str, str] = {}
+    for nodesystem in root.findall(".//system"):
+        for sysname in nodesystem.get("name").split(','):
+            if sysname == system:
+                for nodegame in nodesystem.findall(".//game"):
+                    if nodegame.get("name") == "default":
+                        res.update(_attributes(nodegame))
+                        break
+                for nodegame in nodesystem.findall(".//game"):
+                    if nodegame.get("name") is not None and nodegame.get("name") != "default" and nodegame.get("name") in game:
+                        res.update(_attributes(nodegame))
+                        return res
+    return res
+
+if __name__ == '__main__':
+    # python gamesMetadata.py gamesdb.xml system shortname [runs] : compare the index with a scan of the file
+    xmlPath, system, game = sys.argv[1], sys.argv[2], sys.argv[3]
+    runs = int(sys.argv[4]) if len(sys.argv) > 4 else 20
+    logging.disable(logging.INFO)
+    indexPath = f"{cacheFiles.RUN_DIR}/gamesdb-bench.index"
+
+    start = time.perf_counter()
+    build(xmlPath, indexPath)
+    print(f"build:  {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+    for name, fn in [("scan", lambda: scan(system, game, xmlPath)), ("lookup", lambda: lookup(system, game, xmlPath, indexPath))]:
+        start = time.perf_counter()
+        for _ in range(runs):
+            result = fn()
+        print(f"{name}: {(time.perf_counter() - start) * 1000 / runs:8.2f} ms per launch")
+    assert lookup(system, game, xmlPath, indexPath) == scan(system, game, xmlPath), "the index differs from the scan"
+    print(result)
+    os.remove(indexPath)
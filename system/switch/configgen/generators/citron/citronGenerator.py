@@ -6,11 +6,21 @@ import os
 import shutil
 import stat
 import batoceraFiles
+import bindingCache
+import configCache
+import deferredWork
+import fsLayout
+import gameListCache
+import hardwareProbe
+import iniConfig
+import sdlProbe
+import sysfsPaths
 import controllersConfig as controllersConfig
-import configparser
+import yuzuControls
+import yuzuOptions
+import io
 import logging
 from shutil import copyfile
-import subprocess
 from typing import TYPE_CHECKING, Final
 
 if TYPE_CHECKING:
@@ -22,6 +32,34 @@ if TYPE_CHECKING:
 
 eslog = logging.getLogger(__name__)
 
+_YUZU_DIRS: Final = ("keys", "amiibo", "crash_dumps", "custom", "dump", "game_list", "icons", "load", "log", "nand", "play_time", "screenshots", "sdmc", "shader", "tas")
+_LINKED_DIRS: Final = ("amiibo", "custom", "screenshots", "sdmc", "nand", "keys", "load", "shader")
+
+CITRON_LAYOUT: Final = (
+    #Create Keys Folder
+    ("mkdir", batoceraFiles.CONF + "/yuzu"),
+    *(("mkdir", batoceraFiles.CONF + "/yuzu/" + name) for name in _YUZU_DIRS),
+    #Create OS Saves folder
+    ("mkdir", batoceraFiles.SAVES + "/yuzu"),
+    #Create OS citron folder, removing it if it exists and isn't a link
+    ("mkdir_clean", "/userdata/system/configs/citron"),
+    #Link yuzu/citron nand/key/config.ini
+    *(("symlink", "/userdata/system/configs/yuzu/" + name, "/userdata/system/configs/citron/" + name) for name in _LINKED_DIRS),
+    ("symlink_replace", "/userdata/system/configs/yuzu/qt-config.ini", "/userdata/system/configs/citron/qt-config.ini"),
+    #Remove Old SUYU link (after the spawn, nothing uses them)
+    ("remove", "/userdata/system/.local/share/suyu"),
+    ("remove", "/userdata/system/.config/suyu"),
+    ("remove", "/userdata/system/configs/suyu"),
+    ("remove", "/userdata/system/.cache/suyu"),
+    ("mkdir", "/userdata/system/.cache"),
+    ("mkdir", "/userdata/system/.cache/citron"),
+    #old game_list location, citron uses XDG_CACHE_HOME=/userdata/system/configs
+    ("remove", "/userdata/system/.cache/citron/game_list"),
+)
+
+# what the generated qt-config.ini depends on, besides the settings and the controllers
+CITRON_CONFIG_INPUTS: Final = ("/userdata/system/switch/citron.AppImage", __file__, "/userdata/system/switch/configgen/debugcontrollers.txt")
+
 class CitronGenerator(Generator):
 
     def getHotkeysContext(self) -> HotkeysContext:
@@ -33,134 +71,18 @@ class CitronGenerator(Generator):
     def generate(self, system, rom, playersControllers, metadata, guns, wheels, gameResolution):
         #handles chmod so you just need to download citron.AppImage
         if os.path.exists("/userdata/system/switch/citron.AppImage"):
-            st = os.stat("/userdata/system/switch/citron.AppImage")
-            os.chmod("/userdata/system/switch/citron.AppImage", st.st_mode | stat.S_IEXEC)
+            deferredWork.defer("chmod citron.AppImage", deferredWork.makeExecutable, "/userdata/system/switch/citron.AppImage", barrier=True)
 
             #chmod citron app
-            st = os.stat("/userdata/system/switch/extra/batocera-config-citron")
-            os.chmod("/userdata/system/switch/extra/batocera-config-citron", st.st_mode | stat.S_IEXEC)
-
-        if not os.path.exists("/lib/libthai.so.0.3.1"):
-            copyfile("/userdata/system/switch/extra/libthai.so.0.3.1", "/lib/libthai.so.0.3.1")
-        if not os.path.exists("/lib/libthai.so.0"):
-            st = os.symlink("/lib/libthai.so.0.3.1","/lib/libthai.so.0")
-
-        #Create Keys Folder
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu")
-
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/keys"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/keys")
-
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/amiibo"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/amiibo")
-
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/crash_dumps"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/crash_dumps")
-
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/custom"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/custom")
-
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/dump"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/dump")
-
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/game_list"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/game_list")
-
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/icons"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/icons")
-
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/load"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/load")
+            deferredWork.defer("chmod batocera-config-citron", deferredWork.makeExecutable, "/userdata/system/switch/extra/batocera-config-citron")
 
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/log"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/log")
+        deferredWork.defer("libthai", deferredWork.installLibthai, barrier=True)
 
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/nand"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/nand")
+        #Create the yuzu/citron folders and links (once, see CITRON_LAYOUT)
+        fsLayout.ensure("citron", CITRON_LAYOUT)
 
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/play_time"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/play_time")
-
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/screenshots"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/screenshots")
-
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/sdmc"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/sdmc")
-
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/shader"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/shader")
-
-        if not os.path.exists(batoceraFiles.CONF + "/yuzu/tas"):
-            os.mkdir(batoceraFiles.CONF + "/yuzu/tas")
-        #Create OS Saves folder
-        if not os.path.exists(batoceraFiles.SAVES + "/yuzu"):
-            os.mkdir(batoceraFiles.SAVES + "/yuzu")        
-
-        #Remove citron if it exists and isnt' a link
-        if os.path.exists("/userdata/system/configs/citron"):
-            if not os.path.islink("/userdata/system/configs/citron"):
-                shutil.rmtree("/userdata/system/configs/citron")
-
-        #Create OS citron folder
-        if not os.path.exists("/userdata/system/configs/citron"):
-            os.mkdir("/userdata/system/configs/citron")
-            
-        #Link yuzu/citron nand/key/config.ini
-        if not os.path.exists("/userdata/system/configs/citron/amiibo"):
-            st = os.symlink("/userdata/system/configs/yuzu/amiibo","/userdata/system/configs/citron/amiibo")
-        if not os.path.exists("/userdata/system/configs/citron/custom"):
-            st = os.symlink("/userdata/system/configs/yuzu/custom","/userdata/system/configs/citron/custom")
-        if not os.path.exists("/userdata/system/configs/citron/screenshots"):
-            st = os.symlink("/userdata/system/configs/yuzu/screenshots","/userdata/system/configs/citron/screenshots")
-        if not os.path.exists("/userdata/system/configs/citron/sdmc"):
-            st = os.symlink("/userdata/system/configs/yuzu/sdmc","/userdata/system/configs/citron/sdmc")
-        if not os.path.exists("/userdata/system/configs/citron/nand"):
-            st = os.symlink("/userdata/system/configs/yuzu/nand","/userdata/system/configs/citron/nand")
-        if not os.path.exists("/userdata/system/configs/citron/keys"):
-            st = os.symlink("/userdata/system/configs/yuzu/keys","/userdata/system/configs/citron/keys")
-        if not os.path.exists("/userdata/system/configs/citron/load"):
-            st = os.symlink("/userdata/system/configs/yuzu/load","/userdata/system/configs/citron/load")
-        if not os.path.exists("/userdata/system/configs/citron/shader"):
-            st = os.symlink("/userdata/system/configs/yuzu/shader","/userdata/system/configs/citron/shader")
-
-        if os.path.exists("/userdata/system/configs/citron/qt-config.ini"):
-            if not os.path.islink("/userdata/system/configs/citron/qt-config.ini"):
-                os.remove("/userdata/system/configs/citron/qt-config.ini")
-        if not os.path.exists("/userdata/system/configs/citron/qt-config.ini"):
-            st = os.symlink("/userdata/system/configs/yuzu/qt-config.ini","/userdata/system/configs/citron/qt-config.ini")
-
-        #Remove Old SUYU link
-        if os.path.islink("/userdata/system/.local/share/suyu"):
-            os.unlink("/userdata/system/.local/share/suyu")
-        if os.path.exists("/userdata/system/.local/share/suyu"):
-            shutil.rmtree("/userdata/system/.local/share/suyu")
-
-        if os.path.islink("/userdata/system/.config/suyu"):
-            os.unlink("/userdata/system/.config/suyu")
-        if os.path.exists("/userdata/system/.config/suyu"):
-            shutil.rmtree("/userdata/system/.config/suyu")
-
-        if os.path.islink("/userdata/system/configs/suyu"):
-            os.unlink("/userdata/system/configs/suyu")
-        if os.path.exists("/userdata/system/configs/suyu"):
-            shutil.rmtree("/userdata/system/configs/suyu")
-
-        if os.path.islink("/userdata/system/.cache/suyu"):
-            os.unlink("/userdata/system/.cache/suyu")
-        if os.path.exists("/userdata/system/.cache/suyu"): 
-            shutil.rmtree("/userdata/system/.cache/suyu")
-
-        #Link Yuzu Saves Directory to /userdata/saves/yuzu
-        if not os.path.exists("/userdata/system/.cache"):
-            os.mkdir("/userdata/system/.cache")
-
-        if not os.path.exists("/userdata/system/.cache/citron"):
-            os.mkdir("/userdata/system/.cache/citron")
-
-        #remove game_list if it exists and isn't a link
-        if os.path.exists("/userdata/system/.cache/citron/game_list"):
-            shutil.rmtree("/userdata/system/.cache/citron/game_list")
+        #keep the game_list unless the roms changed
+        gameListCache.ensure("citron")
 
         yuzuConfig = batoceraFiles.CONF + '/yuzu/qt-config.ini'
         beforeyuzuConfig = batoceraFiles.CONF + '/yuzu/before-qt-config.ini'
@@ -177,8 +99,7 @@ class CitronGenerator(Generator):
                  "QT_QPA_PLATFORM_PLUGIN_PATH":"${QT_PLUGIN_PATH}",
                  "QT_PLUGIN_PATH":"/userdata/system/switch/citron.AppImage",
                  "QT_QPA_PLATFORM": "xcb",
-                 "DRI_PRIME":"1", 
-                 "AMD_VULKAN_ICD":"RADV",
+                 **hardwareProbe.gpuEnvironment(),
                  "DISABLE_LAYER_AMD_SWITCHABLE_GRAPHICS_1":"1",
                  "QT_XKB_CONFIG_ROOT":"/usr/share/X11/xkb",
                  "NO_AT_BRIDGE":"1",
@@ -198,6 +119,12 @@ class CitronGenerator(Generator):
         
         os.environ["PYSDL2_DLL_PATH"] = "/userdata/system/switch/extra/sdl/"
         
+        # nothing to write when the inputs and the file are the ones of the last generation
+        configKey = configCache.inputsKey(system.config, playersControllers, CITRON_CONFIG_INPUTS)
+        if configCache.unchanged(yuzuConfigFile, beforeyuzuConfigFile, configKey):
+            eslog.debug(f"{yuzuConfigFile} is up to date")
+            return
+
         yuzuButtons = {
             "button_a":      "a",
             "button_b":      "b",
@@ -226,330 +153,17 @@ class CitronGenerator(Generator):
         }
 
         # ini file
-        yuzuConfig = configparser.RawConfigParser()
-        yuzuConfig.optionxform=str
+        yuzuConfig = iniConfig.IniConfig()
         if os.path.exists(yuzuConfigFile):
             yuzuConfig.read(yuzuConfigFile)
 
-        
-    # UI section
-        if not yuzuConfig.has_section("UI"):
-            yuzuConfig.add_section("UI")
-        
-        yuzuConfig.set("UI", "fullscreen", "true")
-        yuzuConfig.set("UI", "fullscreen\\default", "false")
-        yuzuConfig.set("UI", "confirmClose", "false")
-        yuzuConfig.set("UI", "confirmClose\\default", "false")
-        yuzuConfig.set("UI", "confirmStop", "2")
-        yuzuConfig.set("UI", "confirmStop\\default", "false")
-        yuzuConfig.set("UI", "firstStart", "false")
-        yuzuConfig.set("UI", "firstStart\\default", "false")
-        yuzuConfig.set("UI", "displayTitleBars", "false")
-        yuzuConfig.set("UI", "displayTitleBars\\default", "false")
-
-        if system.isOptSet('yuzu_enable_discord_presence'):
-            yuzuConfig.set("UI", "enable_discord_presence", system.config["yuzu_enable_discord_presence"])
-        else:
-            yuzuConfig.set("UI", "enable_discord_presence", "false")
-
-        yuzuConfig.set("UI", "enable_discord_presence\\default", "false")
-
-
-
-        yuzuConfig.set("UI", "calloutFlags", "1")
-        yuzuConfig.set("UI", "calloutFlags\\default", "false")
-
-        # Single Window Mode
-        if system.isOptSet('single_window'):
-            yuzuConfig.set("UI", "singleWindowMode", system.config["single_window"])
-            yuzuConfig.set("UI", "singleWindowMode\\default", "false")
-        else:
-            yuzuConfig.set("UI", "singleWindowMode", "true")
-            yuzuConfig.set("UI", "singleWindowMode\\default", "true")
-
-        # User Profile select on boot
-        if system.isOptSet('user_profile'):
-            yuzuConfig.set("UI", "select_user_on_boot", system.config["user_profile"])
-            yuzuConfig.set("UI", "select_user_on_boot\\default", "false")
-        else:
-            yuzuConfig.set("UI", "select_user_on_boot", "true")
-            yuzuConfig.set("UI", "select_user_on_boot\\default", "true")
-
-        yuzuConfig.set("UI", "hideInactiveMouse", "true")
-        yuzuConfig.set("UI", "hideInactiveMouse\\default", "true")
-
-        # Roms path (need for load update/dlc)
-        yuzuConfig.set("UI", "Paths\\gamedirs\\1\\deep_scan", "true")
-        yuzuConfig.set("UI", "Paths\\gamedirs\\1\\deep_scan\\default", "false")
-        yuzuConfig.set("UI", "Paths\\gamedirs\\1\\expanded", "true")
-        yuzuConfig.set("UI", "Paths\\gamedirs\\1\\expanded\\default", "true")
-        yuzuConfig.set("UI", "Paths\\gamedirs\\1\\path", "/userdata/roms/switch")
-        yuzuConfig.set("UI", "Paths\\gamedirs\\size", "1")
-
-        yuzuConfig.set("UI", "Screenshots\\enable_screenshot_save_as", "true")
-        yuzuConfig.set("UI", "Screenshots\\enable_screenshot_save_as\\default", "true")
-        yuzuConfig.set("UI", "Screenshots\\screenshot_path", "/userdata/screenshots")
-        yuzuConfig.set("UI", "Screenshots\\screenshot_path\\default", "false")
-
-        #citron shortcuts
-        yuzuConfig.set("UI", "Shortcuts\\shortcuts\\size", "2")#adjust to number of shortcut sets
-        #exit citron
-        yuzuConfig.set("UI", "Shortcuts\\shortcuts\\1\\name", "Exit citron")
-        yuzuConfig.set("UI", "Shortcuts\\shortcuts\\1\\group", "Main Window")
-        yuzuConfig.set("UI", "Shortcuts\\shortcuts\\1\\keyseq", "Ctrl+Q")
-        yuzuConfig.set("UI", "Shortcuts\\shortcuts\\1\\controller_keyseq", "Plus+Minus")
-        yuzuConfig.set("UI", "Shortcuts\\shortcuts\\1\\context", "1")
-        yuzuConfig.set("UI", "Shortcuts\\shortcuts\\1\\repeat", "false")
-        #exit citron fullscreen
-        yuzuConfig.set("UI", "Shortcuts\\shortcuts\\2\\name", "Fullscreen")
-        yuzuConfig.set("UI", "Shortcuts\\shortcuts\\2\\group", "Main Window")
-        yuzuConfig.set("UI", "Shortcuts\\shortcuts\\2\\keyseq", "F11")
-        yuzuConfig.set("UI", "Shortcuts\\shortcuts\\2\\controller_keyseq", "B+Minus")
-        yuzuConfig.set("UI", "Shortcuts\\shortcuts\\2\\context", "1")
-        yuzuConfig.set("UI", "Shortcuts\\shortcuts\\2\\repeat", "false")
-
-        yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\KeySeq", "F4")
-        yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\KeySeq\\default", "false")
-        yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\Controller_KeySeq", "Minus+B")
-        yuzuConfig.set("UI", "Shortcuts\Main%20Window\Fullscreen\Controller_KeySeq\default", "false")
-        yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\Controller_KeySeq", "Home+ZL")
-        yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\Controller_KeySeq\\default", "false")
-        yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\KeySeq", "Esc")
-        yuzuConfig.set("UI", "Shortcuts\Main%20Window\Exit%20Fullscreen\KeySeq\\default", "false")
-        yuzuConfig.set("UI", "Shortcuts\Main%20Window\Continue\Pause%20Emulation\KeySeq", "P")
-        yuzuConfig.set("UI", "Shortcuts\Main%20Window\Continue\Pause%20Emulation\KeySeq\default", "false")
-
-    # Data Storage section
-        if not yuzuConfig.has_section("Data%20Storage"):
-            yuzuConfig.add_section("Data%20Storage")
-        yuzuConfig.set("Data%20Storage", "dump_directory", "/userdata/system/configs/yuzu/dump")
-        yuzuConfig.set("Data%20Storage", "dump_directory\\default", "true")
-
-        yuzuConfig.set("Data%20Storage", "load_directory", "/userdata/system/configs/yuzu/load")
-        yuzuConfig.set("Data%20Storage", "load_directory\\default", "true")
-
-        yuzuConfig.set("Data%20Storage", "nand_directory", "/userdata/system/configs/yuzu/nand")
-        yuzuConfig.set("Data%20Storage", "nand_directory\\default", "true")
-
-        yuzuConfig.set("Data%20Storage", "sdmc_directory", "/userdata/system/configs/yuzu/sdmc")
-        yuzuConfig.set("Data%20Storage", "sdmc_directory\\default", "true")
-
-        yuzuConfig.set("Data%20Storage", "tas_directory", "/userdata/system/configs/yuzu/tas")
-        yuzuConfig.set("Data%20Storage", "tas_directory\\default", "true")
-
-        yuzuConfig.set("Data%20Storage", "use_virtual_sd", "true")
-        yuzuConfig.set("Data%20Storage", "use_virtual_sd\\default", "true")
-
-    # Core section
-        if not yuzuConfig.has_section("Core"):
-            yuzuConfig.add_section("Core")
-
-        # Multicore
-        if system.isOptSet('multicore'):
-            yuzuConfig.set("Core", "use_multi_core", system.config["multicore"])
-            yuzuConfig.set("Core", "use_multi_core\\default", "false")
-        else:
-            yuzuConfig.set("Core", "use_multi_core", "true")
-            yuzuConfig.set("Core", "use_multi_core\\default", "true")
-
-    # Renderer section
-        if not yuzuConfig.has_section("Renderer"):
-            yuzuConfig.add_section("Renderer")
-
-        # Aspect ratio
-        if system.isOptSet('suyu_ratio'):
-            yuzuConfig.set("Renderer", "aspect_ratio", system.config["suyu_ratio"])
-            yuzuConfig.set("Renderer", "aspect_ratio\\default", "false")
-        else:
-            yuzuConfig.set("Renderer", "aspect_ratio", "5")
-            yuzuConfig.set("Renderer", "aspect_ratio\\default", "false")
-
-        # Graphical backend
-        if system.isOptSet('yuzu_backend'):
-            yuzuConfig.set("Renderer", "backend", system.config["yuzu_backend"])
-        else:
-            yuzuConfig.set("Renderer", "backend", "0")
-        yuzuConfig.set("Renderer", "backend\\default", "false")
-
-        # Async Shader compilation
-        if system.isOptSet('async_shaders'):
-            yuzuConfig.set("Renderer", "use_asynchronous_shaders", system.config["async_shaders"])
-        else:
-            yuzuConfig.set("Renderer", "use_asynchronous_shaders", "true")
-        yuzuConfig.set("Renderer", "use_asynchronous_shaders\\default", "false")
-
-        # Assembly shaders
-        if system.isOptSet('shaderbackend'):
-            yuzuConfig.set("Renderer", "shader_backend", system.config["shaderbackend"])
-            yuzuConfig.set("Renderer", "shader_backend\\default", "false")
-        else:
-            yuzuConfig.set("Renderer", "shader_backend", "0")
-            yuzuConfig.set("Renderer", "shader_backend\\default", "true")
-
-        # Async Gpu Emulation
-        if system.isOptSet('async_gpu'):
-            yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation", system.config["async_gpu"])
-            yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation\\default", "false")
-        else:
-            yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation", "true")
-            yuzuConfig.set("Renderer", "use_asynchronous_gpu_emulation\\default", "true")
-
-        # NVDEC Emulation
-        if system.isOptSet('nvdec_emu'):
-            yuzuConfig.set("Renderer", "nvdec_emulation", system.config["nvdec_emu"])
-            yuzuConfig.set("Renderer", "nvdec_emulation\\default", "false")
-        else:
-            yuzuConfig.set("Renderer", "nvdec_emulation", "2")
-            yuzuConfig.set("Renderer", "nvdec_emulation\\default", "true")
-
-        # Gpu Accuracy
-        if system.isOptSet('gpuaccuracy'):
-            yuzuConfig.set("Renderer", "gpu_accuracy", system.config["gpuaccuracy"])
-        else:
-            yuzuConfig.set("Renderer", "gpu_accuracy", "0")
-        yuzuConfig.set("Renderer", "gpu_accuracy\\default", "false")
-
-        # Vsync
-        if system.isOptSet('vsync'):
-            yuzuConfig.set("Renderer", "use_vsync", system.config["vsync"])
-            yuzuConfig.set("Renderer", "use_vsync\\default", "false")
-            if system.config["vsync"] == "2":
-                yuzuConfig.set("Renderer", "use_vsync\\default", "true")
-        else:
-            yuzuConfig.set("Renderer", "use_vsync", "1")
-            yuzuConfig.set("Renderer", "use_vsync\\default", "false")
-
-        # Gpu cache garbage collection
-        if system.isOptSet('gpu_cache_gc'):
-            yuzuConfig.set("Renderer", "use_caches_gc", system.config["gpu_cache_gc"])
-        else:
-            yuzuConfig.set("Renderer", "use_caches_gc", "false")
-        yuzuConfig.set("Renderer", "use_caches_gc\\default", "false")
-
-        # Max anisotropy
-        if system.isOptSet('anisotropy'):
-            yuzuConfig.set("Renderer", "max_anisotropy", system.config["anisotropy"])
-            yuzuConfig.set("Renderer", "max_anisotropy\\default", "false")
-        else:
-            yuzuConfig.set("Renderer", "max_anisotropy", "0")
-            yuzuConfig.set("Renderer", "max_anisotropy\\default", "true")
-
-        # Resolution scaler
-        if system.isOptSet('resolution_scale'):
-            yuzuConfig.set("Renderer", "resolution_setup", system.config["resolution_scale"])
-            yuzuConfig.set("Renderer", "resolution_setup\\default", "false")
-        else:
-            yuzuConfig.set("Renderer", "resolution_setup", "2")
-            yuzuConfig.set("Renderer", "resolution_setup\\default", "true")
-
-        # Scaling filter
-        if system.isOptSet('scale_filter'):
-            yuzuConfig.set("Renderer", "scaling_filter", system.config["scale_filter"])
-            yuzuConfig.set("Renderer", "scaling_filter\\default", "false")
-        else:
-            yuzuConfig.set("Renderer", "scaling_filter", "1")
-            yuzuConfig.set("Renderer", "scaling_filter\\default", "true")
-
-        # Anti aliasing method
-        if system.isOptSet('aliasing_method'):
-            yuzuConfig.set("Renderer", "anti_aliasing", system.config["aliasing_method"])
-            yuzuConfig.set("Renderer", "anti_aliasing\\default", "false")
-        else:
-            yuzuConfig.set("Renderer", "anti_aliasing", "0")
-            yuzuConfig.set("Renderer", "anti_aliasing\\default", "true")
-
-        #ASTC Decoding Method
-        if system.isOptSet('accelerate_astc'):
-            yuzuConfig.set("Renderer", "accelerate_astc", system.config["accelerate_astc"])
-            yuzuConfig.set("Renderer", "accelerate_astc\\default", "false")
-        else:
-            yuzuConfig.set("Renderer", "accelerate_astc", "1")
-            yuzuConfig.set("Renderer", "accelerate_astc\\default", "true")            
-
-        # ASTC Texture Recompression
-        if system.isOptSet('astc_recompression'):
-
-
-            yuzuConfig.set("Renderer", "astc_recompression", system.config["astc_recompression"])
-            yuzuConfig.set("Renderer", "astc_recompression\\default", "false")
-            if system.config["astc_recompression"] == "0":
-                yuzuConfig.set("Renderer", "use_vsync\\default", "true")
-            yuzuConfig.set("Renderer", "async_astc", "false")
-            yuzuConfig.set("Renderer", "async_astc\\default", "true")
-        else:
-            yuzuConfig.set("Renderer", "astc_recompression", "0")
-            yuzuConfig.set("Renderer", "astc_recompression\\default", "true")
-            yuzuConfig.set("Renderer", "async_astc", "false")
-            yuzuConfig.set("Renderer", "async_astc\\default", "true")
-
-    # Cpu Section
-        if not yuzuConfig.has_section("Cpu"):
-            yuzuConfig.add_section("Cpu")
-
-        # Cpu Accuracy
-        if system.isOptSet('cpuaccuracy'):
-            yuzuConfig.set("Cpu", "cpu_accuracy", system.config["cpuaccuracy"])
-            yuzuConfig.set("Cpu", "cpu_accuracy\\default", "false")
-        else:
-            yuzuConfig.set("Cpu", "cpu_accuracy", "0")
-            yuzuConfig.set("Cpu", "cpu_accuracy\\default", "true")
-
-    # System section
-        if not yuzuConfig.has_section("System"):
-            yuzuConfig.add_section("System")
-
-        # Language
-        if system.isOptSet('language'):
-            yuzuConfig.set("System", "language_index", system.config["language"])
-            yuzuConfig.set("System", "language_index\\default", "false")
-        else:
-            yuzuConfig.set("System", "language_index", "1")
-            yuzuConfig.set("System", "language_index\\default", "true")
-
-        # Audio Mode
-        if system.isOptSet('audio_mode'):
-            yuzuConfig.set("System", "sound_index", system.config["audio_mode"])
-            yuzuConfig.set("System", "sound_index\\default", "false")
-        else:
-            yuzuConfig.set("System", "sound_index", "1")
-            yuzuConfig.set("System", "sound_index\\default", "true")
-
-        # Region
-        if system.isOptSet('region'):
-            yuzuConfig.set("System", "region_index", system.config["region"])
-            yuzuConfig.set("System", "region_index\\default", "false")
-        else:
-            yuzuConfig.set("System", "region_index", "1")
-            yuzuConfig.set("System", "region_index\\default", "true")
-            
-        # Dock Mode
-        if system.isOptSet('dock_mode'):
-            if system.config["dock_mode"] == "1":
-                yuzuConfig.set("System", "use_docked_mode", "1")
-                yuzuConfig.set("System", "use_docked_mode\\default", "true")
-            elif system.config["dock_mode"] == "0":
-                yuzuConfig.set("System", "use_docked_mode", "0")
-                yuzuConfig.set("System", "use_docked_mode\\default", "false")
-        else:
-            yuzuConfig.set("System", "use_docked_mode", "1")
-            yuzuConfig.set("System", "use_docked_mode\\default", "true")
-
-    # Applet section
-        if not yuzuConfig.has_section("LibraryApplet"):
-            yuzuConfig.add_section("LibraryApplet")
-        yuzuConfig.set("LibraryApplet", "swkbd_applet_mode", "0")
-        yuzuConfig.set("LibraryApplet", "swkbd_applet_mode\\default", "false")
-
-    # web section
-        if not yuzuConfig.has_section("WebService"):
-            yuzuConfig.add_section("WebService")
-        
-        yuzuConfig.set("WebService", "enable_auto_update_check", "false")
-        yuzuConfig.set("WebService", "enable_auto_update_check\\default", "false")
+        # ui, data storage, core, renderer, cpu, system and applet sections (see yuzuOptions)
+        yuzuOptions.apply(yuzuConfig, system.config, yuzuOptions.CITRON)
 
     # controls section
         if not yuzuConfig.has_section("Controls"):
             yuzuConfig.add_section("Controls")
+        controls = yuzuConfig.section("Controls")
             
         if ((system.isOptSet('yuzu_auto_controller_config') and not (system.config["yuzu_auto_controller_config"] == "0")) or not system.isOptSet('yuzu_auto_controller_config')):
 
@@ -578,217 +192,10 @@ class CitronGenerator(Generator):
                 eslog.debug("=====================================================End Bato Controller Debug Info===========================================================")
                 eslog.debug("")
 
-            import sdl2
-            from sdl2 import (
-                SDL_TRUE
-            )
-            from sdl2 import joystick
-            from ctypes import create_string_buffer
-            sdl2.SDL_ClearError()
-            sdl2.SDL_SetHint(b"SDL_JOYSTICK_ALLOW_BACKGROUND_EVENTS", b"1")
-            ret = sdl2.SDL_Init(sdl2.SDL_INIT_VIDEO | sdl2.SDL_INIT_GAMECONTROLLER)
-            assert ret == 0, _check_error_msg()
-
-            sdl_devices = []
-            count = joystick.SDL_NumJoysticks()
-
-            if debugcontrollers:
-                eslog.debug("=====================================================Start SDL Controller Debug Info==========================================================")
-                for i in range(count):
-                    if sdl2.SDL_IsGameController(i) == SDL_TRUE:
-                        pad = sdl2.SDL_JoystickOpen(i)
-                        cont = sdl2.SDL_GameControllerOpen(i)
-                        joy_guid = joystick.SDL_JoystickGetDeviceGUID(i)
-                        buff = create_string_buffer(33)
-                        joystick.SDL_JoystickGetGUIDString(joy_guid,buff,33)
-                        buff[2] = b'0'
-                        buff[3] = b'0'
-                        buff[4] = b'0'
-                        buff[5] = b'0'
-                        buff[6] = b'0'
-                        buff[7] = b'0'
-                        guidstring = ((bytes(buff)).decode()).split('\x00',1)[0]
-                        eslog.debug("Joystick GUID: {}".format(guidstring))                 
-                        joy_path = joystick.SDL_JoystickPathForIndex(i)
-                        eslog.debug("Joystick Path: {}".format(joy_path.decode()))
-                        eslog.debug("Joystick Type: {}".format(sdl2.SDL_JoystickGetDeviceType(i))) 
-                        pad_type = sdl2.SDL_GameControllerTypeForIndex(i)
-                        eslog.debug("Joystick Pad Type: {}".format(pad_type))                    
-                        controllername = (sdl2.SDL_GameControllerNameForIndex(i)).decode()
-                        eslog.debug("Joystick Name: {}".format(controllername))     
-
-                        eslog.debug("Joystick Vendor: {}".format(joystick.SDL_JoystickGetDeviceVendor(i)))
-                        eslog.debug("Joystick Product: {}".format(joystick.SDL_JoystickGetDeviceProduct(i)))
-                        eslog.debug("Joystick Product Version: {}".format(joystick.SDL_JoystickGetDeviceProductVersion(i)))
-
-                        sdl2.SDL_GameControllerClose(cont)
-                        sdl2.SDL_JoystickClose(pad)
-                        eslog.debug("")
-                eslog.debug("=====================================================End SDL Controller Debug Info============================================================")
-                eslog.debug("")
-
-            for i in range(count):
-                    if sdl2.SDL_IsGameController(i) == SDL_TRUE:
-                        pad = sdl2.SDL_JoystickOpen(i)
-                        cont = sdl2.SDL_GameControllerOpen(i)
-                        #iid = sdl2.SDL_JoystickInstanceID(pad)
-                        #gc = sdl2.SDL_GameControllerMappingForDeviceIndex(i)
-
-                        gc_a = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_A)
-                        if(gc_a.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_HAT):
-                            button_b = "hat:" + str(gc_a.value.hat.hat)
-                        else:
-                            button_b = gc_a.value.button
-
-                        gc_b = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_B)
-                        if(gc_b.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_HAT):
-                            button_a = "hat:" + str(gc_b.value.hat.hat)
-                        else:
-                            button_a = gc_b.value.button
-
-                        gc_x = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_X)
-                        if(gc_x.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_HAT):
-                            button_y = "hat:" + str(gc_x.value.hat.hat)
-                        else:
-                            button_y = gc_x.value.button
-
-                        gc_y = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_Y)
-                        if(gc_y.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_HAT):
-                            button_x = "hat:" + str(gc_y.value.hat.hat)
-                        else:
-                            button_x = gc_y.value.button
-
-                        gc_dup = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_DPAD_UP)
-                        if(gc_dup.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_HAT):
-                            button_dup = "hat:" + str(gc_dup.value.hat.hat)
-                        else:
-                            button_dup = gc_dup.value.button
-
-                        gc_ddown = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_DPAD_DOWN)
-                        if(gc_ddown.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_HAT):
-                            button_ddown = "hat:" + str(gc_ddown.value.hat.hat)
-                        else:
-                            button_ddown = gc_ddown.value.button    
-
-                        gc_dleft = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_DPAD_LEFT)
-                        if(gc_dleft.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_HAT):
-                            button_dleft = "hat:" + str(gc_ddown.value.hat.hat)
-                        else:
-                            button_dleft = gc_dleft.value.button                     
-
-                        gc_dright = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_DPAD_RIGHT)
-                        if(gc_dright.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_HAT):
-                            button_dright = "hat:" + str(gc_ddown.value.hat.hat)
-                        else:
-                            button_dright = gc_dright.value.button 
-
-                        gc_l = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_LEFTSHOULDER)
-                        if(gc_l.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_HAT):
-                            button_l = "hat:" + str(gc_l.value.hat.hat)
-                        else:
-                            button_l = gc_l.value.button
-
-                        gc_r = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_RIGHTSHOULDER)
-                        if(gc_r.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_HAT):
-                            button_r = "hat:" + str(gc_r.value.hat.hat)
-                        else:
-                            button_r = gc_r.value.button
-
-                        gc_lstick = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_LEFTSTICK)
-                        button_lstick = gc_lstick.value.button
-
-                        gc_rstick = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_RIGHTSTICK)
-                        button_rstick = gc_rstick.value.button
-
-                        gc_home = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_GUIDE)
-                        button_home = gc_home.value.button
-
-                        gc_minus = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_BACK)
-                        button_minus = gc_minus.value.button
-
-                        gc_plus = sdl2.SDL_GameControllerGetBindForButton(cont,sdl2.SDL_CONTROLLER_BUTTON_START)
-                        button_plus = gc_plus.value.button
-
-                        gc_zl = sdl2.SDL_GameControllerGetBindForAxis(cont,sdl2.SDL_CONTROLLER_AXIS_TRIGGERLEFT)
-                        if(gc_zl.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_AXIS):
-                            button_zl = "axis"
-                            axis_button_zl = gc_zl.value.axis
-                        else:
-                            button_zl = gc_zl.value.button
-                            axis_button_zl = "noaxis"
-                        
-                        gc_zr = sdl2.SDL_GameControllerGetBindForAxis(cont,sdl2.SDL_CONTROLLER_AXIS_TRIGGERRIGHT)
-                        if(gc_zr.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_AXIS):
-                            button_zr = "axis"
-                            axis_button_zr = gc_zr.value.axis
-                        else:
-                            button_zr = gc_zr.value.button
-                            axis_button_zr = "noaxis"
-
-                        gc_axis_lstick_x = sdl2.SDL_GameControllerGetBindForAxis(cont,sdl2.SDL_CONTROLLER_AXIS_LEFTX)
-                        axis_lstick_x = gc_axis_lstick_x.value.axis
-
-                        gc_axis_rstick_x = sdl2.SDL_GameControllerGetBindForAxis(cont,sdl2.SDL_CONTROLLER_AXIS_RIGHTX)
-                        axis_rstick_x = gc_axis_rstick_x.value.axis
-
-                        joy_guid = joystick.SDL_JoystickGetDeviceGUID(i)
-                        buff = create_string_buffer(33)
-                        joystick.SDL_JoystickGetGUIDString(joy_guid,buff,33)                    
-                        joy_path = joystick.SDL_JoystickPathForIndex(i)
-                        buff[2] = b'0'
-                        buff[3] = b'0'
-                        buff[4] = b'0'
-                        buff[5] = b'0'
-                        buff[6] = b'0'
-                        buff[7] = b'0'
-                        guidstring = ((bytes(buff)).decode()).split('\x00',1)[0]
-                        if(joy_path.decode() == 'nintendo_joycons_combined' ):
-                            outputpath = 'nintendo_joycons_combined'
-                        else:    
-                            command = "udevadm info --query=path --name=" + joy_path.decode()
-                            outputpath = (((subprocess.check_output(command, shell=True)).decode()).partition('/input/')[0]).partition('/hidraw')[0]
-                        pad_type = sdl2.SDL_GameControllerTypeForIndex(i)
-                        controllername = (sdl2.SDL_GameControllerNameForIndex(i)).decode()
-
-                        if( "Steam" in controllername):
-                            pad_type = 1
-                        if("Xin-Mo Xin-Mo Dual Arcade" in controllername):
-                            pad_type = 1
-                        #Fix for Steam controller assignment
-                        controller_value = {
-                            "index" : i , 
-                            'path' : outputpath, 
-                            "guid" : guidstring, 
-                            #"instance" : iid,  
-                            "type" : pad_type, 
-                            "button_a" : button_a, 
-                            "button_b" : button_b, 
-                            "button_x" : button_x, 
-                            "button_y" : button_y,                                             
-                            "button_dup" : button_dup, 
-                            "button_ddown" : button_ddown,
-                            "button_dleft" : button_dleft,
-                            "button_dright" : button_dright,    
-                            "button_l" : button_l,
-                            "button_r" : button_r,
-                            "button_sl" : button_l,
-                            "button_sr" : button_r,
-                            "button_lstick" : button_lstick,
-                            "button_rstick" : button_rstick,
-                            "button_minus" : button_minus,
-                            "button_plus" : button_plus,
-                            "button_home" : button_home,
-                            "button_zl" : button_zl,
-                            "button_zr" : button_zr,
-                            "axis_button_zl" : axis_button_zl,
-                            "axis_button_zr" : axis_button_zr,
-                            "axis_lstick_x" : axis_lstick_x,
-                            "axis_rstick_x" : axis_rstick_x                                                      
-                            }
-                        sdl_devices.append(controller_value)
-                        sdl2.SDL_GameControllerClose(cont)
-                        sdl2.SDL_JoystickClose(pad)
-            sdl2.SDL_Quit()
+            # enumerated once, bindings cached per controller
+            sdl_devices = sdlProbe.devices(debugcontrollers)
+            sdl_by_path = sdlProbe.byPath(sdl_devices)
+            playerBindings = bindingCache.load()
 
             eslog.debug("Joysticks: {}".format(sdl_devices))
 
@@ -799,6 +206,7 @@ class CitronGenerator(Generator):
             else:
                 yuzuConfig.set("Controls", "vibration_enabled", "true")
                 yuzuConfig.set("Controls", "vibration_enabled\\default", "true")
+            vibration = system.config["yuzu_enable_rumble"] if system.isOptSet("yuzu_enable_rumble") else "true"
 
 
             cguid = [0 for x in range(10)]
@@ -823,11 +231,10 @@ class CitronGenerator(Generator):
 
                     if(playersControllers[index].realName == 'Nintendo Switch Combined Joy-Cons'):  #works in Batocera v37
                         outputpath = "nintendo_joycons_combined"
-                        sdl_mapping = next((item for item in sdl_devices if (item["path"] == outputpath or item["path"] == '/devices/virtual')),None)
+                        sdl_mapping = sdl_by_path.get(outputpath) or sdl_by_path.get('/devices/virtual')
                     else:
-                        command = "udevadm info --query=path --name=" + playersControllers[index].dev
-                        outputpath = ((subprocess.check_output(command, shell=True)).decode()).partition('/input/')[0]
-                        sdl_mapping = next((item for item in sdl_devices if item["path"] == outputpath),None)
+                        outputpath = sysfsPaths.devpath(playersControllers[index].dev).partition('/input/')[0]
+                        sdl_mapping = sdl_by_path.get(outputpath)
 
                     if(controller.guid in known_reversed_guids):
                         eslog.debug("Swapping type for GUID")
@@ -854,6 +261,10 @@ class CitronGenerator(Generator):
                         eslog.debug("Controller port: {}".format(portnumber))
                         eslog.debug("Controller cguid: {}".format(cguid[int(controllernumber)]))                
 
+                    # the bindings depend on the controller, its mapping, the pad type and the port
+                    padOption = system.config[which_pad] if system.isOptSet(which_pad) else None
+                    bindingKey = ("citron", controller.guid, controller.realName, inputguid, bindingCache.mappingKey(sdl_mapping), padOption, portnumber)
+
 
                     if(sdl_mapping == None):
                         eslog.debug("Batocera controller Branch")
@@ -889,14 +300,19 @@ class CitronGenerator(Generator):
                                 "rstick":    "joystick1"
                             }
 
-                            #Configure buttons and triggers
-                            for x in yuzuButtons:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"{}"'.format(CitronGenerator.setButton(yuzuButtons[x], inputguid, controller.inputs,portnumber)))
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
+                            #Configure buttons and triggers, rendered once per controller (see bindingCache)
+                            bindings = playerBindings.get(bindingKey)
+                            if bindings is None:
+                                bindings = []
+                                for x in yuzuButtons:
+                                    bindings.append(("_" + x, '"{}"'.format(CitronGenerator.setButton(yuzuButtons[x], inputguid, controller.inputs,portnumber))))
+                                    bindings.append(("_" + x + "\\default", "false"))
 
-                            for x in yuzuAxis:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"{}"'.format(CitronGenerator.setAxis(yuzuAxis[x], inputguid, controller.inputs, portnumber, 1)))
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
+                                for x in yuzuAxis:
+                                    bindings.append(("_" + x, '"{}"'.format(CitronGenerator.setAxis(yuzuAxis[x], inputguid, controller.inputs, portnumber, 1))))
+                                    bindings.append(("_" + x + "\\default", "false"))
+                                playerBindings.put(bindingKey, bindings)
+                            bindingCache.stamp(controls, controllernumber, bindings)
 
 
                         elif (system.isOptSet(which_pad) and (system.config[which_pad] == "3")):
@@ -931,14 +347,19 @@ class CitronGenerator(Generator):
                                 "rstick":    "joystick1"
                             }
 
-                            #Configure buttons and triggers
-                            for x in yuzuButtons:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"{}"'.format(CitronGenerator.setButton(yuzuButtons[x], inputguid, controller.inputs,portnumber)))
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
+                            #Configure buttons and triggers, rendered once per controller (see bindingCache)
+                            bindings = playerBindings.get(bindingKey)
+                            if bindings is None:
+                                bindings = []
+                                for x in yuzuButtons:
+                                    bindings.append(("_" + x, '"{}"'.format(CitronGenerator.setButton(yuzuButtons[x], inputguid, controller.inputs,portnumber))))
+                                    bindings.append(("_" + x + "\\default", "false"))
 
-                            for x in yuzuAxis:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"{}"'.format(CitronGenerator.setAxis(yuzuAxis[x], inputguid, controller.inputs, portnumber,2)))
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
+                                for x in yuzuAxis:
+                                    bindings.append(("_" + x, '"{}"'.format(CitronGenerator.setAxis(yuzuAxis[x], inputguid, controller.inputs, portnumber,2))))
+                                    bindings.append(("_" + x + "\\default", "false"))
+                                playerBindings.put(bindingKey, bindings)
+                            bindingCache.stamp(controls, controllernumber, bindings)
 
                         else:
                             eslog.debug("Controller Type: Non-Joycon")
@@ -971,291 +392,55 @@ class CitronGenerator(Generator):
                                 "rstick":    "joystick2"
                             }
 
-                            #Configure buttons and triggers
-                            for x in yuzuButtons:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"{}"'.format(CitronGenerator.setButton(yuzuButtons[x], inputguid, controller.inputs,portnumber)))
-                        
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")                           
-
-                            for x in yuzuAxis:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"{}"'.format(CitronGenerator.setAxis(yuzuAxis[x], inputguid, controller.inputs, portnumber,0)))     
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
-
-                        #Enable motion no matter what, as enabling won't hurt things if it doesn't exist
-                        yuzuConfig.set("Controls", "player_" + controllernumber + "_motionleft", '"engine:sdl,motion:0,port:{},guid:{}"'.format(portnumber,inputguid))
-                        yuzuConfig.set("Controls", "player_" + controllernumber + "_motionright", '"engine:sdl,motion:0,port:{},guid:{}"'.format(portnumber,inputguid))
-
-                        yuzuConfig.set("Controls", "player_" + controllernumber + "_connected", "true")
-                        if (controllernumber == "0"):
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "true")
-                        else:
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "false")
+                            #Configure buttons and triggers, rendered once per controller (see bindingCache)
+                            bindings = playerBindings.get(bindingKey)
+                            if bindings is None:
+                                bindings = []
+                                for x in yuzuButtons:
+                                    bindings.append(("_" + x, '"{}"'.format(CitronGenerator.setButton(yuzuButtons[x], inputguid, controller.inputs,portnumber))))
 
-                        if system.isOptSet(which_pad):
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type", system.config["p1_pad"])
-                            #yuzuConfig.set("Controls", "player_0_type", system.config["p1_pad"])
-                        else:
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type", "0")
+                                    bindings.append(("_" + x + "\\default", "false"))
 
-                        yuzuConfig.set("Controls", "player_" + controllernumber + "_type\\default", "true")
+                                for x in yuzuAxis:
+                                    bindings.append(("_" + x, '"{}"'.format(CitronGenerator.setAxis(yuzuAxis[x], inputguid, controller.inputs, portnumber,0))))
+                                    bindings.append(("_" + x + "\\default", "false"))
+                                playerBindings.put(bindingKey, bindings)
+                            bindingCache.stamp(controls, controllernumber, bindings)
 
-                        if system.isOptSet("yuzu_enable_rumble"):
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", system.config["yuzu_enable_rumble"])
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", system.config["yuzu_enable_rumble"])
-                        else:
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", "true")
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", "true")
+                        #Enable motion no matter what, as enabling won't hurt things if it doesn't exist
+                        padType = system.config["p1_pad"] if system.isOptSet(which_pad) else "0"
+                        yuzuControls.BATOCERA_TAIL.stamp(controls, controllernumber, port=portnumber, guid=inputguid, type=padType, vibration=vibration)
 
                         lastplayer = int(controllernumber) + 1
 
                     elif (sdl_mapping['type'] == 13):
                         #we have real joycons
                         eslog.debug("Joycon Branch")
-                        yuzuPad1Buttons = {
-                                "button_l":      64, 
-                                "button_minus":  65536,
-                                "button_lstick": 524288,
-                                "button_screenshot": 2097152,
-                                "button_dup":    2, 
-                                "button_ddown":  1,
-                                "button_dleft":  8,
-                                "button_dright": 4,
-                                "button_zl": 128
-                            }
-                        
-                        yuzuPad2Buttons = {
-                                "button_a":      2048, #notused on left joycon
-                                "button_b":      1024, #notused on left joycon
-                                "button_x":      512, #notused on left joycon
-                                "button_y":      256, #notused on left joycon
-                                "button_r":      16384, #notused on left joycon
-                                "button_plus":   131072, #notused on left joycon
-                                "button_rstick": 262144, #notused on left joycon
-                                "button_home":   1048576,  #notused on left joycon
-                                "button_zr": 32768 #notused on left joycon
-                            }
-
                         if (system.isOptSet(which_pad) and (system.config[which_pad] == "2")):
                             eslog.debug("Controller Type: Left Joycon")
-                            pad1 = 1
-                            pad2 = 1
                             lastplayer = int(controllernumber)+1
-                            
-                            #Configure buttons and triggers
-                            for x in yuzuPad1Buttons:
-                                eslog.debug("Left Joycon {}".format(x))
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"pad:{},button:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,yuzuPad1Buttons[x],portnumber,pad1))
-                            for x in yuzuPad2Buttons:
-                                eslog.debug("Left Joycon {}".format(x))
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"pad:{},button:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,yuzuPad2Buttons[x],portnumber,pad2))
-
-                            #sl and sr of left pad
-                            eslog.debug("Left Joycon SL")
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_button_sl", '"pad:{},button:32,port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_button_sr", '"pad:{},button:16,port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-
-                            #set joysticks
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_lstick", '"axis_y:1,axis_x:0,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_rstick", '"axis_y:3,axis_x:2,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,portnumber,pad2))
-                            
-                            #Enable motion no matter what, as enabling won't hurt things if it doesn't exist
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_motionleft", '"motion:0,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_motionright", '"motion:1,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,portnumber,pad2))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_connected", "true")
-                            
-                            if (controllernumber == "0"):
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "true")
-                            else:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "false")
-
-                            #Forcing to left joycon
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type", "2")
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type\\default", "false")
-                            if system.isOptSet("yuzu_enable_rumble"):
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", system.config["yuzu_enable_rumble"])
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", system.config["yuzu_enable_rumble"])
-                            else:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", "true")
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", "true")
+                            yuzuControls.JOYCON_LEFT.stamp(controls, controllernumber, pad1=1, pad2=1, port=portnumber, type="2", vibration=vibration)
 
                             eslog.debug("Controller Type: Right Joycon after Left")
-                            pad1 = 2
-                            pad2 = 2
                             controllernumber = str(lastplayer)
                             lastplayer = int(controllernumber)+1
+                            yuzuControls.JOYCON_RIGHT.stamp(controls, controllernumber, pad1=2, pad2=2, port=portnumber, type="3", vibration=vibration)
 
-                            #Configure buttons and triggers
-                            for x in yuzuPad1Buttons:
-                                eslog.debug("Right Joycon {}".format(x))
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"pad:{},button:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,yuzuPad1Buttons[x],portnumber,pad1))
-                            for x in yuzuPad2Buttons:
-                                eslog.debug("Right Joycon {}".format(x))
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"pad:{},button:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,yuzuPad2Buttons[x],portnumber,pad2))
-
-                            #sl and sr of right pad
-                            eslog.debug("Right Joycon SL")
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_button_sl", '"pad:{},button:8192,port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_button_sr", '"pad:{},button:4096,port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-
-                            #set joysticks
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_lstick", '"axis_y:1,axis_x:0,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_rstick", '"axis_y:3,axis_x:2,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,portnumber,pad2))
-                            
-                            #Enable motion no matter what, as enabling won't hurt things if it doesn't exist
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_motionleft", '"motion:0,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_motionright", '"motion:1,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,portnumber,pad2))
-
-
-
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_connected", "true")
-                            if (controllernumber == "0"):
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "true")
-                            else:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "false")
-
-                            #Forcing to right joycons
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type", "3")
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type\\default", "false")
-                            if system.isOptSet("yuzu_enable_rumble"):
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", system.config["yuzu_enable_rumble"])
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", system.config["yuzu_enable_rumble"])
-                            else:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", "true")
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", "true")
-
-
-
-                        
                         elif (system.isOptSet(which_pad) and (system.config[which_pad] == "3")):
                             eslog.debug("Controller Type: Right Joycon")
-                            pad1 = 2
-                            pad2 = 2
-
                             lastplayer = int(controllernumber)+1
-
-                            #Configure buttons and triggers
-                            for x in yuzuPad1Buttons:
-                                eslog.debug("Right Joycon {}".format(x))
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"pad:{},button:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,yuzuPad1Buttons[x],portnumber,pad1))
-                            for x in yuzuPad2Buttons:
-                                eslog.debug("Right Joycon {}".format(x))
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"pad:{},button:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,yuzuPad2Buttons[x],portnumber,pad2))
-
-                            #sl and sr of right pad
-                            eslog.debug("Right Joycon SL")
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_button_sl", '"pad:{},button:8192,port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_button_sr", '"pad:{},button:4096,port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-
-                            #set joysticks
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_lstick", '"axis_y:1,axis_x:0,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_rstick", '"axis_y:3,axis_x:2,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,portnumber,pad2))
-                            
-                            #Enable motion no matter what, as enabling won't hurt things if it doesn't exist
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_motionleft", '"motion:0,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_motionright", '"motion:1,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,portnumber,pad2))
-
-
-
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_connected", "true")
-                            if (controllernumber == "0"):
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "true")
-                            else:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "false")
-
-                            #Forcing to right joycons
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type", "3")
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type\\default", "false")
-                            if system.isOptSet("yuzu_enable_rumble"):
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", system.config["yuzu_enable_rumble"])
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", system.config["yuzu_enable_rumble"])
-                            else:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", "true")
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", "true")
-
+                            yuzuControls.JOYCON_RIGHT.stamp(controls, controllernumber, pad1=2, pad2=2, port=portnumber, type="3", vibration=vibration)
 
                             eslog.debug("Controller Type: Left Joycon After Right")
-                            pad1 = 1
-                            pad2 = 1
                             controllernumber = str(lastplayer)
                             lastplayer = int(controllernumber)+1
-                            
-                            #Configure buttons and triggers
-                            for x in yuzuPad1Buttons:
-                                eslog.debug("Left Joycon {}".format(x))
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"pad:{},button:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,yuzuPad1Buttons[x],portnumber,pad1))
-                            for x in yuzuPad2Buttons:
-                                eslog.debug("Left Joycon {}".format(x))
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"pad:{},button:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,yuzuPad2Buttons[x],portnumber,pad2))
-
-                            #sl and sr of left pad
-                            eslog.debug("Left Joycon SL")
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_button_sl", '"pad:{},button:32,port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_button_sr", '"pad:{},button:16,port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-
-                            #set joysticks
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_lstick", '"axis_y:1,axis_x:0,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_rstick", '"axis_y:3,axis_x:2,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,portnumber,pad2))
-                            
-                            #Enable motion no matter what, as enabling won't hurt things if it doesn't exist
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_motionleft", '"motion:0,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_motionright", '"motion:1,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,portnumber,pad2))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_connected", "true")
-                            
-                            if (controllernumber == "0"):
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "true")
-                            else:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "false")
-
-                            #Forcing to left joycon
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type", "2")
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type\\default", "false")
-                            if system.isOptSet("yuzu_enable_rumble"):
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", system.config["yuzu_enable_rumble"])
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", system.config["yuzu_enable_rumble"])
-                            else:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", "true")
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", "true")
+                            yuzuControls.JOYCON_LEFT.stamp(controls, controllernumber, pad1=1, pad2=1, port=portnumber, type="2", vibration=vibration)
 
                         else:
                             eslog.debug("Controller Type: Dual Joycons")
-                            pad1 = 1
-                            pad2 = 2
                             lastplayer = int(controllernumber)+1
+                            yuzuControls.JOYCON_DUAL.stamp(controls, controllernumber, pad1=1, pad2=2, port=portnumber, type="1", vibration=vibration)
 
-                            #Configure buttons and triggers
-                            for x in yuzuPad1Buttons:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"pad:{},button:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,yuzuPad1Buttons[x],portnumber,pad1))
-                            for x in yuzuPad2Buttons:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"pad:{},button:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,yuzuPad2Buttons[x],portnumber,pad2))
-
-                            #sl and sr not connected for dual joycon mode
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "button_sl", '[empty]')
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "button_sr", '[empty]')
-
-                            #set joysticks
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_lstick", '"axis_y:1,axis_x:0,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_rstick", '"axis_y:3,axis_x:2,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,portnumber,pad2))
-                            
-                            #Enable motion no matter what, as enabling won't hurt things if it doesn't exist
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_motionleft", '"motion:0,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad1,portnumber,pad1))
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_motionright", '"motion:1,pad:{},port:{},guid:0000000000000000000000000000000{},engine:joycon"'.format(pad2,portnumber,pad2))
-
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_connected", "true")
-                            if (controllernumber == "0"):
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "true")
-                            else:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "false")
-
-                            #Forcing to dual joycons
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type", "1")
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type\\default", "false")
-                            if system.isOptSet("yuzu_enable_rumble"):
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", system.config["yuzu_enable_rumble"])
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", system.config["yuzu_enable_rumble"])
-                            else:
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", "true")
-                                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", "true")
-                            
                     else:
                         eslog.debug("SDL controller Branch")
                         if (system.isOptSet(which_pad) and (system.config[which_pad] == "2")):
@@ -1326,23 +511,28 @@ class CitronGenerator(Generator):
                                 "button_dright":  'right'
                             }
 
-                            #Configure buttons and triggers
-                            for x in yuzuButtons:
-                                if("hat" in str(yuzuButtons[x])):
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"{},direction:{},guid:{},port:{},engine:sdl"'.format(yuzuButtons[x],yuzuHat[x],inputguid,portnumber))
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
-
-                                elif("axis" in str(yuzuButtons[x])):
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"engine:sdl,invert:+,port:{},guid:{},axis:{},threshold:0.500000"'.format(portnumber,inputguid,yuzuAxisButtons[x]))
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
-
-                                else:
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"button:{},guid:{},port:{},engine:sdl"'.format(yuzuButtons[x],inputguid,portnumber))
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
-
-                            #set joysticks
-                            for x in yuzuAxis:
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"engine:sdl,port:{},guid:{},axis_x:{},offset_x:-0.011750,axis_y:{},offset_y:-0.027467,invert_x:-,invert_y:+,deadzone:0.150000,range:0.950000"'.format(portnumber,inputguid,yuzuAxis[x]+1,yuzuAxis[x]))
+                            #Configure buttons and triggers, rendered once per controller (see bindingCache)
+                            bindings = playerBindings.get(bindingKey)
+                            if bindings is None:
+                                bindings = []
+                                for x in yuzuButtons:
+                                    if("hat" in str(yuzuButtons[x])):
+                                        bindings.append(("_" + x, '"{},direction:{},guid:{},port:{},engine:sdl"'.format(yuzuButtons[x],yuzuHat[x],inputguid,portnumber)))
+                                        bindings.append(("_" + x + "\\default", "false"))
+
+                                    elif("axis" in str(yuzuButtons[x])):
+                                        bindings.append(("_" + x, '"engine:sdl,invert:+,port:{},guid:{},axis:{},threshold:0.500000"'.format(portnumber,inputguid,yuzuAxisButtons[x])))
+                                        bindings.append(("_" + x + "\\default", "false"))
+
+                                    else:
+                                        bindings.append(("_" + x, '"button:{},guid:{},port:{},engine:sdl"'.format(yuzuButtons[x],inputguid,portnumber)))
+                                        bindings.append(("_" + x + "\\default", "false"))
+
+                                #set joysticks
+                                for x in yuzuAxis:
+                                        bindings.append(("_" + x, '"engine:sdl,port:{},guid:{},axis_x:{},offset_x:-0.011750,axis_y:{},offset_y:-0.027467,invert_x:-,invert_y:+,deadzone:0.150000,range:0.950000"'.format(portnumber,inputguid,yuzuAxis[x]+1,yuzuAxis[x])))
+                                playerBindings.put(bindingKey, bindings)
+                            bindingCache.stamp(controls, controllernumber, bindings)
                         elif (system.isOptSet(which_pad) and (system.config[which_pad] == "3")):
                             eslog.debug("Controller Type: Right Joycon")
                             #2 = Left Joycon
@@ -1411,21 +601,26 @@ class CitronGenerator(Generator):
                                 "button_dright":  'right'
                             }
 
-                            #Configure buttons and triggers
-                            for x in yuzuButtons:
-                                if("hat" in str(yuzuButtons[x])):
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"{},direction:{},guid:{},port:{},engine:sdl"'.format(yuzuButtons[x],yuzuHat[x],inputguid,portnumber))
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
-                                elif("axis" in str(yuzuButtons[x])):
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"engine:sdl,invert:+,port:{},guid:{},axis:{},threshold:0.500000"'.format(portnumber,inputguid,yuzuAxisButtons[x]))
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
-                                else:
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"button:{},guid:{},port:{},engine:sdl"'.format(yuzuButtons[x],inputguid,portnumber))
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
-
-                            #set joysticks
-                            for x in yuzuAxis:
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"engine:sdl,port:{},guid:{},axis_x:{},offset_x:-0.011750,axis_y:{},offset_y:-0.027467,invert_x:+,invert_y:-,deadzone:0.150000,range:0.950000"'.format(portnumber,inputguid,yuzuAxis[x]+1,yuzuAxis[x]))
+                            #Configure buttons and triggers, rendered once per controller (see bindingCache)
+                            bindings = playerBindings.get(bindingKey)
+                            if bindings is None:
+                                bindings = []
+                                for x in yuzuButtons:
+                                    if("hat" in str(yuzuButtons[x])):
+                                        bindings.append(("_" + x, '"{},direction:{},guid:{},port:{},engine:sdl"'.format(yuzuButtons[x],yuzuHat[x],inputguid,portnumber)))
+                                        bindings.append(("_" + x + "\\default", "false"))
+                                    elif("axis" in str(yuzuButtons[x])):
+                                        bindings.append(("_" + x, '"engine:sdl,invert:+,port:{},guid:{},axis:{},threshold:0.500000"'.format(portnumber,inputguid,yuzuAxisButtons[x])))
+                                        bindings.append(("_" + x + "\\default", "false"))
+                                    else:
+                                        bindings.append(("_" + x, '"button:{},guid:{},port:{},engine:sdl"'.format(yuzuButtons[x],inputguid,portnumber)))
+                                        bindings.append(("_" + x + "\\default", "false"))
+
+                                #set joysticks
+                                for x in yuzuAxis:
+                                        bindings.append(("_" + x, '"engine:sdl,port:{},guid:{},axis_x:{},offset_x:-0.011750,axis_y:{},offset_y:-0.027467,invert_x:+,invert_y:-,deadzone:0.150000,range:0.950000"'.format(portnumber,inputguid,yuzuAxis[x]+1,yuzuAxis[x])))
+                                playerBindings.put(bindingKey, bindings)
+                            bindingCache.stamp(controls, controllernumber, bindings)
                                 
                         else:
                             #0 = Pro Controller, 1 = Dual Joycons, 4 = Handheld Mode,  (and other cases not yet defined)
@@ -1492,142 +687,54 @@ class CitronGenerator(Generator):
                                 "button_dright":  'right'
                             }
 
-                            #Configure buttons and triggers
-                            for x in yuzuButtons:
-                                if("hat" in str(yuzuButtons[x])):
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"{},direction:{},guid:{},port:{},engine:sdl"'.format(yuzuButtons[x],yuzuHat[x],inputguid,portnumber))
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
-                                elif("axis" in str(yuzuButtons[x])):
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"engine:sdl,invert:+,port:{},guid:{},axis:{},threshold:0.500000"'.format(portnumber,inputguid,yuzuAxisButtons[x]))
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
-                                else:
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"button:{},guid:{},port:{},engine:sdl"'.format(yuzuButtons[x],inputguid,portnumber))
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x + "\\default", "false")
-
-                            #set joysticks
-                            for x in yuzuAxis:
-                                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '"engine:sdl,port:{},guid:{},axis_x:{},offset_x:-0.011750,axis_y:{},offset_y:-0.027467,invert_x:+,invert_y:+,deadzone:0.150000,range:0.950000"'.format(portnumber,inputguid,yuzuAxis[x],yuzuAxis[x]+1))
+                            #Configure buttons and triggers, rendered once per controller (see bindingCache)
+                            bindings = playerBindings.get(bindingKey)
+                            if bindings is None:
+                                bindings = []
+                                for x in yuzuButtons:
+                                    if("hat" in str(yuzuButtons[x])):
+                                        bindings.append(("_" + x, '"{},direction:{},guid:{},port:{},engine:sdl"'.format(yuzuButtons[x],yuzuHat[x],inputguid,portnumber)))
+                                        bindings.append(("_" + x + "\\default", "false"))
+                                    elif("axis" in str(yuzuButtons[x])):
+                                        bindings.append(("_" + x, '"engine:sdl,invert:+,port:{},guid:{},axis:{},threshold:0.500000"'.format(portnumber,inputguid,yuzuAxisButtons[x])))
+                                        bindings.append(("_" + x + "\\default", "false"))
+                                    else:
+                                        bindings.append(("_" + x, '"button:{},guid:{},port:{},engine:sdl"'.format(yuzuButtons[x],inputguid,portnumber)))
+                                        bindings.append(("_" + x + "\\default", "false"))
+
+                                #set joysticks
+                                for x in yuzuAxis:
+                                        bindings.append(("_" + x, '"engine:sdl,port:{},guid:{},axis_x:{},offset_x:-0.011750,axis_y:{},offset_y:-0.027467,invert_x:+,invert_y:+,deadzone:0.150000,range:0.950000"'.format(portnumber,inputguid,yuzuAxis[x],yuzuAxis[x]+1)))
+                                playerBindings.put(bindingKey, bindings)
+                            bindingCache.stamp(controls, controllernumber, bindings)
                                         
 
 
                         #Enable motion no matter what, as enabling won't hurt things if it doesn't exist
-                        yuzuConfig.set("Controls", "player_" + controllernumber + "_motionleft", '"engine:sdl,motion:0,port:{},guid:{}"'.format(portnumber,inputguid))
-                        yuzuConfig.set("Controls", "player_" + controllernumber + "_motionright", '"engine:sdl,motion:0,port:{},guid:{}"'.format(portnumber,inputguid))
-
-                        yuzuConfig.set("Controls", "player_" + controllernumber + "_connected", "true")
-                        if (controllernumber == "0"):
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "true")
-                        else:
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\\default", "false")
-
-                        if system.isOptSet(which_pad):
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type", system.config["p1_pad"])
-                            #yuzuConfig.set("Controls", "player_0_type", system.config["p1_pad"])
-                        else:
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_type", "0")
-
-
-                        yuzuConfig.set("Controls", "player_" + controllernumber + "_button_screenshot", "[empty]")
-                        yuzuConfig.set("Controls", "player_" + controllernumber + "_button_screenshot\\default", "false")
-                        yuzuConfig.set("Controls", "player_" + controllernumber + "_type\\default", "true")
-
-
-                        if system.isOptSet("yuzu_enable_rumble"):
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", system.config["yuzu_enable_rumble"])
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", system.config["yuzu_enable_rumble"])
-                        else:
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", "true")
-                            yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", "true")
+                        padType = system.config["p1_pad"] if system.isOptSet(which_pad) else "0"
+                        yuzuControls.SDL_TAIL.stamp(controls, controllernumber, port=portnumber, guid=inputguid, type=padType, vibration=vibration)
 
                         lastplayer = int(controllernumber) + 1
 
             
             
             #lastplayer = lastplayer + 1
+            playerBindings.save()
             eslog.debug("Last Player {}".format(lastplayer))
+            unconnected = yuzuControls.unconnected(yuzuButtons, yuzuAxis)
             for y in range(lastplayer, 9):
                 controllernumber = str(y)
                 eslog.debug("Setting Controller: {}".format(controllernumber))
-                for x in yuzuButtons:
-                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '""')
-                for x in yuzuAxis:
-                    yuzuConfig.set("Controls", "player_" + controllernumber + "_" + x, '""')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_a", '"toggle:0,code:67,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_a\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_b", '"toggle:0,code:88,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_b\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_ddown", '"toggle:0,code:16777237,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_ddown\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_dleft", '"toggle:0,code:16777234,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_dleft\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_dright", '"toggle:0,code:16777236,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_dright\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_dup", '"toggle:0,code:16777235,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_dup\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_home", '"toggle:0,code:0,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_home\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_l", '"toggle:0,code:81,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_l\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_lstick", '"toggle:0,code:70,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_lstick\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_minus", '"toggle:0,code:78,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_minus\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_plus", '"toggle:0,code:77,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_plus\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_r", '"toggle:0,code:69,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_r\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_rstick", '"toggle:0,code:71,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_rstick\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_screenshot", '"toggle:0,code:0,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_screenshot\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_sl", '"toggle:0,code:81,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_sl\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_sr", '"toggle:0,code:69,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_sr\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_x", '"toggle:0,code:86,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_x\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_y", '"toggle:0,code:90,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_y\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_zl", '"toggle:0,code:82,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_zl\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_zr", '"toggle:0,code:84,engine:keyboard"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_button_zr\\default", "true")
-
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_lstick", '"modifier_scale:0.500000,modifier:toggle$00$1code$016777248$1engine$0keyboard,right:toggle$00$1code$068$1engine$0keyboard,left:toggle$00$1code$065$1engine$0keyboard,down:toggle$00$1code$083$1engine$0keyboard,up:toggle$00$1code$087$1engine$0keyboard,engine:analog_from_button"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_lstick\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_rstick", '"modifier_scale:0.500000,modifier:toggle$00$1code$00$1engine$0keyboard,right:toggle$00$1code$076$1engine$0keyboard,left:toggle$00$1code$074$1engine$0keyboard,down:toggle$00$1code$075$1engine$0keyboard,up:toggle$00$1code$073$1engine$0keyboard,engine:analog_from_button"')
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_rstick\\default", "true")
-
-
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_connected", "false")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_connected\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_type", "0")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_type\\default", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled", "true")
-                yuzuConfig.set("Controls", "player_" + controllernumber + "_vibration_enabled\\default", "true")
-
-
-    # telemetry section
-        if not yuzuConfig.has_section("WebService"):
-            yuzuConfig.add_section("WebService") 
-        yuzuConfig.set("WebService", "enable_telemetry", "false")
-        yuzuConfig.set("WebService", "enable_telemetry\\default", "false") 
-        
-        
-    # Services section
-        if not yuzuConfig.has_section("Services"):
-            yuzuConfig.add_section("Services")
-        yuzuConfig.set("Services", "bcat_backend", "none")
-        yuzuConfig.set("Services", "bcat_backend\\default", "none") 
-
-        ### update the configuration file
-        if not os.path.exists(os.path.dirname(yuzuConfigFile)):
-            os.makedirs(os.path.dirname(yuzuConfigFile))
-        with open(yuzuConfigFile, 'w') as configfile:
-            yuzuConfig.write(configfile)
-
-        with open(beforeyuzuConfigFile, 'w') as configfile:
-            yuzuConfig.write(configfile)
+                unconnected.stamp(controls, y)
+
+
+    # telemetry and services sections
+        yuzuOptions.apply(yuzuConfig, system.config, yuzuOptions.TAIL)
+
+        ### update the configuration file (and its before copy)
+        content = io.StringIO()
+        yuzuConfig.write(content)
+        configCache.write(yuzuConfigFile, beforeyuzuConfigFile, content.getvalue(), configKey)
 
     @staticmethod
     def setButton(key, padGuid, padInputs,controllernumber):
@@ -3,16 +3,19 @@ import generators
 from configgen.generators.Generator import Generator
 from configgen import Command as Command
 import os
-import stat
-import json
 import uuid
 from os import path
 from os import environ
 import batoceraFiles
+import bindingCache
+import configCache
+import envFingerprint
+import jsonConfig
+import sdlProbe
+import sysfsPaths
 import controllersConfig as controllersConfig
 from shutil import copyfile
 import logging
-import subprocess
 from typing import TYPE_CHECKING, Final
 
 if TYPE_CHECKING:
@@ -24,6 +27,26 @@ if TYPE_CHECKING:
 
 eslog = logging.getLogger(__name__)
 
+# what the generated Config.json depends on, besides the settings, the controllers and the version.txt of ryujinx
+RYUJINX_CONFIG_INPUTS: Final = ("/userdata/system/switch/Ryujinx.AppImage", "/userdata/system/switch/Ryujinx-Avalonia.AppImage", __file__, "/userdata/system/switch/configgen/debugcontrollers.txt")
+
+# made executable at each launch (a downloaded AppImage isn't)
+RYUJINX_APPIMAGES: Final = ("/userdata/system/switch/extra/ryujinx/Ryujinx.AppImage", "/userdata/system/switch/extra/ryujinxavalonia/Ryujinx-Avalonia.AppImage",
+                            "/userdata/system/switch/Ryujinx.AppImage", "/userdata/system/switch/Ryujinx-Avalonia.AppImage")
+
+# the version of Config.json the ryujinx builds expect: the first row whose minimum the build reaches
+CONFIG_VERSIONS: Final = {
+    "ryujinx-avalonia": ((1267, 49), (924, 47), (0, 42)),
+    "ryujinx":          ((1267, 67), (924, 47), (383, 42), (0, 40)),
+}
+
+def configVersion(emulator: str, ryu_version: int) -> int:
+    rows = CONFIG_VERSIONS.get(emulator, CONFIG_VERSIONS["ryujinx"])
+    for minimum, version in rows:
+        if ryu_version >= minimum:
+            return version
+    return rows[-1][1]
+
 class RyujinxMainlineGenerator(Generator):
 
     def getHotkeysContext(self) -> HotkeysContext:
@@ -34,18 +57,8 @@ class RyujinxMainlineGenerator(Generator):
 
     def generate(self, system, rom, playersControllers, metadata, guns, wheels, gameResolution):
         #handles chmod so you just need to download Ryujinx.AppImage
-        if os.path.exists("/userdata/system/switch/extra/ryujinx/Ryujinx.AppImage"):
-            st = os.stat("/userdata/system/switch/extra/ryujinx/Ryujinx.AppImage")
-            os.chmod("/userdata/system/switch/extra/ryujinx/Ryujinx.AppImage", st.st_mode | stat.S_IEXEC)
-        if os.path.exists("/userdata/system/switch/extra/ryujinxavalonia/Ryujinx-Avalonia.AppImage"):
-            st = os.stat("/userdata/system/switch/extra/ryujinxavalonia/Ryujinx-Avalonia.AppImage")
-            os.chmod("/userdata/system/switch/extra/ryujinxavalonia/Ryujinx-Avalonia.AppImage", st.st_mode | stat.S_IEXEC)
-        if os.path.exists("/userdata/system/switch/Ryujinx.AppImage"):
-            st = os.stat("/userdata/system/switch/Ryujinx.AppImage")
-            os.chmod("/userdata/system/switch/Ryujinx.AppImage", st.st_mode | stat.S_IEXEC)
-        if os.path.exists("/userdata/system/switch/Ryujinx-Avalonia.AppImage"):
-            st = os.stat("/userdata/system/switch/Ryujinx-Avalonia.AppImage")
-            os.chmod("/userdata/system/switch/Ryujinx-Avalonia.AppImage", st.st_mode | stat.S_IEXEC)
+        for appImage in RYUJINX_APPIMAGES:
+            envFingerprint.appImage(appImage)
 
         if not path.isdir(batoceraFiles.CONF + "/Ryujinx"):
             os.mkdir(batoceraFiles.CONF + "/Ryujinx")
@@ -92,46 +105,32 @@ class RyujinxMainlineGenerator(Generator):
             filename = "/userdata/system/switch/extra/ryujinx/version.txt"
             os.environ["PYSDL2_DLL_PATH"] = "/userdata/system/switch/extra/ryujinx/"
             
-        if os.path.exists(filename):
-            file = open(filename, 'r')
-            versiontxt = file.read()
-            ryu_version = int(versiontxt.replace('.', ''))
-            file.close()
-        else:
-            ryu_version = 382
+        ryu_version = envFingerprint.ryujinxVersion(filename)
         #import SDL to try and guess controller order
 
         eslog.debug("Ryujinx Version: {}".format(ryu_version))
 
+        # nothing to write when the inputs and the file are the ones of the last generation
+        beforeConfigFile = batoceraFiles.CONF + '/Ryujinx/BeforeRyu.json'
+        configKey = configCache.inputsKey(system.config, playersControllers, RYUJINX_CONFIG_INPUTS + (filename,))
+        if configCache.unchanged(RyujinxConfigFile, beforeConfigFile, configKey):
+            eslog.debug(f"{RyujinxConfigFile} is up to date")
+            return
+
         #with open('/userdata/system/switch/configgen/mapping.csv', mode='r', encoding='utf-8-sig') as csv_file:
         #    reader = csv.DictReader(csv_file)
         #    controller_data = list(reader)
 
-        if os.path.exists(RyujinxConfigFile):
-            with open(RyujinxConfigFile, "r") as read_file:
-                data = json.load(read_file)
-        else:
-                data = {}
+        # the document of the file, patched: the keys changed are known at the end
+        data = jsonConfig.read(RyujinxConfigFile)
+
+        data['version'] = configVersion(system.config['emulator'], ryu_version)
 
-        if system.config['emulator'] == 'ryujinx-avalonia':
-            if ryu_version >= 1267:
-                data['version'] = 49
-            elif ryu_version >= 924:
-                data['version'] = 47
-            else:
-                data['version'] = 42
-        else:
-            if ryu_version >= 1267:
-                data['version'] = 67
-            elif ryu_version >= 924:
-                data['version'] = 47
-            elif ryu_version > 382:
-                data['version'] = 42
-            else:
-                data['version'] = 40
-                
         data['enable_file_log'] = bool('true')
-        data['backend_threading'] = 'Auto'
+        if system.isOptSet('backend_threading'):
+            data['backend_threading'] = system.config["backend_threading"]
+        else:
+            data['backend_threading'] = 'Auto'
 
         if system.isOptSet('res_scale'):
             data['res_scale'] = int(system.config["res_scale"])
@@ -321,86 +320,12 @@ class RyujinxMainlineGenerator(Generator):
                 eslog.debug("=====================================================End Bato Controller Debug Info===========================================================")
                 eslog.debug("")
 
-            import sdl2
-            from sdl2 import (
-                SDL_TRUE
-            )
-            from sdl2 import joystick
-            from ctypes import create_string_buffer
-            sdl2.SDL_ClearError()
-            sdl2.SDL_SetHint(b"SDL_JOYSTICK_ALLOW_BACKGROUND_EVENTS", b"1")
-            ret = sdl2.SDL_Init(sdl2.SDL_INIT_VIDEO | sdl2.SDL_INIT_GAMECONTROLLER)
-            assert ret == 0, _check_error_msg()
-
             input_config = []
 
-              
-
-            sdl_devices = []
-            count = joystick.SDL_NumJoysticks()
-
-            if debugcontrollers:
-                eslog.debug("=====================================================Start SDL Controller Debug Info==========================================================")
-                for i in range(count):
-                    if sdl2.SDL_IsGameController(i) == SDL_TRUE:
-                        pad = sdl2.SDL_JoystickOpen(i)
-                        cont = sdl2.SDL_GameControllerOpen(i)
-                        joy_guid = joystick.SDL_JoystickGetDeviceGUID(i)
-                        buff = create_string_buffer(33)
-                        joystick.SDL_JoystickGetGUIDString(joy_guid,buff,33)
-                        buff[2] = b'0'
-                        buff[3] = b'0'
-                        buff[4] = b'0'
-                        buff[5] = b'0'
-                        buff[6] = b'0'
-                        buff[7] = b'0'
-                        guidstring = ((bytes(buff)).decode()).split('\x00',1)[0]
-                        eslog.debug("Joystick GUID: {}".format(guidstring))                 
-                        joy_path = joystick.SDL_JoystickPathForIndex(i)
-                        eslog.debug("Joystick Path: {}".format(joy_path.decode()))
-                        eslog.debug("Joystick Type: {}".format(sdl2.SDL_JoystickGetDeviceType(i))) 
-                        pad_type = sdl2.SDL_GameControllerTypeForIndex(i)
-                        eslog.debug("Joystick Pad Type: {}".format(pad_type))                    
-                        controllername = (sdl2.SDL_GameControllerNameForIndex(i)).decode()
-                        eslog.debug("Joystick Name: {}".format(controllername))     
-
-                        eslog.debug("Joystick Vendor: {}".format(joystick.SDL_JoystickGetDeviceVendor(i)))
-                        eslog.debug("Joystick Product: {}".format(joystick.SDL_JoystickGetDeviceProduct(i)))
-                        eslog.debug("Joystick Product Version: {}".format(joystick.SDL_JoystickGetDeviceProductVersion(i)))
-
-                        sdl2.SDL_GameControllerClose(cont)
-                        sdl2.SDL_JoystickClose(pad)
-                        eslog.debug("")
-                eslog.debug("=====================================================End SDL Controller Debug Info============================================================")
-                eslog.debug("")
-
-
-            for i in range(count):
-                    if sdl2.SDL_IsGameController(i) == SDL_TRUE:
-                        pad = sdl2.SDL_GameControllerOpen(i)
-                        joy_guid = joystick.SDL_JoystickGetDeviceGUID(i)
-                        buff = create_string_buffer(33)
-                        joystick.SDL_JoystickGetGUIDString(joy_guid,buff,33)                    
-                        joy_path = joystick.SDL_JoystickPathForIndex(i)
-                        guidstring = ((bytes(buff)).decode()).split('\x00',1)[0]
-
-                        if(joy_path.decode() == 'nintendo_joycons_combined' ):
-                            outputpath = 'nintendo_joycons_combined'
-                        else:    
-                            command = "udevadm info --query=path --name=" + joy_path.decode()
-                            outputpath = (((subprocess.check_output(command, shell=True)).decode()).partition('/input/')[0]).partition('/hidraw')[0]
-                            
-                        pad_type = sdl2.SDL_GameControllerTypeForIndex(i)
-                        #Fix for Steam controller assignment
-                        controllername = (sdl2.SDL_GameControllerNameForIndex(i)).decode()
-                        if( "Steam" in controllername):
-                            pad_type = 1
-                        if("Xin-Mo Xin-Mo Dual Arcade" in controllername):
-                            pad_type = 1
-                        controller_value = {"index" : i , 'path' : outputpath, "guid" : guidstring, "type" : pad_type }
-                        sdl_devices.append(controller_value)
-                        sdl2.SDL_GameControllerClose(pad)
-            sdl2.SDL_Quit()
+            # enumerated once, bindings cached per controller
+            sdl_devices = sdlProbe.devices(debugcontrollers)
+            sdl_by_path = sdlProbe.byPath(sdl_devices)
+            playerBindings = bindingCache.load()
 
             eslog.debug("Joysticks: {}".format(sdl_devices))
             #New Logic
@@ -421,258 +346,267 @@ class RyujinxMainlineGenerator(Generator):
 
                     if(playersControllers[index].realName == 'Nintendo Switch Combined Joy-Cons'):  #works in Batocera v37
                         outputpath = "nintendo_joycons_combined"
-                        sdl_mapping = next((item for item in sdl_devices if (item["path"] == outputpath or item["path"] == '/devices/virtual')),None)
+                        sdl_mapping = sdl_by_path.get(outputpath) or sdl_by_path.get('/devices/virtual')
                     else:
-                        command = "udevadm info --query=path --name=" + playersControllers[index].dev
-                        outputpath = ((subprocess.check_output(command, shell=True)).decode()).partition('/input/')[0]
-                        sdl_mapping = next((item for item in sdl_devices if item["path"] == outputpath),None)
+                        outputpath = sysfsPaths.devpath(playersControllers[index].dev).partition('/input/')[0]
+                        sdl_mapping = sdl_by_path.get(outputpath)
 
                     eslog.debug("Mapping: {}".format(sdl_mapping))
                     
-                    myid = uuid.UUID(sdl_mapping['guid'])
+                    myid = uuid.UUID(sdl_mapping['full_guid'])
                     myid.bytes_le
                     convuuid = uuid.UUID(bytes=myid.bytes_le)
                     controllernumber = str(sdl_mapping['index'])
                     #Map Keys and GUIDs
-                    cvalue = {}
-    
-
-                    motion = {}
-                    motion['motion_backend'] = "GamepadDriver"
-                    motion['sensitivity'] = 100
-                    motion['gyro_deadzone'] = 1
-
-                    motion['enable_motion'] = bool('true')
-
-                    rumble = {}
-                    rumble['strong_rumble'] = 1
-                    rumble['weak_rumble'] = 1
-                    if system.isOptSet("ryu_enable_rumble"):
-                        rumble['enable_rumble'] = bool(int(system.config["ryu_enable_rumble"]))
-                    else:
-                        rumble['enable_rumble'] = bool('true')
-                    
                     which_pad = "p" + str(int(controller.player)) + "_pad"
 
-                    if ((system.isOptSet(which_pad) and ((system.config[which_pad] == "ProController") or (system.config[which_pad] == "JoyconPair")) ) or not system.isOptSet(which_pad)):
-                        left_joycon_stick = {}
-                        left_joycon_stick['joystick'] = "Left"
-                        left_joycon_stick['rotate90_cw'] = bool(0)
-                        left_joycon_stick['invert_stick_x'] = bool(0)
-                        left_joycon_stick['invert_stick_y'] = bool(0)
-                        left_joycon_stick['stick_button'] = "LeftStick"            
-
-                        right_joycon_stick = {}
-                        right_joycon_stick['joystick'] = "Right"
-                        right_joycon_stick['rotate90_cw'] = bool(0)
-                        right_joycon_stick['invert_stick_x'] = bool(0)
-                        right_joycon_stick['invert_stick_y'] = bool(0)
-                        right_joycon_stick['stick_button'] = "RightStick" 
-
-
-
-                        left_joycon = {}
-                        left_joycon['button_minus'] = "Minus"
-                        left_joycon['button_l'] = "LeftShoulder"
-                        left_joycon['button_zl'] = "LeftTrigger"
-                        left_joycon['button_sl'] = "Unbound"
-                        left_joycon['button_sr'] = "Unbound"
-                        left_joycon['dpad_up'] = "DpadUp"
-                        left_joycon['dpad_down'] = "DpadDown"
-                        left_joycon['dpad_left'] = "DpadLeft"
-                        left_joycon['dpad_right'] = "DpadRight"
-
-
-                        right_joycon = {}
-                        right_joycon['button_plus'] = "Plus"
-                        right_joycon['button_r'] = "RightShoulder"
-                        right_joycon['button_zr'] = "RightTrigger"
-                        right_joycon['button_sl'] = "Unbound"
-                        right_joycon['button_sr'] = "Unbound"
-
-                        if (sdl_mapping['type'] == 0) or (sdl_mapping['type'] == 5) or (sdl_mapping['type'] >= 11):
-                            right_joycon['button_x'] = "X"
-                            right_joycon['button_b'] = "B"
-                            right_joycon['button_y'] = "Y"
-                            right_joycon['button_a'] = "A" 
+                    # the entry depends on the pad type of the controller and the options, the player index and the id are patched
+                    bindingKey = ("ryujinx", sdl_mapping['type'],
+                        system.config[which_pad] if system.isOptSet(which_pad) else None,
+                        system.config["p1_pad"] if system.isOptSet("p1_pad") else None,
+                        system.config["ryu_enable_rumble"] if system.isOptSet("ryu_enable_rumble") else None)
+                    cached = playerBindings.get(bindingKey)
+                    if cached is None:
+                        cvalue = {}
+
+                        motion = {}
+                        motion['motion_backend'] = "GamepadDriver"
+                        motion['sensitivity'] = 100
+                        motion['gyro_deadzone'] = 1
+
+                        motion['enable_motion'] = bool('true')
+
+                        rumble = {}
+                        rumble['strong_rumble'] = 1
+                        rumble['weak_rumble'] = 1
+                        if system.isOptSet("ryu_enable_rumble"):
+                            rumble['enable_rumble'] = bool(int(system.config["ryu_enable_rumble"]))
                         else:
-                            right_joycon['button_x'] = "Y"
-                            right_joycon['button_b'] = "A"
-                            right_joycon['button_y'] = "X"
-                            right_joycon['button_a'] = "B" 
-
-                        if system.isOptSet(which_pad):
-                            cvalue['controller_type'] = system.config["p1_pad"]
-                        else: 
+                            rumble['enable_rumble'] = bool('true')
+
+                        if ((system.isOptSet(which_pad) and ((system.config[which_pad] == "ProController") or (system.config[which_pad] == "JoyconPair")) ) or not system.isOptSet(which_pad)):
+                            left_joycon_stick = {}
+                            left_joycon_stick['joystick'] = "Left"
+                            left_joycon_stick['rotate90_cw'] = bool(0)
+                            left_joycon_stick['invert_stick_x'] = bool(0)
+                            left_joycon_stick['invert_stick_y'] = bool(0)
+                            left_joycon_stick['stick_button'] = "LeftStick"
+
+                            right_joycon_stick = {}
+                            right_joycon_stick['joystick'] = "Right"
+                            right_joycon_stick['rotate90_cw'] = bool(0)
+                            right_joycon_stick['invert_stick_x'] = bool(0)
+                            right_joycon_stick['invert_stick_y'] = bool(0)
+                            right_joycon_stick['stick_button'] = "RightStick"
+
+
+
+                            left_joycon = {}
+                            left_joycon['button_minus'] = "Minus"
+                            left_joycon['button_l'] = "LeftShoulder"
+                            left_joycon['button_zl'] = "LeftTrigger"
+                            left_joycon['button_sl'] = "Unbound"
+                            left_joycon['button_sr'] = "Unbound"
+                            left_joycon['dpad_up'] = "DpadUp"
+                            left_joycon['dpad_down'] = "DpadDown"
+                            left_joycon['dpad_left'] = "DpadLeft"
+                            left_joycon['dpad_right'] = "DpadRight"
+
+
+                            right_joycon = {}
+                            right_joycon['button_plus'] = "Plus"
+                            right_joycon['button_r'] = "RightShoulder"
+                            right_joycon['button_zr'] = "RightTrigger"
+                            right_joycon['button_sl'] = "Unbound"
+                            right_joycon['button_sr'] = "Unbound"
+
+                            if (sdl_mapping['type'] == 0) or (sdl_mapping['type'] == 5) or (sdl_mapping['type'] >= 11):
+                                right_joycon['button_x'] = "X"
+                                right_joycon['button_b'] = "B"
+                                right_joycon['button_y'] = "Y"
+                                right_joycon['button_a'] = "A"
+                            else:
+                                right_joycon['button_x'] = "Y"
+                                right_joycon['button_b'] = "A"
+                                right_joycon['button_y'] = "X"
+                                right_joycon['button_a'] = "B"
+
+                            if system.isOptSet(which_pad):
+                                cvalue['controller_type'] = system.config["p1_pad"]
+                            else:
+                                cvalue['controller_type'] = "ProController"
+
+                        elif (system.isOptSet(which_pad) and (system.config[which_pad] == "JoyconLeft")):
+                            left_joycon_stick = {}
+                            left_joycon_stick['joystick'] = "Left"
+                            left_joycon_stick['rotate90_cw'] = bool(0)
+                            left_joycon_stick['invert_stick_x'] = bool(0)
+                            left_joycon_stick['invert_stick_y'] = bool(0)
+                            left_joycon_stick['stick_button'] = "LeftStick"
+
+                            right_joycon_stick = {}
+                            right_joycon_stick['joystick'] = "Unbound"
+                            right_joycon_stick['rotate90_cw'] = bool(0)
+                            right_joycon_stick['invert_stick_x'] = bool(0)
+                            right_joycon_stick['invert_stick_y'] = bool(0)
+                            right_joycon_stick['stick_button'] = "Unbound"
+
+                            left_joycon = {}
+                            left_joycon['button_minus'] = "Minus"
+                            left_joycon['button_l'] = "LeftShoulder"
+                            left_joycon['button_zl'] = "LeftTrigger"
+                            left_joycon['button_sl'] = "LeftShoulder"
+                            left_joycon['button_sr'] = "RightShoulder"
+
+                            if (sdl_mapping['type'] == 0) or (sdl_mapping['type'] == 5) or (sdl_mapping['type'] >= 11):
+                                left_joycon['dpad_up'] = "Y"
+                                left_joycon['dpad_down'] = "A"
+                                left_joycon['dpad_left'] = "X"
+                                left_joycon['dpad_right'] = "B"
+                            else:
+                                left_joycon['dpad_up'] = "Y"
+                                left_joycon['dpad_down'] = "A"
+                                left_joycon['dpad_left'] = "X"
+                                left_joycon['dpad_right'] = "B"
+
+                            right_joycon = {}
+                            right_joycon['button_plus'] = "Plus"
+                            right_joycon['button_r'] = "RightShoulder"
+                            right_joycon['button_zr'] = "RightTrigger"
+                            right_joycon['button_sl'] = "Unbound"
+                            right_joycon['button_sr'] = "Unbound"
+
+                            if (sdl_mapping['type'] == 0) or (sdl_mapping['type'] == 5) or (sdl_mapping['type'] >= 11):
+                                right_joycon['button_x'] = "X"
+                                right_joycon['button_b'] = "B"
+                                right_joycon['button_y'] = "Y"
+                                right_joycon['button_a'] = "A"
+                            else:
+                                right_joycon['button_x'] = "Y"
+                                right_joycon['button_b'] = "A"
+                                right_joycon['button_y'] = "X"
+                                right_joycon['button_a'] = "B"
+
+                            cvalue['controller_type'] = "JoyconLeft"
+
+                        elif (system.isOptSet(which_pad) and (system.config[which_pad] == "JoyconRight")):
+                            left_joycon_stick = {}
+                            left_joycon_stick['joystick'] = "Unbound"
+                            left_joycon_stick['rotate90_cw'] = bool(1)
+                            left_joycon_stick['invert_stick_x'] = bool(1)
+                            left_joycon_stick['invert_stick_y'] = bool(1)
+                            left_joycon_stick['stick_button'] = "Unbound"
+
+                            right_joycon_stick = {}
+                            right_joycon_stick['joystick'] = "Left"
+                            right_joycon_stick['rotate90_cw'] = bool(0)
+                            right_joycon_stick['invert_stick_x'] = bool(0)
+                            right_joycon_stick['invert_stick_y'] = bool(0)
+                            right_joycon_stick['stick_button'] = "LeftStick"
+
+                            left_joycon = {}
+                            left_joycon['button_minus'] = "Minus"
+                            left_joycon['button_l'] = "LeftShoulder"
+                            left_joycon['button_zl'] = "LeftTrigger"
+                            left_joycon['button_sl'] = "Unbound"
+                            left_joycon['button_sr'] = "Unbound"
+
+                            left_joycon['dpad_up'] = "DpadUp"
+                            left_joycon['dpad_down'] = "DpadDown"
+                            left_joycon['dpad_left'] = "DpadLeft"
+                            left_joycon['dpad_right'] = "DpadRight"
+
+                            right_joycon = {}
+                            right_joycon['button_plus'] = "Plus"
+                            right_joycon['button_r'] = "RightShoulder"
+                            right_joycon['button_zr'] = "RightTrigger"
+                            right_joycon['button_sl'] = "LeftShoulder"
+                            right_joycon['button_sr'] = "RightShoulder"
+
+                            if (sdl_mapping['type'] == 0) or (sdl_mapping['type'] == 5) or (sdl_mapping['type'] >= 11):
+                                right_joycon['button_x'] = "A"
+                                right_joycon['button_b'] = "Y"
+                                right_joycon['button_y'] = "X"
+                                right_joycon['button_a'] = "B"
+                            else:
+                                right_joycon['button_x'] = "B"
+                                right_joycon['button_b'] = "X"
+                                right_joycon['button_y'] = "Y"
+                                right_joycon['button_a'] = "A"
+                            cvalue['controller_type'] = "JoyconRight"
+                        else:
+                            #Handle old settings that don't match above
+                            left_joycon_stick = {}
+                            left_joycon_stick['joystick'] = "Left"
+                            left_joycon_stick['rotate90_cw'] = bool(0)
+                            left_joycon_stick['invert_stick_x'] = bool(0)
+                            left_joycon_stick['invert_stick_y'] = bool(0)
+                            left_joycon_stick['stick_button'] = "LeftStick"
+
+                            right_joycon_stick = {}
+                            right_joycon_stick['joystick'] = "Right"
+                            right_joycon_stick['rotate90_cw'] = bool(0)
+                            right_joycon_stick['invert_stick_x'] = bool(0)
+                            right_joycon_stick['invert_stick_y'] = bool(0)
+                            right_joycon_stick['stick_button'] = "RightStick"
+
+
+
+                            left_joycon = {}
+                            left_joycon['button_minus'] = "Minus"
+                            left_joycon['button_l'] = "LeftShoulder"
+                            left_joycon['button_zl'] = "LeftTrigger"
+                            left_joycon['button_sl'] = "Unbound"
+                            left_joycon['button_sr'] = "Unbound"
+                            left_joycon['dpad_up'] = "DpadUp"
+                            left_joycon['dpad_down'] = "DpadDown"
+                            left_joycon['dpad_left'] = "DpadLeft"
+                            left_joycon['dpad_right'] = "DpadRight"
+
+
+                            right_joycon = {}
+                            right_joycon['button_plus'] = "Plus"
+                            right_joycon['button_r'] = "RightShoulder"
+                            right_joycon['button_zr'] = "RightTrigger"
+                            right_joycon['button_sl'] = "Unbound"
+                            right_joycon['button_sr'] = "Unbound"
+
+                            if (sdl_mapping['type'] == 0) or (sdl_mapping['type'] == 5) or (sdl_mapping['type'] >= 11):
+                                right_joycon['button_x'] = "X"
+                                right_joycon['button_b'] = "B"
+                                right_joycon['button_y'] = "Y"
+                                right_joycon['button_a'] = "A"
+                            else:
+                                right_joycon['button_x'] = "Y"
+                                right_joycon['button_b'] = "A"
+                                right_joycon['button_y'] = "X"
+                                right_joycon['button_a'] = "B"
+
                             cvalue['controller_type'] = "ProController"
 
-                    elif (system.isOptSet(which_pad) and (system.config[which_pad] == "JoyconLeft")):
-                        left_joycon_stick = {}
-                        left_joycon_stick['joystick'] = "Left"
-                        left_joycon_stick['rotate90_cw'] = bool(0)
-                        left_joycon_stick['invert_stick_x'] = bool(0)
-                        left_joycon_stick['invert_stick_y'] = bool(0)
-                        left_joycon_stick['stick_button'] = "LeftStick"            
-
-                        right_joycon_stick = {}
-                        right_joycon_stick['joystick'] = "Unbound"
-                        right_joycon_stick['rotate90_cw'] = bool(0)
-                        right_joycon_stick['invert_stick_x'] = bool(0)
-                        right_joycon_stick['invert_stick_y'] = bool(0)
-                        right_joycon_stick['stick_button'] = "Unbound"
-
-                        left_joycon = {}
-                        left_joycon['button_minus'] = "Minus"
-                        left_joycon['button_l'] = "LeftShoulder"
-                        left_joycon['button_zl'] = "LeftTrigger"
-                        left_joycon['button_sl'] = "LeftShoulder"
-                        left_joycon['button_sr'] = "RightShoulder"
-
-                        if (sdl_mapping['type'] == 0) or (sdl_mapping['type'] == 5) or (sdl_mapping['type'] >= 11):
-                            left_joycon['dpad_up'] = "Y"
-                            left_joycon['dpad_down'] = "A"
-                            left_joycon['dpad_left'] = "X"
-                            left_joycon['dpad_right'] = "B"
-                        else:
-                            left_joycon['dpad_up'] = "Y"
-                            left_joycon['dpad_down'] = "A"
-                            left_joycon['dpad_left'] = "X"
-                            left_joycon['dpad_right'] = "B"                        
-
-                        right_joycon = {}
-                        right_joycon['button_plus'] = "Plus"
-                        right_joycon['button_r'] = "RightShoulder"
-                        right_joycon['button_zr'] = "RightTrigger"
-                        right_joycon['button_sl'] = "Unbound"
-                        right_joycon['button_sr'] = "Unbound"
-
-                        if (sdl_mapping['type'] == 0) or (sdl_mapping['type'] == 5) or (sdl_mapping['type'] >= 11):
-                            right_joycon['button_x'] = "X"
-                            right_joycon['button_b'] = "B"
-                            right_joycon['button_y'] = "Y"
-                            right_joycon['button_a'] = "A"                         
-                        else:
-                            right_joycon['button_x'] = "Y"
-                            right_joycon['button_b'] = "A"
-                            right_joycon['button_y'] = "X"
-                            right_joycon['button_a'] = "B" 
-
-                        cvalue['controller_type'] = "JoyconLeft"
-                        
-                    elif (system.isOptSet(which_pad) and (system.config[which_pad] == "JoyconRight")):
-                        left_joycon_stick = {}
-                        left_joycon_stick['joystick'] = "Unbound"
-                        left_joycon_stick['rotate90_cw'] = bool(1)
-                        left_joycon_stick['invert_stick_x'] = bool(1)
-                        left_joycon_stick['invert_stick_y'] = bool(1)
-                        left_joycon_stick['stick_button'] = "Unbound"           
-
-                        right_joycon_stick = {}
-                        right_joycon_stick['joystick'] = "Left"
-                        right_joycon_stick['rotate90_cw'] = bool(0)
-                        right_joycon_stick['invert_stick_x'] = bool(0)
-                        right_joycon_stick['invert_stick_y'] = bool(0)
-                        right_joycon_stick['stick_button'] = "LeftStick" 
-
-                        left_joycon = {}
-                        left_joycon['button_minus'] = "Minus"
-                        left_joycon['button_l'] = "LeftShoulder"
-                        left_joycon['button_zl'] = "LeftTrigger"
-                        left_joycon['button_sl'] = "Unbound"
-                        left_joycon['button_sr'] = "Unbound"
-
-                        left_joycon['dpad_up'] = "DpadUp"
-                        left_joycon['dpad_down'] = "DpadDown"
-                        left_joycon['dpad_left'] = "DpadLeft"
-                        left_joycon['dpad_right'] = "DpadRight"
-
-                        right_joycon = {}
-                        right_joycon['button_plus'] = "Plus"
-                        right_joycon['button_r'] = "RightShoulder"
-                        right_joycon['button_zr'] = "RightTrigger"
-                        right_joycon['button_sl'] = "LeftShoulder"
-                        right_joycon['button_sr'] = "RightShoulder"
-
-                        if (sdl_mapping['type'] == 0) or (sdl_mapping['type'] == 5) or (sdl_mapping['type'] >= 11):
-                            right_joycon['button_x'] = "A"
-                            right_joycon['button_b'] = "Y"
-                            right_joycon['button_y'] = "X"
-                            right_joycon['button_a'] = "B" 
-                        else:
-                            right_joycon['button_x'] = "B"
-                            right_joycon['button_b'] = "X"
-                            right_joycon['button_y'] = "Y"
-                            right_joycon['button_a'] = "A"                         
-                        cvalue['controller_type'] = "JoyconRight"
+                        cvalue['left_joycon_stick'] = left_joycon_stick
+                        cvalue['right_joycon_stick'] = right_joycon_stick
+                        cvalue['deadzone_left'] = 0.1
+                        cvalue['deadzone_right'] = 0.1
+                        cvalue['range_left'] = 1
+                        cvalue['range_right'] = 1
+                        cvalue['trigger_threshold'] = 0.5
+                        cvalue['motion'] = motion
+                        cvalue['rumble'] = rumble
+                        cvalue['left_joycon'] = left_joycon
+                        cvalue['right_joycon'] = right_joycon
+
+                        cvalue['version'] = 1
+                        cvalue['backend'] = "GamepadSDL2"
+                        playerBindings.put(bindingKey, dict(cvalue))
                     else:
-                        #Handle old settings that don't match above
-                        left_joycon_stick = {}
-                        left_joycon_stick['joystick'] = "Left"
-                        left_joycon_stick['rotate90_cw'] = bool(0)
-                        left_joycon_stick['invert_stick_x'] = bool(0)
-                        left_joycon_stick['invert_stick_y'] = bool(0)
-                        left_joycon_stick['stick_button'] = "LeftStick"            
-
-                        right_joycon_stick = {}
-                        right_joycon_stick['joystick'] = "Right"
-                        right_joycon_stick['rotate90_cw'] = bool(0)
-                        right_joycon_stick['invert_stick_x'] = bool(0)
-                        right_joycon_stick['invert_stick_y'] = bool(0)
-                        right_joycon_stick['stick_button'] = "RightStick" 
-
-
-
-                        left_joycon = {}
-                        left_joycon['button_minus'] = "Minus"
-                        left_joycon['button_l'] = "LeftShoulder"
-                        left_joycon['button_zl'] = "LeftTrigger"
-                        left_joycon['button_sl'] = "Unbound"
-                        left_joycon['button_sr'] = "Unbound"
-                        left_joycon['dpad_up'] = "DpadUp"
-                        left_joycon['dpad_down'] = "DpadDown"
-                        left_joycon['dpad_left'] = "DpadLeft"
-                        left_joycon['dpad_right'] = "DpadRight"
-
-
-                        right_joycon = {}
-                        right_joycon['button_plus'] = "Plus"
-                        right_joycon['button_r'] = "RightShoulder"
-                        right_joycon['button_zr'] = "RightTrigger"
-                        right_joycon['button_sl'] = "Unbound"
-                        right_joycon['button_sr'] = "Unbound"
-
-                        if (sdl_mapping['type'] == 0) or (sdl_mapping['type'] == 5) or (sdl_mapping['type'] >= 11):
-                            right_joycon['button_x'] = "X"
-                            right_joycon['button_b'] = "B"
-                            right_joycon['button_y'] = "Y"
-                            right_joycon['button_a'] = "A" 
-                        else:
-                            right_joycon['button_x'] = "Y"
-                            right_joycon['button_b'] = "A"
-                            right_joycon['button_y'] = "X"
-                            right_joycon['button_a'] = "B" 
-
-                        cvalue['controller_type'] = "ProController"
-
-                    cvalue['left_joycon_stick'] = left_joycon_stick          
-                    cvalue['right_joycon_stick'] = right_joycon_stick
-                    cvalue['deadzone_left'] = 0.1           
-                    cvalue['deadzone_right'] = 0.1 
-                    cvalue['range_left'] = 1          
-                    cvalue['range_right'] = 1 
-                    cvalue['trigger_threshold'] = 0.5  
-                    cvalue['motion'] = motion
-                    cvalue['rumble'] = rumble
-                    cvalue['left_joycon'] = left_joycon
-                    cvalue['right_joycon'] = right_joycon
-
-                    cvalue['version'] = 1
-                    cvalue['backend'] = "GamepadSDL2"
+                        cvalue = dict(cached)
                     cvalue['id'] = controllernumber + '-' + str(convuuid)
                     
                     cvalue['player_index'] = "Player" +  str(int(controller.player))
                     input_config.append(cvalue)
             
+            playerBindings.save()
             data['input_config'] = input_config
 
         #Resolution Scale
@@ -719,11 +653,13 @@ class RyujinxMainlineGenerator(Generator):
         # It's problematic in case of hybrid laptop as it may always default to the igpu instead of the dgpu
         # data['preferred_gpu'] = ""
 
-        with open(batoceraFiles.CONF + '/Ryujinx/BeforeRyu.json', "w") as outfile:
-            outfile.write(json.dumps(data, indent=2))
-
-        with open(RyujinxConfigFile, "w") as outfile:
-            outfile.write(json.dumps(data, indent=2))
+        delta = data.delta()
+        if delta:
+            eslog.debug("Config.json changes: {}".format(", ".join(delta)))
+            configCache.write(RyujinxConfigFile, beforeConfigFile, jsonConfig.dumps(data), configKey)
+        else:
+            eslog.debug(f"{RyujinxConfigFile} has nothing to change")
+            configCache.keep(RyujinxConfigFile, beforeConfigFile, configKey)
 
 
 def getLangFromEnvironment():
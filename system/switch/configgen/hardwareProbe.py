@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import os
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Final
+
+import cacheFiles
+
+eslog = logging.getLogger(__name__)
+
+# the machine, read once per boot: cpu, memory, gpus and vulkan drivers. it selects a performance tier,
+# which gives the default of some options of the emulators. any setting of batocera.conf wins over them,
+# switch.hardware_presets=0 disables them.
+# root allows to probe a copy of /proc and /sys (a recorded machine)
+CACHE_FILE: Final = cacheFiles.RUN_DIR + '/hardware.pickle'
+# bump when HardwareInfo or the probing changes
+PROBE_VERSION: Final = 1
+
+VENDOR_AMD: Final = "0x1002"
+VENDOR_INTEL: Final = "0x8086"
+VENDOR_NVIDIA: Final = "0x10de"
+
+TIER_LOW: Final = "low"
+TIER_MID: Final = "mid"
+TIER_HIGH: Final = "high"
+
+# batocera.conf options per tier, with the values of es_features_switch.cfg. ryujinx only: the yuzu family writes
+# a "\default" flag next to each setting, and the emulators ignore the value while it is true. a preset would
+# have to mark the option as changed by the user, so the options left unset keep the defaults of the emulator
+PRESETS: Final = {
+    TIER_LOW: {
+        "ryu_resolution_scale": "1.0",      # native
+        "max_anisotropy": "-1",             # auto
+        "ryu_texture_recompression": "1",   # less vram
+    },
+    TIER_MID: {
+        "ryu_resolution_scale": "1.0",
+        "max_anisotropy": "-1",
+        "ryu_texture_recompression": "0",
+    },
+    TIER_HIGH: {
+        "ryu_resolution_scale": "2.0",
+        "max_anisotropy": "8",
+        "ryu_texture_recompression": "0",
+    },
+}
+
+@dataclass(slots=True)
+class GpuInfo:
+    card: str
+    vendor: str
+    driver: str = ""
+    vramMiB: int = 0
+    bootVga: bool = False
+
+@dataclass(slots=True)
+class HardwareInfo:
+    cpuModel: str = ""
+    cpuThreads: int = 0
+    memTotalMiB: int = 0
+    gpus: list[GpuInfo] = field(default_factory=list)
+    vulkanIcds: list[str] = field(default_factory=list)
+
+    @property
+    def vendors(self) -> set[str]:
+        return { gpu.vendor for gpu in self.gpus }
+
+    @property
+    def discrete(self) -> GpuInfo | None:
+        # amd cards with dedicated memory and nvidia cards. an amd apu reports a small carve out as vram
+        for gpu in self.gpus:
+            if gpu.vendor == VENDOR_NVIDIA or (gpu.vendor == VENDOR_AMD and gpu.vramMiB >= 2048):
+                return gpu
+        return None
+
+def _read(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return ""
+
+def _probeCpu(root: str, info: HardwareInfo) -> None:
+    for line in _read(root + "/proc/cpuinfo").splitlines():
+        key, _, value = line.partition(":")
+        key = key.strip()
+        if key == "processor":
+            info.cpuThreads += 1
+        elif key == "model name" and not info.cpuModel:
+            info.cpuModel = value.strip()
+
+def _probeMemory(root: str, info: HardwareInfo) -> None:
+    for line in _read(root + "/proc/meminfo").splitlines():
+        if line.startswith("MemTotal:"):
+            info.memTotalMiB = int(line.split()[1]) // 1024
+            return
+
+def _probeGpus(root: str, info: HardwareInfo) -> None:
+    for card in sorted(glob.glob(root + "/sys/class/drm/card[0-9]*")):
+        if "-" in os.path.basename(card): # connectors
+            continue
+        device = card + "/device"
+        vendor = _read(device + "/vendor").strip().lower()
+        if not vendor:
+            continue
+        gpu = GpuInfo(os.path.basename(card), vendor)
+        driver = device + "/driver"
+        if os.path.islink(driver):
+            gpu.driver = os.path.basename(os.readlink(driver))
+        vram = _read(device + "/mem_info_vram_total").strip()
+        if vram.isdigit():
+            gpu.vramMiB = int(vram) // (1024 * 1024)
+        gpu.bootVga = _read(device + "/boot_vga").strip() == "1"
+        info.gpus.append(gpu)
+
+def _probeVulkan(root: str, info: HardwareInfo) -> None:
+    for directory in ["/usr/share/vulkan/icd.d", "/etc/vulkan/icd.d"]:
+        for icd in sorted(glob.glob(root + directory + "/*.json")):
+            try:
+                with open(icd) as f:
+                    library = json.load(f)["ICD"]["library_path"]
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            name = os.path.basename(library)
+            if name not in info.vulkanIcds:
+                info.vulkanIcds.append(name)
+
+def probe(root: str = "") -> HardwareInfo:
+    info = HardwareInfo()
+    _probeCpu(root, info)
+    _probeMemory(root, info)
+    _probeGpus(root, info)
+    _probeVulkan(root, info)
+    return info
+
+def get(root: str = "") -> HardwareInfo:
+    # cached for the boot, the machine doesn't change under the launcher
+    if root:
+        return probe(root)
+    info = cacheFiles.load(CACHE_FILE, PROBE_VERSION)
+    if info is None:
+        info = probe()
+        eslog.debug(f"hardware: {info}")
+        cacheFiles.store(CACHE_FILE, PROBE_VERSION, info)
+    return info
+
+def tier(info: HardwareInfo) -> str:
+    if info.cpuThreads < 4 or info.memTotalMiB < 6 * 1024 or not info.gpus:
+        return TIER_LOW
+    gpu = info.discrete
+    if gpu is None:
+        # integrated graphics, sharing the memory
+        return TIER_LOW if info.memTotalMiB < 12 * 1024 else TIER_MID
+    if info.cpuThreads >= 8 and info.memTotalMiB >= 14 * 1024 and (gpu.vendor == VENDOR_NVIDIA or gpu.vramMiB >= 6 * 1024):
+        return TIER_HIGH
+    return TIER_MID
+
+def presets(info: HardwareInfo) -> dict[str, str]:
+    options = dict(PRESETS[tier(info)])
+    # a machine with few threads (or a vm) can't run the emulation threads in parallel
+    options["backend_threading"] = "Auto" if info.cpuThreads >= 4 else "Off"
+    return options
+
+def gpuEnvironment(info: HardwareInfo | None = None) -> dict[str, str]:
+    # the variables the yuzu family used to set unconditionally
+    if info is None:
+        info = get()
+    if not info.gpus:
+        # nothing probed, keep the old behaviour
+        return { "DRI_PRIME": "1", "AMD_VULKAN_ICD": "RADV" }
+    env: dict[str, str] = {}
+    # hybrid graphics: render on the other gpu, unless the discrete one is already the primary one
+    gpu = info.discrete
+    if len(info.gpus) > 1 and (gpu is None or not gpu.bootVga):
+        env["DRI_PRIME"] = "1"
+    # radv rather than amdvlk when both are installed
+    if VENDOR_AMD in info.vendors and any("radeon" in icd for icd in info.vulkanIcds):
+        env["AMD_VULKAN_ICD"] = "RADV"
+    return env
+
+if __name__ == '__main__':
+    # python hardwareProbe.py [root] : show what is probed and the options it gives
+    info = probe(sys.argv[1]) if len(sys.argv) > 1 else get()
+    print(json.dumps(asdict(info), indent=2))
+    print(f"tier: {tier(info)}")
+    print(f"presets: {presets(info)}")
+    print(f"environment: {gpuEnvironment(info)}")
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import configparser
+import io
+import re
+from pathlib import Path
+from typing import IO, Any, Final
+
+# the ini files of the emulators (qt-config.ini), read and written as configparser.RawConfigParser does it
+# with optionxform=str: same parsing, same output, byte for byte. an ordered dict per section, no
+# interpolation, no proxies, no key transformation: setting thousands of keys per launch costs little.
+# the unusual files (DEFAULT section, values on several lines, errors) are read by RawConfigParser itself.
+_SECTION: Final = re.compile(r"\[(?P<header>.+)\]")
+_COMMENTS: Final = ("#", ";")
+DEFAULT_SECTION: Final = "DEFAULT"
+
+class _Unusual(Exception):
+    pass
+
+class IniConfig:
+    __slots__ = ("defaults", "_sections")
+
+    def __init__(self) -> None:
+        self.defaults: dict[str, Any] = {}
+        self._sections: dict[str, dict[str, Any]] = {}
+
+    def read(self, path: str | Path) -> None:
+        with open(path) as f:
+            content = f.read()
+        try:
+            self._parse(content)
+        except _Unusual:
+            self._readWithConfigParser(content, str(path))
+
+    def _parse(self, content: str) -> None:
+        sections: dict[str, dict[str, Any]] = {}
+        current: dict[str, Any] | None = None
+        seen: set[Any] = set()
+        for line in content.split("\n"):
+            value = line.strip()
+            if not value or value.startswith(_COMMENTS):
+                continue
+            if line[0].isspace():
+                # a continuation line, or an indented key
+                raise _Unusual()
+            mo = _SECTION.match(value) if value[0] == "[" else None
+            if mo:
+                name = mo.group('header')
+                if name == DEFAULT_SECTION or name in seen:
+                    raise _Unusual()
+                seen.add(name)
+                current = sections.get(name)
+                if current is None:
+                    current = sections[name] = self._sections.get(name, {})
+                continue
+            # the option ends at the first delimiter, as with the option regex of configparser
+            equal = value.find("=")
+            colon = value.find(":")
+            delimiter = colon if equal < 0 or 0 <= colon < equal else equal
+            if current is None or delimiter <= 0:
+                raise _Unusual()
+            option = value[:delimiter].rstrip()
+            if (name, option) in seen:
+                raise _Unusual()
+            seen.add((name, option))
+            current[option] = value[delimiter + 1:].strip()
+        # the sections already there keep their place
+        for name, options in sections.items():
+            self._sections.setdefault(name, options)
+
+    def _readWithConfigParser(self, content: str, source: str) -> None:
+        parser = configparser.RawConfigParser()
+        parser.optionxform = str  # type: ignore[assignment]
+        for name in self._sections:
+            parser.add_section(name)
+            for option, value in self._sections[name].items():
+                parser.set(name, option, value)
+        parser.read_dict({DEFAULT_SECTION: self.defaults})
+        parser.read_string(content, source)
+        self.defaults = dict(parser.defaults())
+        self._sections = { name: dict(parser._sections[name]) for name in parser.sections() }  # type: ignore[attr-defined]
+
+    def sections(self) -> list[str]:
+        return list(self._sections)
+
+    def has_section(self, section: str) -> bool:
+        return section in self._sections
+
+    def add_section(self, section: str) -> None:
+        if section == DEFAULT_SECTION:
+            raise ValueError(f"Invalid section name: {section!r}")
+        if section in self._sections:
+            raise configparser.DuplicateSectionError(section)
+        self._sections[section] = {}
+
+    def has_option(self, section: str, option: str) -> bool:
+        return option in self._sections.get(section, ()) or option in self.defaults
+
+    def get(self, section: str, option: str) -> Any:
+        try:
+            options = self._sections[section]
+        except KeyError:
+            raise configparser.NoSectionError(section) from None
+        if option in options:
+            return options[option]
+        if option in self.defaults:
+            return self.defaults[option]
+        raise configparser.NoOptionError(option, section)
+
+    def set(self, section: str, option: str, value: Any) -> None:
+        if section == DEFAULT_SECTION:
+            self.defaults[option] = value
+            return
+        try:
+            self._sections[section][option] = value
+        except KeyError:
+            raise configparser.NoSectionError(section) from None
+
+    def section(self, section: str) -> dict[str, Any]:
+        # the options of a section, to set many of them
+        return self._sections[section]
+
+    def write(self, fp: IO[str]) -> None:
+        fp.write(self.dumps())
+
+    def dumps(self) -> str:
+        out: list[str] = []
+        if self.defaults:
+            self._dumpSection(out, DEFAULT_SECTION, self.defaults)
+        for name, options in self._sections.items():
+            self._dumpSection(out, name, options)
+        return "".join(out)
+
+    @staticmethod
+    def _dumpSection(out: list[str], name: str, options: dict[str, Any]) -> None:
+        out.append(f"[{name}]\n")
+        for key, value in options.items():
+            value = str(value)
+            if "\n" in value:
+                value = value.replace("\n", "\n\t")
+            out.append(f"{key} = {value}\n")
+        out.append("\n")
+
+def toString(config: configparser.RawConfigParser | IniConfig) -> str:
+    # the content configparser would write, for a comparison
+    out = io.StringIO()
+    config.write(out)
+    return out.getvalue()
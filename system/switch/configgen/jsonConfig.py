@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Final
+
+# the json files of the emulators (Config.json of ryujinx), patched key by key: the document keeps the value
+# each key had in the file before the generation set it, the delta is the keys whose value changed.
+# when the delta is empty the file is left as it is. the keys are set with [] (not update() or setdefault()).
+_MISSING: Final = object()
+
+def same(a: Any, b: Any) -> bool:
+    # equality of json values: True is not 1, 1 is not 1.0, the order of the keys doesn't matter
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(value, b[key]) for key, value in a.items())
+    if isinstance(a, list):
+        return len(a) == len(b) and all(map(same, a, b))
+    return a == b
+
+class JsonConfig(dict[str, Any]):
+    __slots__ = ("_original",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._original: dict[str, Any] = {}
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._original:
+            self._original[key] = self.get(key, _MISSING)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._original:
+            self._original[key] = self.get(key, _MISSING)
+        super().__delitem__(key)
+
+    def delta(self) -> list[str]:
+        # the keys set or removed since the file was read
+        return [key for key, value in self._original.items() if not same(value, self.get(key, _MISSING))]
+
+def read(path: str | Path) -> JsonConfig:
+    # an empty document when there is no file yet: everything set is in the delta
+    try:
+        with open(path, "rb") as f:
+            content = f.read()
+    except FileNotFoundError:
+        return JsonConfig()
+    return JsonConfig(json.loads(content))
+
+def dumps(data: dict[str, Any]) -> str:
+    # compact: the emulators don't need the indentation, the file is written and read faster
+    return json.dumps(data, separators=(",", ":"))
+
+if __name__ == '__main__':
+    # python jsonConfig.py Config.json [runs] : reading, the delta of a generation that changes nothing, the dumps
+    path = sys.argv[1]
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    with open(path) as f:
+        reference = json.load(f)
+
+    def unchanged() -> list[str]:
+        data = read(path)
+        for key, value in reference.items():
+            data[key] = value
+        return data.delta()
+
+    assert unchanged() == [], "a delta without changes"
+    for name, fn in [("read", lambda: read(path)), ("read + delta", unchanged),
+                     ("dumps indent=2", lambda: json.dumps(reference, indent=2)), ("dumps compact", lambda: dumps(reference))]:
+        start = time.perf_counter()
+        for _ in range(runs):
+            fn()
+        print(f"{name:15}: {(time.perf_counter() - start) * 1000 / runs:8.3f} ms")
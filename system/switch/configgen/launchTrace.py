@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+import batoceraFiles
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+eslog = logging.getLogger(__name__)
+
+# one chrome trace (chrome://tracing, ui.perfetto.dev) is written per launch, the oldest ones are removed
+TRACES_DIR = batoceraFiles.logdir + 'switchlauncher-traces'
+TRACES_KEEP = 20
+
+_origin = time.perf_counter()
+_wallclock = time.time()
+_events: list[dict[str, Any]] = []
+_opened: dict[str, list[float]] = {}
+_args: dict[str, Any] = {}
+_lock = threading.Lock()
+
+def reset() -> None:
+    # start a new trace (a worker forked from the warm launcher)
+    global _origin, _wallclock
+    _origin = time.perf_counter()
+    _wallclock = time.time()
+    with _lock:
+        _events.clear()
+    _opened.clear()
+    _args.clear()
+
+def _now() -> float:
+    # microseconds since the launcher started
+    return (time.perf_counter() - _origin) * 1000000
+
+def _add(name: str, start: float, end: float, args: dict[str, Any] | None = None) -> None:
+    event: dict[str, Any] = { "name": name, "cat": "launch", "ph": "X", "ts": round(start, 1), "dur": round(end - start, 1), "pid": os.getpid(), "tid": threading.get_native_id() }
+    if args:
+        event["args"] = args
+    with _lock:
+        _events.append(event)
+
+def begin(name: str) -> None:
+    _opened.setdefault(name, []).append(_now())
+
+def end(name: str, **args: Any) -> None:
+    starts = _opened.get(name)
+    if not starts:
+        return
+    _add(name, starts.pop(), _now(), args)
+
+@contextmanager
+def span(name: str, **args: Any) -> Iterator[None]:
+    start = _now()
+    try:
+        yield
+    finally:
+        _add(name, start, _now(), args)
+
+def instant(name: str, **args: Any) -> None:
+    ts = _now()
+    with _lock:
+        _events.append({ "name": name, "cat": "launch", "ph": "i", "s": "p", "ts": round(ts, 1), "pid": os.getpid(), "tid": threading.get_native_id(), "args": args })
+
+def record(name: str, start: float, duration: float, **args: Any) -> None:
+    # add a span measured elsewhere, start is a perf_counter() value, duration in seconds
+    startus = (start - _origin) * 1000000
+    _add(name, startus, startus + duration * 1000000, args)
+
+def setMetadata(**args: Any) -> None:
+    _args.update(args)
+
+def write() -> str | None:
+    # close the spans left open by an exception
+    for name, starts in _opened.items():
+        while starts:
+            _add(name, starts.pop(), _now(), { "unfinished": True })
+
+    with _lock:
+        events = list(_events)
+    trace = {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": { "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(_wallclock)), **{ k: str(v) for k, v in _args.items() } }
+    }
+    path = os.path.join(TRACES_DIR, "launch-{}-{}.json".format(time.strftime("%Y%m%d-%H%M%S", time.localtime(_wallclock)), os.getpid()))
+    try:
+        os.makedirs(TRACES_DIR, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        cleanup()
+    except OSError as e:
+        eslog.warning(f"unable to write the launch trace {path}: {e}")
+        return None
+    eslog.debug(f"launch trace written to {path}")
+    return path
+
+def cleanup(keep: int = TRACES_KEEP) -> None:
+    traces = sorted(f for f in os.listdir(TRACES_DIR) if f.startswith("launch-") and f.endswith(".json"))
+    for f in traces[:-keep]:
+        try:
+            os.remove(os.path.join(TRACES_DIR, f))
+        except OSError:
+            pass
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+
+# optional warm launcher.
+# python /userdata/system/switch/configgen/launcherDaemon.py & (ie from /userdata/system/custom.sh)
+# keeps the interpreter and the configgen modules loaded; switchlauncher.py hands each launch over to it
+# through a unix socket, a forked worker runs it with the client environment and stdio.
+# when the daemon is not running, switchlauncher.py runs the launch itself as before.
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import sys
+
+SOCKET_PATH = "/var/run/switchlauncher.sock"
+MAX_REQUEST = 1024 * 1024
+
+def _send(sock: socket.socket, message: dict) -> None:
+    sock.sendall(json.dumps(message).encode() + b'\n')
+
+def _readLine(sock: socket.socket, buffer: bytes = b'') -> tuple[bytes | None, bytes]:
+    while b'\n' not in buffer:
+        data = sock.recv(65536)
+        if not data:
+            return None, buffer
+        buffer += data
+        if len(buffer) > MAX_REQUEST:
+            return None, buffer
+    line, _, buffer = buffer.partition(b'\n')
+    return line, buffer
+
+### client side, keep it light: it runs before any configgen import ###
+
+def delegate(argv: list[str]) -> None:
+    # run the launch in the daemon and exit with its status. returns if the daemon is not available
+    if not os.path.exists(SOCKET_PATH):
+        return
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(SOCKET_PATH)
+        request = { "argv": argv, "env": dict(os.environ), "cwd": os.getcwd() }
+        socket.send_fds(sock, [json.dumps(request).encode() + b'\n'], [0, 1, 2])
+        line, buffer = _readLine(sock)
+        if line is None:
+            return
+        worker = json.loads(line)["pid"]
+    except (OSError, ValueError, KeyError):
+        return # daemon not usable, launch locally
+
+    # es stops the game with SIGINT/SIGTERM on the launcher: forward them to the worker
+    def forward(signum, frame):
+        try:
+            os.kill(worker, signum)
+        except OSError:
+            pass
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGTERM, forward)
+
+    exitcode = -1
+    while True:
+        try:
+            line, buffer = _readLine(sock, buffer)
+        except InterruptedError:
+            continue
+        except OSError:
+            break
+        if line is None:
+            break
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if "exit" in message:
+            exitcode = message["exit"]
+            break
+    sys.exit(exitcode)
+
+### daemon side ###
+
+def preload() -> None:
+    # everything a launch imports, except sdl2 which binds its library from PYSDL2_DLL_PATH set by each generator
+    import evdev
+    import pyudev
+    import yaml
+    import switchlauncher
+    import evmapy
+    from generators.citron import citronGenerator
+    from generators.eden import edenGenerator
+    from generators.sudachi import sudachiGenerator
+    from generators.yuzu import yuzuMainlineGenerator
+    from generators.ryujinx import ryujinxMainlineGenerator
+    # importing switchlauncher timed the imports: not in the daemon, each forked launch times its own
+    import lazyImports
+    lazyImports.uninstall()
+    lazyImports.reset()
+
+def _work(conn: socket.socket, request: dict, fds: list[int]) -> int:
+    # forked worker: become the launcher which would have been started by es
+    import launchTrace
+    import lazyImports
+    import switchlauncher
+
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    for target, fd in enumerate(fds[:3]):
+        os.dup2(fd, target)
+    for fd in fds:
+        if fd > 2:
+            os.close(fd)
+    os.environ.clear()
+    os.environ.update(request["env"])
+    os.chdir(request["cwd"])
+    sys.argv = [switchlauncher.__file__] + request["argv"]
+    launchTrace.reset()
+    lazyImports.reset()
+    lazyImports.install()
+
+    _send(conn, { "pid": os.getpid() })
+    exitcode = 1
+    try:
+        switchlauncher.launch()
+        exitcode = 0
+    except SystemExit as e:
+        if e.code is None:
+            exitcode = 0
+        elif isinstance(e.code, int):
+            exitcode = e.code
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+    try:
+        _send(conn, { "exit": exitcode })
+    except OSError:
+        pass
+    return exitcode
+
+def serve(path: str = SOCKET_PATH) -> None:
+    preload()
+
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    os.chmod(path, 0o600)
+    server.listen(8)
+    # workers are not waited for
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    print(f"switchlauncher daemon listening on {path}", flush=True)
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except InterruptedError:
+                continue
+            fds: list[int] = []
+            try:
+                data, fds, _, _ = socket.recv_fds(conn, 65536, 3)
+                line, _ = _readLine(conn, data)
+                request = json.loads(line) if line is not None else None
+            except (OSError, ValueError):
+                request = None
+            if request is None:
+                for fd in fds:
+                    os.close(fd)
+                conn.close()
+                continue
+
+            pid = os.fork()
+            if pid == 0:
+                server.close()
+                code = 1
+                try:
+                    code = _work(conn, request, fds)
+                finally:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    os._exit(code & 0xff)
+            for fd in fds:
+                os.close(fd)
+            conn.close()
+    finally:
+        server.close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+if __name__ == '__main__':
+    serve(sys.argv[1] if len(sys.argv) > 1 else SOCKET_PATH)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import builtins
+import logging
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Any
+
+eslog = logging.getLogger(__name__)
+
+# total import time (ms) above which the total is logged as a warning, the details stay at debug level
+IMPORT_BUDGET_MS = 300
+REPORT_TOP = 15
+
+_originalImport = builtins.__import__
+# (name, start, cumulative, self, depth)
+_imports: list[tuple[str, float, float, float, int]] = []
+# per thread: the tails of the emulator output and the deferred work import too
+_local = threading.local()
+
+def _stack() -> list[list[float]]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+def _timedImport(name: str, globals: Any = None, locals: Any = None, fromlist: Any = (), level: int = 0) -> ModuleType:
+    # nothing to measure for a module already loaded
+    if level == 0 and name in sys.modules:
+        return _originalImport(name, globals, locals, fromlist, level)
+    stack = _stack()
+    start = time.perf_counter()
+    stack.append([0.0])
+    try:
+        return _originalImport(name, globals, locals, fromlist, level)
+    finally:
+        children = stack.pop()[0]
+        cumulative = time.perf_counter() - start
+        if stack:
+            stack[-1][0] += cumulative
+        if level > 0 and globals is not None:
+            name = f"{globals.get('__package__') or ''}:{'.' * level}{name}"
+        _imports.append((name, start, cumulative, cumulative - children, len(stack)))
+
+def install() -> None:
+    # like python -X importtime, for this launch only: uninstall() once it is reported
+    builtins.__import__ = _timedImport
+
+def uninstall() -> None:
+    builtins.__import__ = _originalImport
+
+def reset() -> None:
+    _imports.clear()
+
+def report() -> None:
+    import launchTrace
+
+    roots = [imp for imp in _imports if imp[4] == 0]
+    total = sum(imp[2] for imp in roots) * 1000
+    log = eslog.warning if total > IMPORT_BUDGET_MS else eslog.debug
+    log(f"imports: {total:.1f}ms for {len(_imports)} modules (budget {IMPORT_BUDGET_MS}ms)")
+    for name, start, cumulative, selftime, depth in sorted(_imports, key=lambda imp: imp[3], reverse=True)[:REPORT_TOP]:
+        eslog.debug(f"imports: {selftime*1000:8.1f}ms self {cumulative*1000:8.1f}ms cumulative  {name}")
+    for name, start, cumulative, selftime, depth in _imports:
+        if cumulative >= 0.001:
+            launchTrace.record(f"import {name}", start, cumulative)
+
+class LazyModule(ModuleType):
+    # a module imported on its first attribute access
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazyModule"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_lazyModule"]
+        if module is None:
+            start = time.perf_counter()
+            # through __import__, so that it shows in the import report
+            builtins.__import__(self.__name__)
+            module = sys.modules[self.__name__]
+            self.__dict__["_lazyModule"] = module
+            eslog.debug(f"lazy import of {self.__name__}: {(time.perf_counter() - start)*1000:.1f}ms")
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+def lazy(name: str) -> ModuleType:
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
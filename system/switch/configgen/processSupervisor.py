@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import subprocess
+import time
+from typing import Any
+
+eslog = logging.getLogger(__name__)
+
+# time given to the remaining processes (AppImage runtime, fuse...) to exit by themselves, then after SIGTERM
+TREE_GRACE = 2.0
+TERM_GRACE = 1.0
+# time to wait for the last /dev/dri users to go away
+DRM_TIMEOUT = 2.0
+# old behavior, used when the state of the tree or of the gpu can't be determined
+FALLBACK_DELAY = 1.0
+POLL_INTERVAL = 0.02
+
+# None: nothing was spawned, True: tree gone and gpu released, False: unknown
+_released: bool | None = None
+# processes already using the gpu before the emulator started (xorg, es...)
+_drmBaseline: set[int] | None = None
+
+def spawn(array: list[str], env: dict[str, str], **kwargs: Any) -> subprocess.Popen[bytes]:
+    global _released, _drmBaseline
+    _released = False
+    pids = listPids()
+    users = drmUsers(pids) if pids is not None else None
+    _drmBaseline = set(users) if users is not None else None
+    # own session, so that the emulator and all its children share a process group we can kill and watch
+    return subprocess.Popen(array, env=env, start_new_session=True, **kwargs)
+
+def killTree(proc: subprocess.Popen[bytes], sig: int = signal.SIGKILL) -> None:
+    try:
+        os.killpg(proc.pid, sig)
+    except ProcessLookupError:
+        pass
+    except OSError as e:
+        eslog.debug(f"unable to signal the process group {proc.pid}: {e}")
+        try:
+            proc.send_signal(sig)
+        except OSError:
+            pass
+
+def listPids() -> list[int] | None:
+    try:
+        return [int(entry) for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return None
+
+def sessionMembers(sid: int) -> list[int] | None:
+    # live (non zombie) processes of the session, None if /proc can't be read
+    members = []
+    pids = listPids()
+    if pids is None:
+        return None
+    for entry in pids:
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue # process gone meanwhile
+        # pid (comm) state ppid pgrp session ... ; comm may contain spaces and parenthesis
+        fields = stat[stat.rfind(b')')+2:].split()
+        if len(fields) < 4:
+            continue
+        if fields[0] == b'Z' or fields[0] == b'X':
+            continue
+        if int(fields[2]) == sid or int(fields[3]) == sid:
+            members.append(entry)
+    return members
+
+def drmUsers(pids: list[int]) -> list[int] | None:
+    # processes among pids having a /dev/dri node opened, None if it can't be determined
+    users = []
+    for pid in pids:
+        try:
+            fds = os.listdir(f"/proc/{pid}/fd")
+        except FileNotFoundError:
+            continue
+        except PermissionError:
+            return None
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                if os.readlink(f"/proc/{pid}/fd/{fd}").startswith("/dev/dri/"):
+                    users.append(pid)
+                    break
+            except OSError:
+                pass
+    return users
+
+def waitSession(sid: int, timeout: float) -> list[int] | None:
+    deadline = time.monotonic() + timeout
+    while True:
+        members = sessionMembers(sid)
+        if not members or time.monotonic() >= deadline:
+            return members
+        time.sleep(POLL_INTERVAL)
+
+def reap(proc: subprocess.Popen[bytes]) -> bool:
+    # the emulator itself exited, make sure nothing of its tree is left and that the gpu is released
+    global _released
+    _released = False
+    sid = proc.pid
+
+    members = waitSession(sid, TREE_GRACE)
+    if members:
+        eslog.debug(f"processes {members} still running after the emulator, terminating them")
+        killTree(proc, signal.SIGTERM)
+        members = waitSession(sid, TERM_GRACE)
+    if members:
+        eslog.debug(f"processes {members} still running after SIGTERM, killing them")
+        killTree(proc, signal.SIGKILL)
+        members = waitSession(sid, TERM_GRACE)
+    if members is None or members:
+        return False
+
+    # the tree is gone. a process which escaped from the session (daemonized helper) may still hold the gpu:
+    # wait until the only users left are the ones which were already there before the launch
+    if _drmBaseline is None:
+        return False
+    deadline = time.monotonic() + DRM_TIMEOUT
+    while True:
+        pids = listPids()
+        users = drmUsers(pids) if pids is not None else None
+        if users is None:
+            return False
+        users = [pid for pid in users if pid not in _drmBaseline and pid != os.getpid()]
+        if not users:
+            _released = True
+            return True
+        if time.monotonic() >= deadline:
+            eslog.debug(f"processes {users} are still using the gpu")
+            return False
+        time.sleep(POLL_INTERVAL)
+
+def settle() -> None:
+    # before going back to es: wait only when the gpu release could not be confirmed
+    if _released is False:
+        eslog.debug("gpu release not confirmed, waiting")
+        time.sleep(FALLBACK_DELAY) # this seems to be required so that the gpu memory is restituated and available for es
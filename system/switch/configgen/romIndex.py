@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Final
+
+import batoceraFiles
+import cacheFiles
+
+eslog = logging.getLogger(__name__)
+
+# what's inside the switch roms: title id, version and content type, read from the (unencrypted) container
+# headers of the nsp (PFS0) and xci (HFS0) files, without reading their content.
+# the index of roms/switch is persistent and refreshed by mtime/size, only new or modified roms are parsed.
+# the directories are stamped too: while none of them changed (no rom added, removed or renamed), a refresh
+# is one stat per directory. a rom rewritten in place keeps the mtime of its directory, python romIndex.py
+# refreshes the index from a full scan.
+ROMS_DIR: Final = batoceraFiles.ROMS + '/switch'
+ROM_EXTENSIONS: Final = frozenset((".nro", ".xci", ".xcz", ".nsp", ".nsz"))
+INDEX_FILE: Final = cacheFiles.CACHE_DIR + '/roms.index'
+# bump when RomInfo or the parsing changes
+INDEX_VERSION: Final = 2
+# below, the roms are parsed in the launcher process
+POOL_THRESHOLD: Final = 16
+MAX_ENTRIES: Final = 4096
+# a directory modified this recently may change again within the resolution of its mtime (2s on fat)
+RACY_NS: Final = 2_000_000_000
+
+PFS0_MAGIC: Final = b"PFS0"
+HFS0_MAGIC: Final = b"HFS0"
+XCI_MAGIC_OFFSET: Final = 0x100
+XCI_HFS0_OFFSET: Final = 0x130
+
+CONTENT_BASE: Final = "base"
+CONTENT_UPDATE: Final = "update"
+CONTENT_DLC: Final = "dlc"
+
+_TITLE_IN_NAME = re.compile(r'\[(01[0-9A-Fa-f]{14})\]')
+_VERSION_IN_NAME = re.compile(r'\[v(\d+)\]')
+_TICKET_NAME = re.compile(r'^(01[0-9A-Fa-f]{14})[0-9A-Fa-f]{16}\.tik$')
+_CNMT_ID = re.compile(rb'<Id>0x([0-9A-Fa-f]{16})</Id>')
+_CNMT_VERSION = re.compile(rb'<Version>(\d+)</Version>')
+
+@dataclass(slots=True, frozen=True)
+class RomInfo:
+    stamp: tuple[int, int]
+    # the titles of the rom (a nsp can hold a game, its update and dlcs), the first one is the main title
+    titleIds: tuple[str, ...] = ()
+    version: int | None = None
+    source: str = "none"
+
+    @property
+    def titleId(self) -> str | None:
+        return self.titleIds[0] if self.titleIds else None
+
+    @property
+    def contentType(self) -> str | None:
+        return contentType(self.titleId) if self.titleIds else None
+
+    @property
+    def baseTitleIds(self) -> frozenset[str]:
+        return frozenset(baseTitleId(titleId) for titleId in self.titleIds)
+
+def contentType(titleId: str) -> str:
+    value = int(titleId, 16)
+    if value & 0xFFF == 0:
+        return CONTENT_BASE
+    if value & 0xFFF == 0x800:
+        return CONTENT_UPDATE
+    return CONTENT_DLC
+
+def baseTitleId(titleId: str) -> str:
+    # 0100ABCD12340000 for 0100ABCD12340000, 0100ABCD12340800 (update) and 0100ABCD12341xxx (dlc)
+    value = int(titleId, 16)
+    if value & 0xFFF in (0, 0x800):
+        return f"{value & ~0xFFF:016X}"
+    return f"{(value - 0x1000) & ~0xFFF:016X}"
+
+### containers ###
+
+def _entries(buf: memoryview, offset: int) -> list[tuple[str, int, int]]:
+    # (name, absolute offset, size) of the files of the PFS0/HFS0 partition at offset
+    magic = bytes(buf[offset:offset + 4])
+    if magic == PFS0_MAGIC:
+        entrySize = 0x18
+    elif magic == HFS0_MAGIC:
+        entrySize = 0x40
+    else:
+        raise ValueError(f"no partition at {offset:#x}")
+    count, stringsSize = struct.unpack_from("<II", buf, offset + 4)
+    if count > MAX_ENTRIES:
+        raise ValueError(f"{count} files in the partition at {offset:#x}")
+    table = offset + 0x10
+    strings = table + count * entrySize
+    data = strings + stringsSize
+    names = bytes(buf[strings:data])
+    entries = []
+    for i in range(count):
+        fileOffset, fileSize, nameOffset = struct.unpack_from("<QQI", buf, table + i * entrySize)
+        end = names.find(b"\0", nameOffset)
+        name = names[nameOffset:end if end >= 0 else len(names)].decode("utf-8", "replace")
+        entries.append((name, data + fileOffset, fileSize))
+    return entries
+
+def _xciEntries(buf: memoryview) -> list[tuple[str, int, int]]:
+    if bytes(buf[XCI_MAGIC_OFFSET:XCI_MAGIC_OFFSET + 4]) != b"HEAD":
+        raise ValueError("no xci header")
+    (rootOffset,) = struct.unpack_from("<Q", buf, XCI_HFS0_OFFSET)
+    entries = []
+    for name, offset, size in _entries(buf, rootOffset):
+        if name in ("secure", "normal", "update"):
+            try:
+                entries.extend(_entries(buf, offset))
+            except ValueError:
+                pass # empty partition of trimmed dumps
+    return entries
+
+def _fromEntries(buf: memoryview, entries: list[tuple[str, int, int]]) -> tuple[list[str], int | None, str]:
+    titleIds: list[str] = []
+    version = None
+    source = "none"
+    # the cnmt.xml of the scene dumps is the most complete
+    for name, offset, size in entries:
+        if name.endswith(".cnmt.xml") and size < 1024 * 1024:
+            xml = bytes(buf[offset:offset + size])
+            match = _CNMT_ID.search(xml)
+            if match is not None:
+                titleIds.append(match.group(1).decode().upper())
+                source = "cnmt"
+                versionMatch = _CNMT_VERSION.search(xml)
+                if versionMatch is not None and version is None:
+                    version = int(versionMatch.group(1))
+    # the ticket is named after the rights id, the title id followed by the key generation
+    for name, offset, size in entries:
+        match = _TICKET_NAME.match(name)
+        if match is not None and match.group(1).upper() not in titleIds:
+            titleIds.append(match.group(1).upper())
+            if source == "none":
+                source = "ticket"
+    return titleIds, version, source
+
+def parse(path: str, stamp: tuple[int, int] | None = None) -> RomInfo:
+    if stamp is None:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+    titleIds: list[str] = []
+    version = None
+    source = "none"
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".nsp", ".nsz", ".xci", ".xcz"):
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as buf:
+                entries = _xciEntries(buf) if extension in (".xci", ".xcz") else _entries(buf, 0)
+                titleIds, version, source = _fromEntries(buf, entries)
+        except (OSError, ValueError, struct.error) as e:
+            eslog.debug(f"rom index: unable to read the header of {path}: {e}")
+
+    # xci don't have tickets, the dumping tools put the title id and version in the file name
+    name = os.path.basename(path)
+    if not titleIds:
+        titleIds = [match.upper() for match in _TITLE_IN_NAME.findall(name)]
+        if titleIds:
+            source = "name"
+    if version is None:
+        match = _VERSION_IN_NAME.search(name)
+        if match is not None:
+            version = int(match.group(1))
+
+    # main title first: the game, then its update, then the dlcs
+    order = { CONTENT_BASE: 0, CONTENT_UPDATE: 1, CONTENT_DLC: 2 }
+    titleIds.sort(key=lambda titleId: order[contentType(titleId)])
+    return RomInfo(stamp, tuple(titleIds), version, source)
+
+def _parseMany(items: list[tuple[str, tuple[int, int]]]) -> list[RomInfo]:
+    return [parse(path, stamp) for path, stamp in items]
+
+### index ###
+
+def _scanDir(path: str, found: dict[str, tuple[int, int]], dirs: dict[str, tuple[int, int] | None]) -> None:
+    try:
+        st = os.stat(path)
+        entries = list(os.scandir(path))
+    except OSError:
+        return
+    # stamped before the listing: an entry added meanwhile changes the mtime again
+    dirs[path] = None if time.time_ns() - st.st_mtime_ns < RACY_NS else (st.st_mtime_ns, st.st_ino)
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        try:
+            if entry.is_dir():
+                _scanDir(entry.path, found, dirs)
+            elif os.path.splitext(entry.name)[1].lower() in ROM_EXTENSIONS:
+                st = entry.stat()
+                found[entry.path] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+
+def scan(romsDir: str = ROMS_DIR, dirs: dict[str, tuple[int, int] | None] | None = None) -> dict[str, tuple[int, int]]:
+    # path -> (mtime, size) of the roms, deep scan like the emulators. dirs gets the stamps of the directories
+    found: dict[str, tuple[int, int]] = {}
+    _scanDir(romsDir, found, {} if dirs is None else dirs)
+    return found
+
+def _dirsUnchanged(dirs: dict[str, tuple[int, int] | None]) -> bool:
+    # a rom added, removed or renamed changes the mtime of its directory, a directory added the one of its parent
+    if not dirs:
+        return False
+    for path, stamp in dirs.items():
+        if stamp is None:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if (st.st_mtime_ns, st.st_ino) != stamp:
+            return False
+    return True
+
+_index: dict[str, RomInfo] | None = None
+_indexDirs: dict[str, tuple[int, int] | None] = {}
+_indexDir: str | None = None
+
+def load(romsDir: str = ROMS_DIR) -> dict[str, RomInfo]:
+    # the index as last refreshed, without looking at the roms
+    global _index, _indexDirs, _indexDir
+    if _index is None or _indexDir != romsDir:
+        _indexDirs, _index = cacheFiles.load(INDEX_FILE, (INDEX_VERSION, romsDir)) or ({}, {})
+        _indexDir = romsDir
+    return _index
+
+def refresh(romsDir: str = ROMS_DIR, workers: int | None = None, force: bool = False) -> dict[str, RomInfo]:
+    # parse the new and modified roms, drop the removed ones. nothing to scan when no directory changed
+    global _index, _indexDirs, _indexDir
+    old = load(romsDir)
+    if not force and _dirsUnchanged(_indexDirs):
+        return old
+    dirs: dict[str, tuple[int, int] | None] = {}
+    found = scan(romsDir, dirs)
+    index = { path: info for path, info in old.items() if found.get(path) == info.stamp }
+    todo = [(path, stamp) for path, stamp in found.items() if path not in index]
+    if len(todo) < POOL_THRESHOLD:
+        chunks = [todo]
+        results = [_parseMany(todo)]
+    else:
+        workers = workers or os.cpu_count() or 1
+        chunks = [todo[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parseMany, chunks))
+    for chunk, infos in zip(chunks, results):
+        for (path, stamp), info in zip(chunk, infos):
+            index[path] = info
+    if index != old or dirs != _indexDirs:
+        removed = sum(1 for path in old if path not in found)
+        eslog.debug(f"rom index: {len(todo)} rom(s) parsed, {removed} removed")
+        cacheFiles.store(INDEX_FILE, (INDEX_VERSION, romsDir), (dirs, index))
+    _index = index
+    _indexDirs = dirs
+    _indexDir = romsDir
+    return index
+
+def lookup(path: str, romsDir: str = ROMS_DIR) -> RomInfo | None:
+    # O(1) from the index, the rom is parsed if it isn't indexed or changed since
+    info = load(romsDir).get(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return info
+    stamp = (st.st_mtime_ns, st.st_size)
+    if info is None or info.stamp != stamp:
+        info = parse(path, stamp)
+    return info
+
+if __name__ == '__main__':
+    romsDir = sys.argv[1] if len(sys.argv) > 1 else ROMS_DIR
+    for path, info in sorted(refresh(romsDir, force=True).items()):
+        print(f"{info.titleId or '-':16} {info.contentType or '-':6} v{info.version if info.version is not None else '-':<8} {info.source:6} {path}")
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from typing import Any, Final
+
+import cacheFiles
+import envFingerprint
+import sysfsPaths
+
+eslog = logging.getLogger(__name__)
+
+# the sdl game controllers, as the emulators will see them: enumerated once per launch, for all the generators.
+# opening a controller to read its bindings is slow (bluetooth pads), the bindings are cached on disk per
+# guid, name and sdl version, a controller is only opened the first time it is seen.
+CACHE_FILE: Final = cacheFiles.CACHE_DIR + '/sdl-bindings.pickle'
+# bump when the layout of the bindings changes
+CACHE_VERSION: Final = 1
+
+# the controllers Steam and Xin-Mo report a wrong type
+FORCED_TYPES: Final = { "Steam": 1, "Xin-Mo Xin-Mo Dual Arcade": 1 }
+
+_devices: list[dict[str, Any]] | None = None
+
+def _bindings(sdl2: Any, cont: Any) -> dict[str, Any]:
+    # switch layout: a/b and x/y are swapped
+    def button(sdlButton: int, hat: bool = True) -> Any:
+        bind = sdl2.SDL_GameControllerGetBindForButton(cont, sdlButton)
+        if hat and bind.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_HAT:
+            return "hat:" + str(bind.value.hat.hat)
+        return bind.value.button
+
+    def trigger(sdlAxis: int) -> tuple[Any, Any]:
+        bind = sdl2.SDL_GameControllerGetBindForAxis(cont, sdlAxis)
+        if bind.bindType == sdl2.SDL_CONTROLLER_BINDTYPE_AXIS:
+            return "axis", bind.value.axis
+        return bind.value.button, "noaxis"
+
+    bindings: dict[str, Any] = {
+        "button_a": button(sdl2.SDL_CONTROLLER_BUTTON_B),
+        "button_b": button(sdl2.SDL_CONTROLLER_BUTTON_A),
+        "button_x": button(sdl2.SDL_CONTROLLER_BUTTON_Y),
+        "button_y": button(sdl2.SDL_CONTROLLER_BUTTON_X),
+        "button_dup": button(sdl2.SDL_CONTROLLER_BUTTON_DPAD_UP),
+        "button_ddown": button(sdl2.SDL_CONTROLLER_BUTTON_DPAD_DOWN),
+        "button_dleft": button(sdl2.SDL_CONTROLLER_BUTTON_DPAD_LEFT),
+        "button_dright": button(sdl2.SDL_CONTROLLER_BUTTON_DPAD_RIGHT),
+        "button_l": button(sdl2.SDL_CONTROLLER_BUTTON_LEFTSHOULDER),
+        "button_r": button(sdl2.SDL_CONTROLLER_BUTTON_RIGHTSHOULDER),
+    }
+    bindings["button_sl"] = bindings["button_l"]
+    bindings["button_sr"] = bindings["button_r"]
+    bindings["button_lstick"] = button(sdl2.SDL_CONTROLLER_BUTTON_LEFTSTICK, False)
+    bindings["button_rstick"] = button(sdl2.SDL_CONTROLLER_BUTTON_RIGHTSTICK, False)
+    bindings["button_minus"] = button(sdl2.SDL_CONTROLLER_BUTTON_BACK, False)
+    bindings["button_plus"] = button(sdl2.SDL_CONTROLLER_BUTTON_START, False)
+    bindings["button_home"] = button(sdl2.SDL_CONTROLLER_BUTTON_GUIDE, False)
+    bindings["button_zl"], bindings["axis_button_zl"] = trigger(sdl2.SDL_CONTROLLER_AXIS_TRIGGERLEFT)
+    bindings["button_zr"], bindings["axis_button_zr"] = trigger(sdl2.SDL_CONTROLLER_AXIS_TRIGGERRIGHT)
+    bindings["axis_lstick_x"] = sdl2.SDL_GameControllerGetBindForAxis(cont, sdl2.SDL_CONTROLLER_AXIS_LEFTX).value.axis
+    bindings["axis_rstick_x"] = sdl2.SDL_GameControllerGetBindForAxis(cont, sdl2.SDL_CONTROLLER_AXIS_RIGHTX).value.axis
+    return bindings
+
+def yuzuGuid(guid: str) -> str:
+    # the yuzu family ignores the bus and crc of the sdl guid
+    return guid[:2] + "000000" + guid[8:]
+
+def devicePath(joyPath: str) -> str:
+    # sysfs path of the device, to match the controllers of es
+    if joyPath == 'nintendo_joycons_combined':
+        return joyPath
+    return sysfsPaths.parentPath(joyPath)
+
+def byPath(devices: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    # the controllers of es are matched by path, the first sdl controller of a path wins
+    index: dict[str, dict[str, Any]] = {}
+    for device in devices:
+        index.setdefault(device["path"], device)
+    return index
+
+def _cacheKey(sdl2: Any) -> tuple[Any, ...]:
+    from ctypes import byref
+
+    version = sdl2.SDL_version()
+    sdl2.SDL_GetVersion(byref(version))
+    # the mappings given to sdl change the bindings too
+    mappings = hashlib.sha1(os.environ.get("SDL_GAMECONTROLLERCONFIG", "").encode()).hexdigest()
+    return (CACHE_VERSION, os.environ.get("PYSDL2_DLL_PATH", ""), (version.major, version.minor, version.patch), mappings)
+
+def _probe(debug: bool) -> list[dict[str, Any]]:
+    # pysdl2 looks up the system libraries when it is imported
+    with envFingerprint.systemLibraries():
+        import sdl2
+        from sdl2 import joystick
+    from ctypes import create_string_buffer
+
+    sdl2.SDL_ClearError()
+    sdl2.SDL_SetHint(b"SDL_JOYSTICK_ALLOW_BACKGROUND_EVENTS", b"1")
+    # no video, only the controllers
+    if sdl2.SDL_Init(sdl2.SDL_INIT_GAMECONTROLLER) != 0:
+        raise Exception(f"SDL_Init failed: {sdl2.SDL_GetError().decode()}")
+
+    try:
+        key = _cacheKey(sdl2)
+        cache = cacheFiles.load(CACHE_FILE, key) or {}
+        misses = 0
+
+        if debug:
+            eslog.debug("=====================================================Start SDL Controller Debug Info==========================================================")
+
+        devices = []
+        for i in range(joystick.SDL_NumJoysticks()):
+            if sdl2.SDL_IsGameController(i) != sdl2.SDL_TRUE:
+                continue
+            buff = create_string_buffer(33)
+            joystick.SDL_JoystickGetGUIDString(joystick.SDL_JoystickGetDeviceGUID(i), buff, 33)
+            guid = bytes(buff).decode().split('\x00', 1)[0]
+            joyPath = joystick.SDL_JoystickPathForIndex(i).decode()
+            name = sdl2.SDL_GameControllerNameForIndex(i).decode()
+            padType = sdl2.SDL_GameControllerTypeForIndex(i)
+
+            if debug:
+                eslog.debug("Joystick GUID: {}".format(yuzuGuid(guid)))
+                eslog.debug("Joystick Path: {}".format(joyPath))
+                eslog.debug("Joystick Type: {}".format(sdl2.SDL_JoystickGetDeviceType(i)))
+                eslog.debug("Joystick Pad Type: {}".format(padType))
+                eslog.debug("Joystick Name: {}".format(name))
+                eslog.debug("Joystick Vendor: {}".format(joystick.SDL_JoystickGetDeviceVendor(i)))
+                eslog.debug("Joystick Product: {}".format(joystick.SDL_JoystickGetDeviceProduct(i)))
+                eslog.debug("Joystick Product Version: {}".format(joystick.SDL_JoystickGetDeviceProductVersion(i)))
+                eslog.debug("")
+
+            bindings = cache.get((guid, name))
+            if bindings is None:
+                misses += 1
+                cont = sdl2.SDL_GameControllerOpen(i)
+                try:
+                    bindings = _bindings(sdl2, cont)
+                finally:
+                    sdl2.SDL_GameControllerClose(cont)
+                cache[(guid, name)] = bindings
+
+            for forced, forcedType in FORCED_TYPES.items():
+                if forced in name:
+                    padType = forcedType
+
+            device = { "index": i, "path": devicePath(joyPath), "guid": yuzuGuid(guid), "full_guid": guid, "name": name, "type": padType }
+            device.update(bindings)
+            devices.append(device)
+
+        if debug:
+            eslog.debug("=====================================================End SDL Controller Debug Info============================================================")
+            eslog.debug("")
+
+        if misses:
+            cacheFiles.store(CACHE_FILE, key, cache)
+        eslog.debug(f"sdl: {len(devices)} controllers, {misses} opened")
+    finally:
+        sdl2.SDL_Quit()
+    return devices
+
+def devices(debug: bool = False) -> list[dict[str, Any]]:
+    # a copy for each generator, they adjust the entries
+    global _devices
+    if _devices is None:
+        _devices = _probe(debug)
+    return [dict(device) for device in _devices]
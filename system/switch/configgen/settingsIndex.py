@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import configparser
+import itertools
+import logging
+from typing import TYPE_CHECKING
+
+import cacheFiles
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+eslog = logging.getLogger(__name__)
+
+# bump when the layout of the cached index changes
+INDEX_VERSION = 1
+
+def splitPrefix(key: str) -> tuple[str, str | None]:
+    # switch["my.game"].x -> (switch["my.game"], x) ; dots inside [...] don't split
+    depth = 0
+    for i, c in enumerate(key):
+        if c == '[':
+            depth += 1
+        elif c == ']':
+            if depth > 0:
+                depth -= 1
+        elif c == '.' and depth == 0:
+            return key[:i], key[i+1:]
+    if depth > 0:
+        # unbalanced brackets, split on the first dot
+        prefix, dot, rest = key.partition('.')
+        if dot:
+            return prefix, rest
+    return key, None
+
+class SettingsIndex:
+    # the batocera.conf content bucketed by the first part of the keys.
+    # load_all() gives the same result as UnixSettings.load_all() with dict lookups instead of a scan of the file
+    __slots__ = ('buckets',)
+
+    def __init__(self, buckets: dict[str, list[tuple[str, str]]]):
+        self.buckets = buckets
+
+    @staticmethod
+    def parse(settingsFile: str | Path) -> SettingsIndex:
+        # same parser and options as UnixSettings
+        config = configparser.ConfigParser(interpolation=None, strict=False)
+        config.optionxform = str
+        with open(settingsFile, encoding='utf_8_sig') as fp:
+            config.read_file(itertools.chain(['[DEFAULT]'], fp))
+
+        buckets: dict[str, list[tuple[str, str]]] = {}
+        for key, value in config.items('DEFAULT'):
+            prefix, rest = splitPrefix(key)
+            if rest:
+                buckets.setdefault(prefix, []).append((rest, value))
+        return SettingsIndex(buckets)
+
+    def load_all(self, name: str, includeName: bool = False) -> dict[str, str]:
+        prefix, rest = splitPrefix(name)
+        bucket = self.buckets.get(prefix)
+        res: dict[str, str] = {}
+        if bucket is None:
+            return res
+        keyPrefix = name + "." if includeName else ""
+        if rest is None:
+            for key, value in bucket:
+                res[keyPrefix + key] = value
+        else:
+            start = rest + "."
+            for key, value in bucket:
+                if key.startswith(start) and len(key) > len(start):
+                    res[keyPrefix + key[len(start):]] = value
+        return res
+
+def load(settingsFile: str | Path):
+    # the index from the cache if batocera.conf didn't change, else parse it once and cache it.
+    # if the file can't be indexed, fall back on UnixSettings which reports errors as before
+    stamp = cacheFiles.fileStamp(settingsFile)
+    if stamp is not None:
+        key = (INDEX_VERSION, str(settingsFile), stamp)
+        cachePath = cacheFiles.RUN_DIR + "/batocera.conf.index"
+        buckets = cacheFiles.load(cachePath, key)
+        if buckets is not None:
+            return SettingsIndex(buckets)
+        try:
+            index = SettingsIndex.parse(settingsFile)
+        except Exception as e:
+            eslog.debug(f"unable to index {settingsFile}: {e}")
+        else:
+            cacheFiles.store(cachePath, key, index.buckets)
+            return index
+
+    from configgen.settings.unixSettings import UnixSettings
+    return UnixSettings(settingsFile)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import re
+import subprocess
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+eslog = logging.getLogger(__name__)
+
+# squashfs roms stay mounted after the game, so that a relaunch finds them mounted with a warm page cache.
+# the least recently used ones not in use are unmounted above these limits
+MOUNT_ROOT = "/var/run/squashfs"
+MAX_MOUNTED = 3
+MAX_MOUNTED_BYTES = 32 * 1024 * 1024 * 1024
+
+STATE_FILE = MOUNT_ROOT + "/.mounts.json"
+LOCK_FILE = MOUNT_ROOT + "/.lock"
+
+@contextmanager
+def _locked() -> Iterator[None]:
+    # several launchers (or a launcher and its previous crashed instance) must not mount/umount concurrently
+    os.makedirs(MOUNT_ROOT, exist_ok=True)
+    with open(LOCK_FILE, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+def _unescape(path: str) -> str:
+    # mountinfo escapes spaces, tabs, newlines and backslashes as \ooo
+    return re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), path)
+
+def _mounted() -> dict[str, str]:
+    # mountpoint -> source of the mounts under MOUNT_ROOT
+    mounts: dict[str, str] = {}
+    with open("/proc/self/mountinfo") as f:
+        for line in f:
+            fields, _, rest = line.partition(" - ")
+            fields = fields.split()
+            mountpoint = _unescape(fields[4])
+            if mountpoint.startswith(MOUNT_ROOT + "/"):
+                sources = rest.split()
+                mounts[mountpoint] = _unescape(sources[1]) if len(sources) > 1 else ""
+    return mounts
+
+def _backingFile(source: str) -> str | None:
+    # image mounted through a loop device, None if it can't be determined
+    if not source.startswith("/dev/loop"):
+        return None
+    try:
+        with open(f"/sys/block/{os.path.basename(source)}/loop/backing_file") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def _loadState() -> dict[str, dict[str, Any]]:
+    try:
+        with open(STATE_FILE) as f:
+            state = json.load(f)
+        if isinstance(state, dict):
+            return state
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        eslog.warning(f"squashfs: ignoring the state {STATE_FILE}: {e}")
+    return {}
+
+def _saveState(state: dict[str, dict[str, Any]]) -> None:
+    tmp = STATE_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, STATE_FILE)
+
+def _umount(mountpoint: str) -> bool:
+    if subprocess.call(["umount", mountpoint]) != 0:
+        eslog.debug(f"squashfs: unmounting {mountpoint} failed")
+        return False
+    try:
+        os.rmdir(mountpoint)
+    except OSError:
+        pass
+    return True
+
+def _recover(state: dict[str, dict[str, Any]]) -> dict[str, str]:
+    # make the state match the system after a crash (dead launchers, mounts or directories left behind)
+    mounts = _mounted()
+    for mountpoint in list(state):
+        entry = state[mountpoint]
+        if mountpoint not in mounts:
+            eslog.debug(f"squashfs: {mountpoint} is no more mounted")
+            del state[mountpoint]
+            continue
+        entry["holders"] = [pid for pid in entry.get("holders", []) if _alive(pid)]
+
+    for name in os.listdir(MOUNT_ROOT):
+        if name.startswith("."):
+            continue
+        mountpoint = os.path.join(MOUNT_ROOT, name)
+        if mountpoint in state:
+            continue
+        if mountpoint in mounts:
+            # mounted by an older launcher or by hand: adopt it, it can be evicted when not in use
+            image = _backingFile(mounts[mountpoint]) or ""
+            size = os.path.getsize(image) if image and os.path.exists(image) else 0
+            state[mountpoint] = { "image": image, "holders": [], "used": 0, "size": size }
+            eslog.debug(f"squashfs: adopting {mountpoint} ({image})")
+        elif os.path.isdir(mountpoint):
+            try:
+                os.rmdir(mountpoint)
+                eslog.debug(f"squashfs: removed the stale directory {mountpoint}")
+            except OSError:
+                eslog.warning(f"squashfs: {mountpoint} is not a mountpoint and is not empty")
+    return mounts
+
+def _sameImage(entry: dict[str, Any], source: str, rom: str) -> bool:
+    backing = _backingFile(source)
+    if backing is not None:
+        return os.path.realpath(backing) == os.path.realpath(rom)
+    return entry.get("image") == rom
+
+def _evict(state: dict[str, dict[str, Any]], keep: str | None = None) -> None:
+    unused = sorted((mountpoint for mountpoint, entry in state.items() if not entry["holders"]), key=lambda mountpoint: state[mountpoint].get("used", 0), reverse=True)
+    count = sum(1 for entry in state.values() if entry["holders"])
+    size = sum(entry.get("size", 0) for entry in state.values() if entry["holders"])
+    for mountpoint in unused:
+        entry = state[mountpoint]
+        if mountpoint == keep or (count < MAX_MOUNTED and size + entry.get("size", 0) <= MAX_MOUNTED_BYTES):
+            count += 1
+            size += entry.get("size", 0)
+            continue
+        eslog.debug(f"squashfs: evicting {mountpoint}")
+        if _umount(mountpoint):
+            del state[mountpoint]
+
+def _resolveRom(rom: str, rommountpoint: str) -> str:
+    # if the squashfs contains a single file with the same name, take it as the rom file
+    romsingle = rommountpoint + "/" + os.path.basename(rom)[:-9]
+    if len(os.listdir(rommountpoint)) == 1 and os.path.exists(romsingle):
+        eslog.debug(f"squashfs: single rom {romsingle}")
+        return romsingle
+
+    # If a .ROM symlink is present, use the linked file as the ROM.
+    try:
+        romlinked = os.path.realpath(os.path.join(rommountpoint, ".ROM"), strict=True)
+        eslog.debug(f"squashfs: linked rom {romlinked}")
+        return romlinked
+    except OSError:
+        pass
+    return rommountpoint
+
+def acquire(rom: str) -> tuple[str, str]:
+    # mount the image (or reuse its mount) and hold it until release(). returns the mountpoint and the rom to run
+    rom = os.path.abspath(rom)
+    base = MOUNT_ROOT + "/" + os.path.basename(rom)[:-9]
+    with _locked():
+        state = _loadState()
+        mounts = _recover(state)
+
+        rommountpoint = base
+        suffix = 1
+        while rommountpoint in mounts:
+            entry = state.get(rommountpoint)
+            if entry is not None and _sameImage(entry, mounts[rommountpoint], rom):
+                eslog.debug(f"squashfs: {rommountpoint} already mounted")
+                break
+            if entry is not None and not entry["holders"] and _umount(rommountpoint):
+                # another image with the same name, not in use
+                del state[rommountpoint]
+                del mounts[rommountpoint]
+                break
+            suffix += 1
+            rommountpoint = f"{base}.{suffix}"
+
+        if rommountpoint not in mounts:
+            if os.path.isdir(rommountpoint):
+                try:
+                    os.rmdir(rommountpoint) # left empty by _recover
+                except OSError:
+                    # not empty and not mounted: run the directory, ignoring the .squashfs (nothing to hold)
+                    eslog.debug(f"squashfs: failed to rmdir {rommountpoint}, running the directory")
+                    _saveState(state)
+                    return rommountpoint, rommountpoint
+            os.mkdir(rommountpoint)
+            if subprocess.call(["mount", rom, rommountpoint]) != 0:
+                eslog.debug(f"squashfs: mounting {rommountpoint} failed")
+                try:
+                    os.rmdir(rommountpoint)
+                except OSError:
+                    pass
+                _saveState(state)
+                raise Exception(f"unable to mount the file {rom}")
+            state[rommountpoint] = { "image": rom, "holders": [], "used": 0, "size": os.path.getsize(rom) }
+
+        entry = state[rommountpoint]
+        entry["image"] = rom
+        entry["holders"].append(os.getpid())
+        entry["used"] = time.time()
+        _evict(state, keep=rommountpoint)
+        _saveState(state)
+
+    return rommountpoint, _resolveRom(rom, rommountpoint)
+
+def release(rommountpoint: str) -> None:
+    # the mount stays for the next launches, unless the cache is full
+    with _locked():
+        state = _loadState()
+        _recover(state)
+        entry = state.get(rommountpoint)
+        if entry is not None:
+            entry["holders"] = [pid for pid in entry["holders"] if pid != os.getpid()]
+            entry["used"] = time.time()
+        _evict(state)
+        _saveState(state)
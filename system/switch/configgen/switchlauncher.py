@@ -1,6 +1,12 @@
 #!/usr/bin/env python
 
 import os
+import sys
+
+# hand the launch over to the warm launcher daemon when it runs (see launcherDaemon.py)
+if __name__ == '__main__':
+    import launcherDaemon
+    launcherDaemon.delegate(sys.argv[1:])
 
 profiler = None
 
@@ -15,10 +21,13 @@ if os.path.exists("/var/run/emulatorlauncher.perf"):
     profiler = cProfile.Profile()
     profiler.enable()
 
+# time the imports of this launch (see lazyImports.report)
+import lazyImports
+lazyImports.install()
+import launchTrace
+
 ### import always needed ###
-import argparse
 import signal
-import time
 from sys import exit
 import subprocess
 import json
@@ -26,75 +35,33 @@ import logging
 from pathlib import Path
 
 import controllersConfig as controllers
+import deferredWork
+import emulatorOutput
+import processSupervisor
+import squashfsMounts
 import GeneratorImporter
 from configgen.batoceraPaths import SAVES
 from Emulator import Emulator
-from configgen.utils import bezels as bezelsUtil
 from configgen.utils import videoMode
-from configgen.utils import gunsUtils
-from configgen.utils import wheelsUtils
 from configgen.utils.logger import setup_logging
 from configgen.utils.hotkeygen import set_hotkeygen_context
 
-eslog = logging.getLogger(__name__)
+### import only when used: guns, wheels, hud and bezels are seldom enabled for the switch ###
+bezelsUtil = lazyImports.lazy("configgen.utils.bezels")
+gunsUtils = lazyImports.lazy("configgen.utils.gunsUtils")
+wheelsUtils = lazyImports.lazy("configgen.utils.wheelsUtils")
 
-# enable mouse
-subprocess.run(["unclutter-remote", "-s"])
+eslog = logging.getLogger(__name__)
 
 def squashfs_begin(rom):
     eslog.debug(f"squashfs_begin({rom})")
-    rommountpoint = "/var/run/squashfs/" + os.path.basename(rom)[:-9]
-
-    if not os.path.exists("/var/run/squashfs"):
-        os.mkdir("/var/run/squashfs")
-
-    # first, try to clean an empty remaining directory (for example because of a crash)
-    if os.path.exists(rommountpoint) and os.path.isdir(rommountpoint):
-        eslog.debug(f"squashfs_begin: {rommountpoint} already exists")
-        # try to remove an empty directory, else, run the directory, ignoring the .squashfs
-        try:
-            os.rmdir(rommountpoint)
-        except:
-            eslog.debug(f"squashfs_begin: failed to rmdir {rommountpoint}")
-            return False, None, rommountpoint
-
-    # ok, the base directory doesn't exist, let's create it and mount the squashfs on it
-    os.mkdir(rommountpoint)
-    return_code = subprocess.call(["mount", rom, rommountpoint])
-    if return_code != 0:
-        eslog.debug(f"squashfs_begin: mounting {rommountpoint} failed")
-        try:
-            os.rmdir(rommountpoint)
-        except:
-            pass
-        raise Exception(f"unable to mount the file {rom}")
-
-    # if the squashfs contains a single file with the same name, take it as the rom file
-    romsingle = rommountpoint + "/" + os.path.basename(rom)[:-9]
-    if len(os.listdir(rommountpoint)) == 1 and  os.path.exists(romsingle):
-        eslog.debug(f"squashfs: single rom {romsingle}")
-        return True, rommountpoint, romsingle
-
-    # If a .ROM symlink is present, use the linked file as the ROM.
-    try:
-        romlinked = os.path.realpath(os.path.join(rommountpoint, ".ROM"), strict=True)
-        eslog.debug(f"squashfs: linked rom {romlinked}")
-        return True, rommountpoint, romlinked
-    except:
-        pass
-    return True, rommountpoint, rommountpoint
+    # the image may still be mounted from a previous launch (see squashfsMounts)
+    rommountpoint, romfile = squashfsMounts.acquire(rom)
+    return True, rommountpoint, romfile
 
 def squashfs_end(rommountpoint):
     eslog.debug(f"squashfs_end({rommountpoint})")
-
-    # umount
-    return_code = subprocess.call(["umount", rommountpoint])
-    if return_code != 0:
-        eslog.debug(f"squashfs_begin: unmounting {rommountpoint} failed")
-        raise Exception(f"unable to umount the file {rommountpoint}")
-
-    # cleaning the empty directory
-    os.rmdir(rommountpoint)
+    squashfsMounts.release(rommountpoint)
 
 def main(args, maxnbplayers):
     # squashfs roms if squashed
@@ -103,11 +70,13 @@ def main(args, maxnbplayers):
         exitCode = 0
         need_end = False
         try:
-            need_end, rommountpoint, rom = squashfs_begin(args.rom)
+            with launchTrace.span("squashfs_begin"):
+                need_end, rommountpoint, rom = squashfs_begin(args.rom)
             exitCode = start_rom(args, maxnbplayers, rom, args.rom)
         finally:
             if need_end:
-                squashfs_end(rommountpoint)
+                with launchTrace.span("squashfs_end"):
+                    squashfs_end(rommountpoint)
         return exitCode
     else:
         return start_rom(args, maxnbplayers, args.rom, args.rom)
@@ -131,12 +100,14 @@ def start_rom(args, maxnbplayers, rom, romConfiguration):
         controllersInput.append(ci)
 
     # Read the controller configuration
-    playersControllers = controllers.loadControllerConfig(controllersInput)
+    with launchTrace.span("loadControllerConfig"):
+        playersControllers = controllers.loadControllerConfig(controllersInput)
 
     # find the system to run
     systemName = args.system
     eslog.debug(f"Running system: {systemName}")
-    system = Emulator(systemName, romConfiguration)
+    with launchTrace.span("Emulator"):
+        system = Emulator(systemName, romConfiguration)
 
     if args.emulator is not None:
         system.config["emulator"] = args.emulator
@@ -155,18 +126,20 @@ def start_rom(args, maxnbplayers, rom, romConfiguration):
             eslog.debug("emulator: {}".format(system.config["emulator"]))
 
     # metadata
-    metadata = controllers.getGamesMetaData(systemName, rom)
+    with launchTrace.span("getGamesMetaData"):
+        metadata = controllers.getGamesMetaData(systemName, rom)
 
     # search guns in case use_guns is enabled for this game
     # force use_guns in case es tells it has a gun
     if system.isOptSet('use_guns') == False and args.lightgun:
         system.config["use_guns"] = True
     if system.isOptSet('use_guns') and system.getOptBoolean('use_guns'):
-        guns = controllers.getGuns()
-        if "core" in system.config:
-            gunsUtils.precalibration(systemName, system.config['emulator'], system.config["core"], rom)
-        else:
-            gunsUtils.precalibration(systemName, system.config['emulator'], None, rom)
+        with launchTrace.span("guns"):
+            guns = controllers.getGuns()
+            if "core" in system.config:
+                gunsUtils.precalibration(systemName, system.config['emulator'], system.config["core"], rom)
+            else:
+                gunsUtils.precalibration(systemName, system.config['emulator'], None, rom)
     else:
         eslog.info("guns disabled.")
         guns = []
@@ -177,15 +150,17 @@ def start_rom(args, maxnbplayers, rom, romConfiguration):
     if system.isOptSet('use_wheels') == False and args.wheel:
         system.config["use_wheels"] = True
     if system.isOptSet('use_wheels') and system.getOptBoolean('use_wheels'):
-        deviceInfos = controllers.getDevicesInformation()
-        (wheelProcesses, playersControllers, deviceInfos) = wheelsUtils.reconfigureControllers(playersControllers, system, rom, metadata, deviceInfos)
-        wheels = wheelsUtils.getWheelsFromDevicesInfos(deviceInfos)
+        with launchTrace.span("wheels"):
+            deviceInfos = controllers.getDevicesInformation()
+            (wheelProcesses, playersControllers, deviceInfos) = wheelsUtils.reconfigureControllers(playersControllers, system, rom, metadata, deviceInfos)
+            wheels = wheelsUtils.getWheelsFromDevicesInfos(deviceInfos)
     else:
         eslog.info("wheels disabled.")
         wheels = []
 
     # find the generator
-    generator = GeneratorImporter.getGenerator(system.config['emulator'])
+    with launchTrace.span("getGenerator", emulator=system.config['emulator']):
+        generator = GeneratorImporter.getGenerator(system.config['emulator'])
 
     # the resolution must be changed before configuration while the configuration may depend on it (ie bezels)
     wantedGameMode = generator.getResolutionMode(system.config)
@@ -195,6 +170,7 @@ def start_rom(args, maxnbplayers, rom, romConfiguration):
     mouseChanged = False
     exitCode = -1
     try:
+        launchTrace.begin("videoMode")
         # lower the resolution if mode is auto
         newsystemMode = systemMode # newsystemmode is the mode after minmax (ie in 1K if tv was in 4K), systemmode is the mode before (ie in es)
         if system.config["videomode"] == "" or system.config["videomode"] == "default":
@@ -219,6 +195,7 @@ def start_rom(args, maxnbplayers, rom, romConfiguration):
             gameResolution["width"]  = gameResolution["height"]
             gameResolution["height"] = x
         eslog.debug("resolution: {}x{}".format(str(gameResolution["width"]), str(gameResolution["height"])))
+        launchTrace.end("videoMode", resolutionChanged=resolutionChanged)
 
         # savedir: create the save directory if not already done
         dirname = SAVES / system.name
@@ -267,23 +244,27 @@ def start_rom(args, maxnbplayers, rom, romConfiguration):
         os.environ.update({'SDL_RENDER_VSYNC': system.config["sdlvsync"]})
 
         # run a script before emulator starts
-        callExternalScripts("/usr/share/batocera/configgen/scripts", "gameStart", [systemName, system.config['emulator'], effectiveCore, effectiveRom])
-        callExternalScripts("/userdata/system/scripts", "gameStart", [systemName, system.config['emulator'], effectiveCore, effectiveRom])
+        with launchTrace.span("gameStart scripts"):
+            callExternalScripts("/usr/share/batocera/configgen/scripts", "gameStart", [systemName, system.config['emulator'], effectiveCore, effectiveRom])
+            callExternalScripts("/userdata/system/scripts", "gameStart", [systemName, system.config['emulator'], effectiveCore, effectiveRom])
 
         # run the emulator
+        launchTrace.begin("evmapy")
         from evmapy import evmapy
         with (
             evmapy(systemName, system.config['emulator'], effectiveCore, effectiveRomConfiguration, playersControllers, guns),
 
             set_hotkeygen_context(generator)
         ):
-                                                                                
+            launchTrace.end("evmapy")
+
             # change directory if wanted
             executionDirectory = generator.executionDirectory(system.config, effectiveRom)
             if executionDirectory is not None:
                 os.chdir(executionDirectory)
 
-            cmd = generator.generate(system, rom, playersControllers, metadata, guns, wheels, gameResolution)
+            with launchTrace.span("generator.generate"):
+                cmd = generator.generate(system, rom, playersControllers, metadata, guns, wheels, gameResolution)
 
             if system.isOptSet('hud_support') and system.getOptBoolean('hud_support') == True:
                 hud_bezel = getHudBezel(system, generator, rom, gameResolution, controllers.gunsBordersSizeName(guns, system.config), controllers.gunsBorderRatioType(guns, system.config))
@@ -304,10 +285,12 @@ def start_rom(args, maxnbplayers, rom, romConfiguration):
                 profiler.enable()
 
         # run a script after emulator shuts down
-        callExternalScripts("/userdata/system/scripts", "gameStop", [systemName, system.config['emulator'], effectiveCore, effectiveRom])
-        callExternalScripts("/usr/share/batocera/configgen/scripts", "gameStop", [systemName, system.config['emulator'], effectiveCore, effectiveRom])
+        with launchTrace.span("gameStop scripts"):
+            callExternalScripts("/userdata/system/scripts", "gameStop", [systemName, system.config['emulator'], effectiveCore, effectiveRom])
+            callExternalScripts("/usr/share/batocera/configgen/scripts", "gameStop", [systemName, system.config['emulator'], effectiveCore, effectiveRom])
 
     finally:
+        launchTrace.begin("teardown")
         # always restore the resolution
         if resolutionChanged:
             try:
@@ -327,6 +310,7 @@ def start_rom(args, maxnbplayers, rom, romConfiguration):
             except Exception:
                 eslog.error("hum, unable to reset wheel controllers !")
                 pass # don't fail
+        launchTrace.end("teardown")
     # exit
     return exitCode
 
@@ -568,14 +552,28 @@ def runCommand(command):
     eslog.debug(f"env: {str(command.env)}")
     exitcode = -1
     if command.array:
-        proc = subprocess.Popen(command.array, env=command.env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # housekeeping registered by the generator: what the emulator needs now, the rest once it runs
+        with launchTrace.span("deferred barriers"):
+            deferredWork.runBarriers()
+        # the launch is measured up to the spawn, not the imports of the threads while the emulator runs
+        lazyImports.uninstall()
+        with launchTrace.span("spawn"):
+            proc = processSupervisor.spawn(command.array, command.env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        deferredWork.start()
     else:
         return exitcode
+    # stream the output to rotating log files, only the last lines are kept in memory
+    tails = emulatorOutput.startTails(proc.stdout, proc.stderr)
     try:
-        out, err = proc.communicate()
-        exitcode = proc.returncode
-        eslog.debug(out.decode())
-        eslog.error(err.decode())
+        launchTrace.begin("emulator")
+        exitcode = proc.wait()
+        launchTrace.end("emulator", exitcode=exitcode)
+        # the emulator may leave children (appimage runtime, fuse...), they hold the pipes and the gpu
+        with launchTrace.span("reap"):
+            processSupervisor.reap(proc)
+        emulatorOutput.joinTails(tails)
+        eslog.debug(tails[0].tail())
+        eslog.error(tails[1].tail())
     except BrokenPipeError:
         # Seeing BrokenPipeError? This is probably caused by head truncating output in the front-end
         # Examine es-core/src/platform.cpp::runSystemCommand for additional context
@@ -590,13 +588,17 @@ def signal_handler(signal, frame):
     eslog.debug('Exiting')
     if proc:
         eslog.debug('killing proc')
-        proc.kill()
+        processSupervisor.killTree(proc)
 
 def launch():
+    # enable mouse
+    subprocess.run(["unclutter-remote", "-s"])
+
     with setup_logging():
         global proc
         proc = None
         signal.signal(signal.SIGINT, signal_handler)
+        import argparse
         parser = argparse.ArgumentParser(description='emulator-launcher script')
 
         maxnbplayers = 8
@@ -627,11 +629,17 @@ def launch():
         parser.add_argument("-wheel",          help="configure wheel",             action="store_true")
 
         args = parser.parse_args()
+        launchTrace.setMetadata(system=args.system, rom=args.rom, emulator=args.emulator)
         try:
             exitcode = -1
-            exitcode = main(args, maxnbplayers)
+            with launchTrace.span("launch"):
+                exitcode = main(args, maxnbplayers)
         except Exception as e:
             eslog.error("configgen exception: ", exc_info=True)
+        deferredWork.join()
+        lazyImports.report()
+        lazyImports.uninstall()
+        launchTrace.write()
 
         if profiler:
             import io
@@ -639,7 +647,7 @@ def launch():
             profiler.disable()
             profiler.dump_stats('/var/run/emulatorlauncher.prof')
 
-        time.sleep(1) # this seems to be required so that the gpu memory is restituated and available for es
+        processSupervisor.settle()
         eslog.debug(f"Exiting configgen with status {str(exitcode)}")
 
         exit(exitcode)
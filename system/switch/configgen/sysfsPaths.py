@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import logging
+import os
+import stat
+import subprocess
+
+eslog = logging.getLogger(__name__)
+
+# sysfs path of a device node (/dev/input/eventN, /dev/hidrawN), as 'udevadm info --query=path' gives it,
+# resolved from /sys/dev/char instead of spawning a shell and udevadm for each device. memoized per launch
+_paths: dict[str, str] = {}
+
+def _resolve(node: str) -> str:
+    st = os.stat(node)
+    kind = "char" if stat.S_ISCHR(st.st_mode) else "block"
+    path = os.path.realpath(f"/sys/dev/{kind}/{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}")
+    if not path.startswith("/sys/devices/"):
+        raise OSError(f"unexpected sysfs path {path}")
+    return path[len("/sys"):]
+
+def devpath(node: str) -> str:
+    path = _paths.get(node)
+    if path is None:
+        try:
+            path = _resolve(node)
+        except OSError as e:
+            eslog.debug(f"sysfs: {node}: {e}, asking udevadm")
+            path = subprocess.check_output(["udevadm", "info", "--query=path", "--name=" + node]).decode().strip()
+        _paths[node] = path
+    return path
+
+def parentPath(node: str) -> str:
+    # the device owning the input or hidraw node (the pad), the path the controllers are matched with
+    return devpath(node).partition('/input/')[0].partition('/hidraw')[0]
+
+def reset() -> None:
+    _paths.clear()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Final
+
+import batoceraFiles
+import cacheFiles
+import romIndex
+
+eslog = logging.getLogger(__name__)
+
+# per title id settings: the shipped profiles, then the user ones. see configgen-profiles.yml
+SHIPPED_PROFILES: Final = Path("/userdata/system/switch/configgen/configgen-profiles.yml")
+USER_PROFILES: Final = Path(batoceraFiles.CONF + "/switch/profiles.yml")
+CACHE_FILE: Final = cacheFiles.CACHE_DIR + '/profiles.pickle'
+# bump when the layout of the cached data changes
+CACHE_VERSION: Final = 1
+
+FAMILIES: Final = {
+    "citron": "yuzu",
+    "eden": "yuzu",
+    "sudachi": "yuzu",
+    "yuzu-early-access": "yuzu",
+    "ryujinx": "ryujinx",
+    "ryujinx-continuous": "ryujinx",
+    "ryujinx-avalonia": "ryujinx",
+}
+
+Profiles = dict[str, dict[str, dict[str, str]]]
+
+def _value(value: Any) -> str:
+    # as it would be read from batocera.conf
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+def _cacheKey(files: list[Path]) -> tuple[Any, ...]:
+    return (CACHE_VERSION, *((str(path), cacheFiles.fileStamp(path)) for path in files))
+
+def compileProfiles(files: list[Path]) -> Profiles:
+    # title id -> emulator (or family) -> options, the later files override the former ones
+    import yaml
+
+    profiles: Profiles = {}
+    for path in files:
+        if not path.exists():
+            continue
+        with path.open('r') as f:
+            content = yaml.load(f, Loader=yaml.CLoader)
+        if not content:
+            continue
+        for titleId, emulators in content.items():
+            if not isinstance(titleId, str):
+                # yaml reads a title id made of digits as a number
+                eslog.warning(f"{path}: ignoring the profile of {titleId}, the title id must be quoted")
+                continue
+            titleId = titleId.upper()
+            if not isinstance(emulators, dict):
+                eslog.warning(f"{path}: ignoring the profile of {titleId}")
+                continue
+            for emulator, options in emulators.items():
+                if isinstance(options, dict):
+                    profiles.setdefault(titleId, {}).setdefault(str(emulator), {}).update({ str(k): _value(v) for k, v in options.items() })
+    return profiles
+
+def load(files: list[Path] | None = None) -> Profiles:
+    # yaml is only parsed (and imported) when one of the files changed since the cache was built
+    if files is None:
+        files = [SHIPPED_PROFILES, USER_PROFILES]
+    key = _cacheKey(files)
+    profiles = cacheFiles.load(CACHE_FILE, key)
+    if profiles is None:
+        eslog.debug("compiling the title profiles")
+        profiles = compileProfiles(files)
+        cacheFiles.store(CACHE_FILE, key, profiles)
+    return profiles
+
+def get(titleId: str, emulator: str, files: list[Path] | None = None) -> dict[str, str]:
+    # options of the title for the emulator: the ones of its family, then its own ones
+    emulators = load(files).get(titleId)
+    if not emulators:
+        return {}
+    options: dict[str, str] = {}
+    family = FAMILIES.get(emulator)
+    if family is not None and family != emulator:
+        options.update(emulators.get(family, {}))
+    options.update(emulators.get(emulator, {}))
+    return options
+
+def titleOf(rom: str) -> str | None:
+    # base title id of the rom, from the rom index
+    info = romIndex.lookup(os.path.abspath(rom))
+    if info is None or info.titleId is None:
+        return None
+    return romIndex.baseTitleId(info.titleId)
+
+def forRom(rom: str, emulator: str) -> dict[str, str]:
+    titleId = titleOf(rom)
+    if titleId is None:
+        return {}
+    options = get(titleId, emulator)
+    if options:
+        eslog.debug(f"title profile {titleId} ({emulator}): {options}")
+    return options
+
+if __name__ == '__main__':
+    # python titleProfiles.py [rom emulator] : compile the profiles (and show the ones of a rom)
+    profiles = load()
+    print(f"{len(profiles)} title profiles")
+    if len(sys.argv) == 3:
+        print(f"{titleOf(sys.argv[1])}: {forRom(sys.argv[1], sys.argv[2])}")
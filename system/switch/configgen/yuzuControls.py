@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import sys
+import time
+from collections.abc import Iterable
+from typing import Any, Final
+
+# the keys of a player in the Controls section of qt-config.ini (citron, eden, sudachi, yuzu), as templates:
+# the keys and constant values are built once, a player slot is then stamped in one pass.
+# a value with {fields} is formatted with the fields given to stamp(); {connectedDefault} is given by stamp
+# ("true" for the first player). the tails are the parts of the keys after "player_N".
+class PlayerTemplate:
+    __slots__ = ("entries", "_keys")
+
+    def __init__(self, entries: Iterable[tuple[str, str]]):
+        # a key set twice keeps its first place and its last value, as set() does
+        values: dict[str, str] = {}
+        for tail, value in entries:
+            values[tail] = value
+        self.entries: tuple[tuple[str, str, bool], ...] = tuple((tail, value, "{" in value) for tail, value in values.items())
+        self._keys: dict[str, tuple[str, ...]] = {}
+
+    def keys(self, player: int | str) -> tuple[str, ...]:
+        player = str(player)
+        keys = self._keys.get(player)
+        if keys is None:
+            prefix = "player_" + player
+            keys = self._keys[player] = tuple(prefix + tail for tail, _, _ in self.entries)
+        return keys
+
+    def stamp(self, options: dict[str, Any], player: int | str, **fields: Any) -> None:
+        fields["connectedDefault"] = "true" if str(player) == "0" else "false"
+        for key, (_, value, isFormat) in zip(self.keys(player), self.entries):
+            options[key] = value.format_map(fields) if isFormat else value
+
+    def __add__(self, other: PlayerTemplate) -> PlayerTemplate:
+        return PlayerTemplate([(tail, value) for tail, value, _ in self.entries + other.entries])
+
+# an unconnected player: the keyboard bindings of the emulator defaults
+KEYBOARD: Final = PlayerTemplate([
+    ("_button_a", '"toggle:0,code:67,engine:keyboard"'),
+    ("_button_a\\default", "true"),
+    ("_button_b", '"toggle:0,code:88,engine:keyboard"'),
+    ("_button_b\\default", "true"),
+    ("_button_ddown", '"toggle:0,code:16777237,engine:keyboard"'),
+    ("_button_ddown\\default", "true"),
+    ("_button_dleft", '"toggle:0,code:16777234,engine:keyboard"'),
+    ("_button_dleft\\default", "true"),
+    ("_button_dright", '"toggle:0,code:16777236,engine:keyboard"'),
+    ("_button_dright\\default", "true"),
+    ("_button_dup", '"toggle:0,code:16777235,engine:keyboard"'),
+    ("_button_dup\\default", "true"),
+    ("_button_home", '"toggle:0,code:0,engine:keyboard"'),
+    ("_button_home\\default", "true"),
+    ("_button_l", '"toggle:0,code:81,engine:keyboard"'),
+    ("_button_l\\default", "true"),
+    ("_button_lstick", '"toggle:0,code:70,engine:keyboard"'),
+    ("_button_lstick\\default", "true"),
+    ("_button_minus", '"toggle:0,code:78,engine:keyboard"'),
+    ("_button_minus\\default", "true"),
+    ("_button_plus", '"toggle:0,code:77,engine:keyboard"'),
+    ("_button_plus\\default", "true"),
+    ("_button_r", '"toggle:0,code:69,engine:keyboard"'),
+    ("_button_r\\default", "true"),
+    ("_button_rstick", '"toggle:0,code:71,engine:keyboard"'),
+    ("_button_rstick\\default", "true"),
+    ("_button_screenshot", '"toggle:0,code:0,engine:keyboard"'),
+    ("_button_screenshot\\default", "true"),
+    ("_button_sl", '"toggle:0,code:81,engine:keyboard"'),
+    ("_button_sl\\default", "true"),
+    ("_button_sr", '"toggle:0,code:69,engine:keyboard"'),
+    ("_button_sr\\default", "true"),
+    ("_button_x", '"toggle:0,code:86,engine:keyboard"'),
+    ("_button_x\\default", "true"),
+    ("_button_y", '"toggle:0,code:90,engine:keyboard"'),
+    ("_button_y\\default", "true"),
+    ("_button_zl", '"toggle:0,code:82,engine:keyboard"'),
+    ("_button_zl\\default", "true"),
+    ("_button_zr", '"toggle:0,code:84,engine:keyboard"'),
+    ("_button_zr\\default", "true"),
+
+    ("_lstick", '"modifier_scale:0.500000,modifier:toggle$00$1code$016777248$1engine$0keyboard,right:toggle$00$1code$068$1engine$0keyboard,left:toggle$00$1code$065$1engine$0keyboard,down:toggle$00$1code$083$1engine$0keyboard,up:toggle$00$1code$087$1engine$0keyboard,engine:analog_from_button"'),
+    ("_lstick\\default", "true"),
+    ("_rstick", '"modifier_scale:0.500000,modifier:toggle$00$1code$00$1engine$0keyboard,right:toggle$00$1code$076$1engine$0keyboard,left:toggle$00$1code$074$1engine$0keyboard,down:toggle$00$1code$075$1engine$0keyboard,up:toggle$00$1code$073$1engine$0keyboard,engine:analog_from_button"'),
+    ("_rstick\\default", "true"),
+
+    ("_connected", "false"),
+    ("_connected\\default", "true"),
+    ("_type", "0"),
+    ("_type\\default", "true"),
+    ("_vibration_enabled", "true"),
+    ("_vibration_enabled\\default", "true"),
+])
+
+_unconnected: dict[tuple[tuple[str, ...], tuple[str, ...]], PlayerTemplate] = {}
+
+def unconnected(buttons: Iterable[str], axis: Iterable[str]) -> PlayerTemplate:
+    # the keys of the last bindings are cleared first (their place in a new file), then the keyboard is bound
+    key = (tuple(buttons), tuple(axis))
+    template = _unconnected.get(key)
+    if template is None:
+        template = _unconnected[key] = PlayerTemplate([("_" + x, '""') for x in key[0] + key[1]]) + KEYBOARD
+    return template
+
+# the real joycons, one pad (left: pad 1, right: pad 2) or both
+_JOYCON: Final = '"pad:{pad},button:{button},port:{port},guid:0000000000000000000000000000000{pad},engine:joycon"'
+
+def _joyconButtons(pad: str, buttons: dict[str, int]) -> list[tuple[str, str]]:
+    return [("_" + x, _JOYCON.format(pad="{" + pad + "}", button=button, port="{port}")) for x, button in buttons.items()]
+
+JOYCON_PAD1_BUTTONS: Final = {
+    "button_l":      64,
+    "button_minus":  65536,
+    "button_lstick": 524288,
+    "button_screenshot": 2097152,
+    "button_dup":    2,
+    "button_ddown":  1,
+    "button_dleft":  8,
+    "button_dright": 4,
+    "button_zl": 128
+}
+
+JOYCON_PAD2_BUTTONS: Final = {
+    "button_a":      2048,
+    "button_b":      1024,
+    "button_x":      512,
+    "button_y":      256,
+    "button_r":      16384,
+    "button_plus":   131072,
+    "button_rstick": 262144,
+    "button_home":   1048576,
+    "button_zr": 32768
+}
+
+_JOYCON_BUTTONS: Final = _joyconButtons("pad1", JOYCON_PAD1_BUTTONS) + _joyconButtons("pad2", JOYCON_PAD2_BUTTONS)
+
+_JOYCON_TAIL: Final = [
+    ("_lstick", '"axis_y:1,axis_x:0,pad:{pad1},port:{port},guid:0000000000000000000000000000000{pad1},engine:joycon"'),
+    ("_rstick", '"axis_y:3,axis_x:2,pad:{pad2},port:{port},guid:0000000000000000000000000000000{pad2},engine:joycon"'),
+    # motion enabled no matter what, as enabling won't hurt things if it doesn't exist
+    ("_motionleft", '"motion:0,pad:{pad1},port:{port},guid:0000000000000000000000000000000{pad1},engine:joycon"'),
+    ("_motionright", '"motion:1,pad:{pad2},port:{port},guid:0000000000000000000000000000000{pad2},engine:joycon"'),
+    ("_connected", "true"),
+    ("_connected\\default", "{connectedDefault}"),
+    ("_type", "{type}"),
+    ("_type\\default", "false"),
+    ("_vibration_enabled", "{vibration}"),
+    ("_vibration_enabled\\default", "{vibration}"),
+]
+
+# sl and sr of the left pad, of the right pad, not connected for dual joycon mode (keys without "_" after the player)
+JOYCON_LEFT: Final = PlayerTemplate(_JOYCON_BUTTONS + [
+    ("_button_sl", _JOYCON.format(pad="{pad1}", button=32, port="{port}")),
+    ("_button_sr", _JOYCON.format(pad="{pad1}", button=16, port="{port}")),
+] + _JOYCON_TAIL)
+JOYCON_RIGHT: Final = PlayerTemplate(_JOYCON_BUTTONS + [
+    ("_button_sl", _JOYCON.format(pad="{pad1}", button=8192, port="{port}")),
+    ("_button_sr", _JOYCON.format(pad="{pad1}", button=4096, port="{port}")),
+] + _JOYCON_TAIL)
+JOYCON_DUAL: Final = PlayerTemplate(_JOYCON_BUTTONS + [
+    ("button_sl", "[empty]"),
+    ("button_sr", "[empty]"),
+] + _JOYCON_TAIL)
+
+# the end of a player bound through sdl: with the batocera mapping, with the sdl mapping
+_SDL_MOTION: Final = [
+    ("_motionleft", '"engine:sdl,motion:0,port:{port},guid:{guid}"'),
+    ("_motionright", '"engine:sdl,motion:0,port:{port},guid:{guid}"'),
+    ("_connected", "true"),
+    ("_connected\\default", "{connectedDefault}"),
+    ("_type", "{type}"),
+]
+_VIBRATION: Final = [
+    ("_vibration_enabled", "{vibration}"),
+    ("_vibration_enabled\\default", "{vibration}"),
+]
+BATOCERA_TAIL: Final = PlayerTemplate(_SDL_MOTION + [("_type\\default", "true")] + _VIBRATION)
+SDL_TAIL: Final = PlayerTemplate(_SDL_MOTION + [
+    ("_button_screenshot", "[empty]"),
+    ("_button_screenshot\\default", "false"),
+    ("_type\\default", "true"),
+] + _VIBRATION)
+
+def _setPerKey(config: Any, buttons: Iterable[str], axis: Iterable[str], player: int) -> None:
+    # the reference: the set() calls the templates replace, for the unconnected players
+    controllernumber = str(player)
+    for x in buttons:
+        config.set("Controls", "player_" + controllernumber + "_" + x, '""')
+    for x in axis:
+        config.set("Controls", "player_" + controllernumber + "_" + x, '""')
+    for tail, value, _ in KEYBOARD.entries:
+        config.set("Controls", "player_" + controllernumber + tail, value)
+
+if __name__ == '__main__':
+    # python yuzuControls.py [runs] : the unconnected players of a launch (1 to 8), per key set() against the template
+    import configparser
+
+    from iniConfig import IniConfig, toString
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    buttons = ["button_a", "button_b", "button_x", "button_y", "button_dup", "button_ddown", "button_dleft", "button_dright",
+               "button_l", "button_r", "button_plus", "button_minus", "button_sl", "button_sr", "button_zl", "button_zr",
+               "button_lstick", "button_rstick", "button_home"]
+    axis = ["lstick", "rstick"]
+
+    def perKey() -> Any:
+        config = configparser.RawConfigParser()
+        config.optionxform = str  # type: ignore[assignment]
+        config.add_section("Controls")
+        for y in range(1, 9):
+            _setPerKey(config, buttons, axis, y)
+        return config
+
+    def perKeyIni() -> IniConfig:
+        config = IniConfig()
+        config.add_section("Controls")
+        for y in range(1, 9):
+            _setPerKey(config, buttons, axis, y)
+        return config
+
+    def stamped() -> IniConfig:
+        config = IniConfig()
+        config.add_section("Controls")
+        controls = config.section("Controls")
+        template = unconnected(buttons, axis)
+        for y in range(1, 9):
+            template.stamp(controls, y)
+        return config
+
+    assert toString(perKey()) == stamped().dumps() == perKeyIni().dumps(), "the outputs differ"
+    for name, fn in [("RawConfigParser.set", perKey), ("IniConfig.set", perKeyIni), ("template", stamped)]:
+        start = time.perf_counter()
+        for _ in range(runs):
+            fn()
+        print(f"{name:20}: {(time.perf_counter() - start) * 1000 / runs:8.3f} ms per launch")
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, Final, Union
+
+from iniConfig import IniConfig
+
+# the settings of the yuzu family (citron, eden, sudachi, yuzu) in qt-config.ini, declared once:
+# batocera key -> (section, ini key, default, "\default" flag when set / when not set).
+# the rows are applied in their order, the order of the keys in a new file is the order of the rows.
+# a flag is a value, a function of the value, or None (no "\default" key)
+Flag = Union[str, Callable[[Any], str], None]
+
+@dataclass(slots=True, frozen=True)
+class Section:
+    # added when missing
+    name: str
+
+@dataclass(slots=True, frozen=True)
+class Fixed:
+    section: str
+    option: str
+    value: str
+    flag: Flag = None
+
+@dataclass(slots=True, frozen=True)
+class Option:
+    key: str
+    section: str
+    option: str
+    default: str
+    setFlag: Flag
+    unsetFlag: Flag
+
+@dataclass(slots=True, frozen=True)
+class Choice:
+    # a value of batocera -> (ini value, flag); an unknown value sets nothing
+    key: str
+    section: str
+    option: str
+    choices: Mapping[str, tuple[str, Flag]]
+    default: tuple[str, Flag]
+
+@dataclass(slots=True, frozen=True)
+class When:
+    # an ini value set when the batocera key has a given value
+    key: str
+    value: str
+    section: str
+    option: str
+    iniValue: str
+
+Row = Union[Section, Fixed, Option, Choice, When]
+
+def _flagKey(option: str) -> str:
+    return option + "\\default"
+
+def _vsyncFlag(value: Any) -> str:
+    return "true" if value == "2" else "false"
+
+# the compiled rows: (kind, section, ...) with the "\default" keys computed once
+SECTION: Final = 0
+FIXED: Final = 1
+OPTION: Final = 2
+CHOICE: Final = 3
+WHEN: Final = 4
+
+@dataclass(slots=True, frozen=True)
+class Schema:
+    steps: tuple[tuple[Any, ...], ...]
+    # batocera key -> the ini keys it drives (section, option)
+    byKey: Mapping[str, tuple[tuple[str, str], ...]]
+
+def compileRows(rows: tuple[Row, ...]) -> Schema:
+    steps: list[tuple[Any, ...]] = []
+    byKey: dict[str, list[tuple[str, str]]] = {}
+    for row in rows:
+        if isinstance(row, Section):
+            steps.append((SECTION, row.name))
+        elif isinstance(row, Fixed):
+            steps.append((FIXED, row.section, row.option, row.value, _flagKey(row.option), row.flag))
+        elif isinstance(row, Option):
+            steps.append((OPTION, row.section, row.key, row.option, row.default, _flagKey(row.option), row.setFlag, row.unsetFlag))
+            byKey.setdefault(row.key, []).append((row.section, row.option))
+        elif isinstance(row, Choice):
+            steps.append((CHOICE, row.section, row.key, row.option, dict(row.choices), row.default, _flagKey(row.option)))
+            byKey.setdefault(row.key, []).append((row.section, row.option))
+        elif isinstance(row, When):
+            steps.append((WHEN, row.section, row.key, row.value, row.option, row.iniValue))
+            byKey.setdefault(row.key, []).append((row.section, row.option))
+        else:
+            raise TypeError(f"unknown row {row!r}")
+    return Schema(tuple(steps), { key: tuple(options) for key, options in byKey.items() })
+
+def _setFlag(options: dict[str, Any], flagKey: str, flag: Flag, value: Any) -> None:
+    if flag is None:
+        return
+    options[flagKey] = flag(value) if callable(flag) else flag
+
+def apply(ini: IniConfig, config: Mapping[str, Any], schema: Schema) -> None:
+    # the same keys, values and order as the set() calls the rows replace
+    options: dict[str, Any] = {}
+    sectionName = None
+    for step in schema.steps:
+        kind, section = step[0], step[1]
+        if section != sectionName:
+            if not ini.has_section(section):
+                ini.add_section(section)
+            options = ini.section(section)
+            sectionName = section
+        if kind == FIXED:
+            _, _, option, value, flagKey, flag = step
+            options[option] = value
+            _setFlag(options, flagKey, flag, value)
+        elif kind == OPTION:
+            _, _, key, option, default, flagKey, setFlag, unsetFlag = step
+            if key in config:
+                value = config[key]
+                options[option] = value
+                _setFlag(options, flagKey, setFlag, value)
+            else:
+                options[option] = default
+                _setFlag(options, flagKey, unsetFlag, default)
+        elif kind == CHOICE:
+            _, _, key, option, choices, default, flagKey = step
+            if key in config:
+                choice = choices.get(config[key])
+                if choice is None:
+                    continue
+            else:
+                choice = default
+            options[option] = choice[0]
+            _setFlag(options, flagKey, choice[1], choice[0])
+        elif kind == WHEN:
+            _, _, key, value, option, iniValue = step
+            if key in config and config[key] == value:
+                options[option] = iniValue
+
+# the rows
+
+def _uiHead(*extra: Row, confirmStopLast: bool = False) -> tuple[Row, ...]:
+    confirmStop = Fixed("UI", "confirmStop", "2", "false")
+    rows: list[Row] = [
+        Section("UI"),
+        Fixed("UI", "fullscreen", "true", "false"),
+        Fixed("UI", "confirmClose", "false", "false"),
+    ]
+    if not confirmStopLast:
+        rows.append(confirmStop)
+    rows += [
+        Fixed("UI", "firstStart", "false", "false"),
+        Fixed("UI", "displayTitleBars", "false", "false"),
+    ]
+    if confirmStopLast:
+        rows.append(confirmStop)
+    return tuple(rows) + extra
+
+UI: Final[tuple[Row, ...]] = (
+    Option("yuzu_enable_discord_presence", "UI", "enable_discord_presence", "false", "false", "false"),
+    Fixed("UI", "calloutFlags", "1", "false"),
+    # single window mode
+    Option("single_window", "UI", "singleWindowMode", "true", "false", "true"),
+    # user profile select on boot
+    Option("user_profile", "UI", "select_user_on_boot", "true", "false", "true"),
+    Fixed("UI", "hideInactiveMouse", "true", "true"),
+    # roms path (need for load update/dlc)
+    Fixed("UI", "Paths\\gamedirs\\1\\deep_scan", "true", "false"),
+    Fixed("UI", "Paths\\gamedirs\\1\\expanded", "true", "true"),
+    Fixed("UI", "Paths\\gamedirs\\1\\path", "/userdata/roms/switch"),
+    Fixed("UI", "Paths\\gamedirs\\size", "1"),
+    # game list cache, kept between launches (see gameListCache)
+    Fixed("UI", "cache_game_list", "true", "true"),
+    Fixed("UI", "Screenshots\\enable_screenshot_save_as", "true", "true"),
+    Fixed("UI", "Screenshots\\screenshot_path", "/userdata/screenshots", "false"),
+)
+
+def _shortcut(name: str, value: str) -> Fixed:
+    return Fixed("UI", "Shortcuts\\Main%20Window\\" + name, value, "false")
+
+def _exitShortcut(emulator: str) -> tuple[Row, ...]:
+    return (_shortcut(f"Exit%20{emulator}\\Controller_KeySeq", "Minus+Plus"),)
+
+CITRON_SHORTCUTS: Final[tuple[Row, ...]] = (
+    Fixed("UI", "Shortcuts\\shortcuts\\size", "2"),
+    # exit citron
+    Fixed("UI", "Shortcuts\\shortcuts\\1\\name", "Exit citron"),
+    Fixed("UI", "Shortcuts\\shortcuts\\1\\group", "Main Window"),
+    Fixed("UI", "Shortcuts\\shortcuts\\1\\keyseq", "Ctrl+Q"),
+    Fixed("UI", "Shortcuts\\shortcuts\\1\\controller_keyseq", "Plus+Minus"),
+    Fixed("UI", "Shortcuts\\shortcuts\\1\\context", "1"),
+    Fixed("UI", "Shortcuts\\shortcuts\\1\\repeat", "false"),
+    # exit citron fullscreen
+    Fixed("UI", "Shortcuts\\shortcuts\\2\\name", "Fullscreen"),
+    Fixed("UI", "Shortcuts\\shortcuts\\2\\group", "Main Window"),
+    Fixed("UI", "Shortcuts\\shortcuts\\2\\keyseq", "F11"),
+    Fixed("UI", "Shortcuts\\shortcuts\\2\\controller_keyseq", "B+Minus"),
+    Fixed("UI", "Shortcuts\\shortcuts\\2\\context", "1"),
+    Fixed("UI", "Shortcuts\\shortcuts\\2\\repeat", "false"),
+)
+
+FULLSCREEN_SHORTCUTS: Final[tuple[Row, ...]] = (
+    _shortcut("Fullscreen\\KeySeq", "F4"),
+    _shortcut("Fullscreen\\Controller_KeySeq", "Minus+B"),
+    _shortcut("Exit%20Fullscreen\\Controller_KeySeq", "Home+ZL"),
+)
+
+KEYBOARD_SHORTCUTS: Final[tuple[Row, ...]] = (
+    _shortcut("Exit%20Fullscreen\\KeySeq", "Esc"),
+    _shortcut("Continue\\Pause%20Emulation\\KeySeq", "P"),
+)
+
+STORAGE: Final[tuple[Row, ...]] = (
+    Section("Data%20Storage"),
+    Fixed("Data%20Storage", "dump_directory", "/userdata/system/configs/yuzu/dump", "true"),
+    Fixed("Data%20Storage", "load_directory", "/userdata/system/configs/yuzu/load", "true"),
+    Fixed("Data%20Storage", "nand_directory", "/userdata/system/configs/yuzu/nand", "true"),
+    Fixed("Data%20Storage", "sdmc_directory", "/userdata/system/configs/yuzu/sdmc", "true"),
+    Fixed("Data%20Storage", "tas_directory", "/userdata/system/configs/yuzu/tas", "true"),
+    Fixed("Data%20Storage", "use_virtual_sd", "true", "true"),
+
+    Section("Core"),
+    Option("multicore", "Core", "use_multi_core", "true", "false", "true"),
+)
+
+def _renderer(aspectRatio: Option) -> tuple[Row, ...]:
+    return (
+        Section("Renderer"),
+        aspectRatio,
+        Option("yuzu_backend", "Renderer", "backend", "0", "false", "false"),
+        Option("async_shaders", "Renderer", "use_asynchronous_shaders", "true", "false", "false"),
+        Option("shaderbackend", "Renderer", "shader_backend", "0", "false", "true"),
+        Option("async_gpu", "Renderer", "use_asynchronous_gpu_emulation", "true", "false", "true"),
+        Option("nvdec_emu", "Renderer", "nvdec_emulation", "2", "false", "true"),
+        Option("gpuaccuracy", "Renderer", "gpu_accuracy", "0", "false", "false"),
+        Option("vsync", "Renderer", "use_vsync", "1", _vsyncFlag, "false"),
+        Option("gpu_cache_gc", "Renderer", "use_caches_gc", "false", "false", "false"),
+        Option("anisotropy", "Renderer", "max_anisotropy", "0", "false", "true"),
+        Option("resolution_scale", "Renderer", "resolution_setup", "2", "false", "true"),
+        Option("scale_filter", "Renderer", "scaling_filter", "1", "false", "true"),
+        Option("aliasing_method", "Renderer", "anti_aliasing", "0", "false", "true"),
+        Option("accelerate_astc", "Renderer", "accelerate_astc", "1", "false", "true"),
+        Option("astc_recompression", "Renderer", "astc_recompression", "0", "false", "true"),
+        When("astc_recompression", "0", "Renderer", "use_vsync\\default", "true"),
+        Fixed("Renderer", "async_astc", "false", "true"),
+
+        Section("Cpu"),
+        Option("cpuaccuracy", "Cpu", "cpu_accuracy", "0", "false", "true"),
+
+        Section("System"),
+    )
+
+SUYU_RATIO: Final = Option("suyu_ratio", "Renderer", "aspect_ratio", "5", "false", "false")
+YUZU_RATIO: Final = Option("yuzu_ratio", "Renderer", "aspect_ratio", "0", "false", "true")
+
+NCA_VERIFICATION: Final[tuple[Row, ...]] = (
+    Fixed("System", "disable_nca_verification", "true", "true"),
+    Fixed("System", "hide_nca_verification_popup", "true", "false"),
+)
+
+SYSTEM: Final[tuple[Row, ...]] = (
+    Option("language", "System", "language_index", "1", "false", "true"),
+    Option("audio_mode", "System", "sound_index", "1", "false", "true"),
+    Option("region", "System", "region_index", "1", "false", "true"),
+    Choice("dock_mode", "System", "use_docked_mode", { "1": ("1", "true"), "0": ("0", "false") }, ("1", "true")),
+
+    Section("LibraryApplet"),
+    Fixed("LibraryApplet", "swkbd_applet_mode", "0", "false"),
+)
+
+UPDATE_CHECK: Final[tuple[Row, ...]] = (
+    Section("WebService"),
+    Fixed("WebService", "enable_auto_update_check", "false", "false"),
+)
+
+# after the controls
+SERVICES: Final[tuple[Row, ...]] = (
+    Section("WebService"),
+    Fixed("WebService", "enable_telemetry", "false", "false"),
+    Section("Services"),
+    Fixed("Services", "bcat_backend", "none", "none"),
+)
+
+# the settings written before the controls, per emulator
+CITRON: Final = compileRows(_uiHead() + UI + CITRON_SHORTCUTS + FULLSCREEN_SHORTCUTS + KEYBOARD_SHORTCUTS + STORAGE
+                        + _renderer(SUYU_RATIO) + SYSTEM + UPDATE_CHECK)
+EDEN: Final = compileRows(_uiHead(Fixed("UI", "check_for_updates", "false", "false")) + UI + _exitShortcut("eden")
+                      + FULLSCREEN_SHORTCUTS + KEYBOARD_SHORTCUTS + STORAGE + _renderer(SUYU_RATIO) + NCA_VERIFICATION + SYSTEM)
+SUDACHI: Final = compileRows(_uiHead(confirmStopLast=True) + UI + _exitShortcut("sudachi") + FULLSCREEN_SHORTCUTS + STORAGE
+                         + _renderer(SUYU_RATIO) + SYSTEM)
+YUZU: Final = compileRows(_uiHead() + UI + _exitShortcut("yuzu") + FULLSCREEN_SHORTCUTS + KEYBOARD_SHORTCUTS + STORAGE
+                      + _renderer(YUZU_RATIO) + SYSTEM)
+TAIL: Final = compileRows(SERVICES)
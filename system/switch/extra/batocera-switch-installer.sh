@@ -279,10 +279,36 @@ wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/Gene
 wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/switchlauncher.py" "$url/switchlauncher.py"
 wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/configgen-defaults.yml" "$url/configgen-defaults.yml"
 wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/configgen-defaults-arch.yml" "$url/configgen-defaults-arch.yml"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/configgen-profiles.yml" "$url/configgen-profiles.yml"
 wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/Emulator.py" "$url/Emulator.py"
 wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/batoceraFiles.py" "$url/batoceraFiles.py"
 wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/controllersConfig.py" "$url/controllersConfig.py"
 wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/evmapy.py" "$url/evmapy.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/emulatorOutput.py" "$url/emulatorOutput.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/launchTrace.py" "$url/launchTrace.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/processSupervisor.py" "$url/processSupervisor.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/cacheFiles.py" "$url/cacheFiles.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/settingsIndex.py" "$url/settingsIndex.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/defaultsCache.py" "$url/defaultsCache.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/launcherDaemon.py" "$url/launcherDaemon.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/lazyImports.py" "$url/lazyImports.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/squashfsMounts.py" "$url/squashfsMounts.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/deferredWork.py" "$url/deferredWork.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/fsLayout.py" "$url/fsLayout.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/gameListCache.py" "$url/gameListCache.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/romIndex.py" "$url/romIndex.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/titleProfiles.py" "$url/titleProfiles.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/hardwareProbe.py" "$url/hardwareProbe.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/sdlProbe.py" "$url/sdlProbe.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/sysfsPaths.py" "$url/sysfsPaths.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/gamesMetadata.py" "$url/gamesMetadata.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/configCache.py" "$url/configCache.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/iniConfig.py" "$url/iniConfig.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/yuzuOptions.py" "$url/yuzuOptions.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/yuzuControls.py" "$url/yuzuControls.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/bindingCache.py" "$url/bindingCache.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/jsonConfig.py" "$url/jsonConfig.py"
+wget -q --tries=10 --no-check-certificate --no-cache --no-cookies -O "$path/envFingerprint.py" "$url/envFingerprint.py"
 # -------------------------------------------------------------------- 
 # FILL /USERDATA/SYSTEM/CONFIGS/EMULATIONSTATION
 path=/userdata/system/configs/emulationstation
@@ -345,6 +371,8 @@ chmod a+x /userdata/system/switch/extra/batocera-config* 2>/dev/null
 chmod a+x /userdata/system/switch/extra/batocera-switch-lib* 2>/dev/null
 chmod a+x /userdata/system/switch/extra/*.desktop 2>/dev/null
 chmod a+x /userdata/system/.local/share/applications/*.desktop 2>/dev/null
+# compile the configgen defaults now, so that the first launch doesn't parse the yaml files
+( cd /userdata/system/switch/configgen && python defaultsCache.py ) >/dev/null 2>&1
 # --------------------------------------------------------------------
 echo -e "${X} > INSTALLED OK${X}" 
 sleep 1